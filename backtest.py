@@ -0,0 +1,206 @@
+"""
+Walk-forward backtest for the NBA Game Predictor
+Replays past seasons day by day: every game is scored from the two teams'
+point-in-time features (train.build_features, identical to the online feature
+store) with the same probability the app shows, one batch per game day.
+Reports accuracy, log-loss, Brier score and a calibration table per season.
+
+Retraining modes:
+    fixed      score every season with the shipped model.npz (seasons it was
+               trained on will look better than they are)
+    expanding  before each season, refit on every earlier season
+    rolling    before each season, refit on the previous `window` seasons
+
+Seasons are evaluated in parallel worker processes.  Game logs need the
+`opponent` and `home` columns so the two sides of each game can be paired.
+
+Usage: python backtest.py games.csv [fixed|expanding|rolling] [window]
+    NBA_BACKTEST_WORKERS sets the pool size
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from feature_store import FEATURE_NAMES
+from predictor import ARTIFACT_DIR, COMPILED_MODEL_FILE, CompiledModel, Predictor
+
+MODES = ("fixed", "expanding", "rolling")
+DEFAULT_WINDOW = 3
+CALIBRATION_BINS = 10
+LOG_LOSS_EPSILON = 1e-15
+
+
+def pair_games(features, labels, rows):
+    """One record per game: row positions of the home and away sides, outcome and date"""
+    from train import MATCHUP_FIELDS
+
+    missing = [field for field in MATCHUP_FIELDS if field not in rows.columns]
+    if missing:
+        raise ValueError(f"Backtests need the game log column(s): {', '.join(missing)}")
+    sides = pd.DataFrame({
+        "team": rows["team"].values,
+        "opponent": rows["opponent"].values,
+        "home": rows["home"].values,
+        "date": rows["date"].values,
+        "season": rows["season"].values,
+        "won": labels.values,
+        "row": np.arange(len(rows)),
+    })
+    home = sides[sides["home"]]
+    away = sides[~sides["home"]]
+    games = home.merge(away[["team", "date", "row"]], left_on=["opponent", "date"],
+                       right_on=["team", "date"], suffixes=("", "_away"))
+    games = games.sort_values("date", kind="stable")
+    return pd.DataFrame({
+        "date": games["date"].values,
+        "season": games["season"].values,
+        "home_row": games["row"].values,
+        "away_row": games["row_away"].values,
+        "home_won": games["won"].values,
+    })
+
+
+def training_seasons(season, seasons, mode, window=DEFAULT_WINDOW):
+    """Seasons a walk-forward model for `season` is fitted on"""
+    earlier = [s for s in seasons if s < season]
+    if mode == "rolling":
+        return earlier[-window:]
+    return earlier
+
+
+def score_season(task):
+    """Fit (unless a model is given) and score one season, one game day at a time"""
+    model, train_features, train_labels, home_features, away_features, days = task
+    if model is None:
+        from export_model import compile_model
+        from train import fit_pipeline
+
+        artifacts = fit_pipeline(pd.DataFrame(train_features, columns=FEATURE_NAMES), train_labels)
+        model = compile_model(artifacts, "walk-forward")
+
+    predictor = Predictor(model)
+    probability = np.empty(days.shape[0])
+    boundaries = np.flatnonzero(np.diff(days)) + 1
+    for day in np.split(np.arange(days.shape[0]), boundaries):
+        lo, hi = day[0], day[-1] + 1
+        probability[lo:hi] = predictor.home_win_probability(home_features[lo:hi], away_features[lo:hi])
+    return probability
+
+
+def evaluate(probability, outcome):
+    """Accuracy, log-loss and Brier score of home-win probabilities against results"""
+    outcome = np.asarray(outcome, dtype=np.float64)
+    clipped = np.clip(probability, LOG_LOSS_EPSILON, 1.0 - LOG_LOSS_EPSILON)
+    return {
+        "games": int(outcome.shape[0]),
+        "accuracy": float(np.mean((probability >= 0.5) == (outcome > 0))),
+        "log_loss": float(-np.mean(outcome * np.log(clipped) + (1.0 - outcome) * np.log(1.0 - clipped))),
+        "brier": float(np.mean((probability - outcome) ** 2)),
+        "home_rate": float(np.mean(outcome)),
+    }
+
+
+def calibration(probability, outcome, bins=CALIBRATION_BINS):
+    """Predicted vs observed home-win rate in equal-width probability bins"""
+    outcome = np.asarray(outcome, dtype=np.float64)
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    which = np.clip(np.searchsorted(edges, probability, side="right") - 1, 0, bins - 1)
+    counts = np.bincount(which, minlength=bins)
+    predicted = np.bincount(which, weights=probability, minlength=bins)
+    observed = np.bincount(which, weights=outcome, minlength=bins)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.DataFrame({
+            "low": edges[:-1],
+            "high": edges[1:],
+            "games": counts,
+            "predicted": predicted / counts,
+            "observed": observed / counts,
+        })
+
+
+def backtest(games, mode="expanding", window=DEFAULT_WINDOW, model=None, workers=None):
+    """Walk-forward evaluation; returns (per-season metrics, overall metrics, calibration, games)"""
+    from train import build_features, prepare_game_logs
+
+    if mode not in MODES:
+        raise ValueError(f"Unknown backtest mode {mode!r}; expected one of {', '.join(MODES)}")
+    features, labels, rows = build_features(prepare_game_logs(games), workers)
+    paired = pair_games(features, labels, rows)
+    matrix = features.to_numpy()
+    team_seasons = rows["season"].to_numpy()
+    seasons = sorted(int(season) for season in np.unique(paired["season"]))
+    if mode == "fixed" and model is None:
+        model = CompiledModel.load(os.path.join(ARTIFACT_DIR, COMPILED_MODEL_FILE))
+
+    tasks = []
+    evaluated = []
+    for season in seasons:
+        test = paired[paired["season"] == season]
+        train_features = train_labels = None
+        if mode != "fixed":
+            fit_on = np.isin(team_seasons, training_seasons(season, seasons, mode, window))
+            if not fit_on.any():
+                continue
+            train_features, train_labels = matrix[fit_on], labels.to_numpy()[fit_on]
+        tasks.append((
+            model if mode == "fixed" else None,
+            train_features,
+            train_labels,
+            matrix[test["home_row"].to_numpy()],
+            matrix[test["away_row"].to_numpy()],
+            test["date"].to_numpy().astype("datetime64[D]"),
+        ))
+        evaluated.append(test)
+    if not tasks:
+        raise ValueError("Not enough seasons to backtest; walk-forward modes need at least two")
+
+    if workers == 1 or len(tasks) == 1:
+        probabilities = [score_season(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            probabilities = list(pool.map(score_season, tasks))
+
+    scored = pd.concat(evaluated, ignore_index=True)
+    scored["home_probability"] = np.concatenate(probabilities)
+    per_season = pd.DataFrame([
+        dict(season=season, **evaluate(group["home_probability"].to_numpy(), group["home_won"].to_numpy()))
+        for season, group in scored.groupby("season")
+    ])
+    probability = scored["home_probability"].to_numpy()
+    outcome = scored["home_won"].to_numpy()
+    return per_season, evaluate(probability, outcome), calibration(probability, outcome), scored
+
+
+def main(argv):
+    from train import read_game_logs
+
+    if len(argv) < 2:
+        print(__doc__[__doc__.index("Usage:"):].rstrip())
+        return 1
+    mode = argv[2] if len(argv) > 2 else "expanding"
+    window = int(argv[3]) if len(argv) > 3 else DEFAULT_WINDOW
+    workers = int(os.environ["NBA_BACKTEST_WORKERS"]) if os.environ.get("NBA_BACKTEST_WORKERS") else None
+
+    started = time.perf_counter()
+    per_season, overall, bins, _ = backtest(read_game_logs(argv[1]), mode, window, workers=workers)
+    elapsed = time.perf_counter() - started
+
+    with pd.option_context("display.float_format", "{:.4f}".format, "display.width", 120):
+        print(per_season.to_string(index=False))
+        print()
+        print(bins[bins["games"] > 0].to_string(index=False))
+    print()
+    print(f"{mode} backtest over {overall['games']} games in {elapsed:.2f}s: "
+          f"accuracy {overall['accuracy']:.4f} (home team wins {overall['home_rate']:.4f}), "
+          f"log-loss {overall['log_loss']:.4f} (coin flip {np.log(2.0):.4f}), "
+          f"Brier {overall['brier']:.4f} (coin flip 0.2500)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,166 @@
+"""
+Asynchronous micro-batching scheduler for the prediction service
+Concurrent requests are gathered for up to max_wait seconds (or max_batch_size
+items), scored in one vectorized predict_games call, and each caller gets its
+own row back.  A batch is scored immediately once it holds every request that
+is currently in flight, so a lone request never waits out the window.  The
+event loop runs in a background thread so the threaded HTTP handlers can
+submit work with submit_threadsafe().
+"""
+
+import asyncio
+import threading
+
+from predictor import split_results
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT = 0.002  # seconds
+
+# Upper bounds of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+class MicroBatcher:
+    """Collects single-item requests into batches for a vectorized scoring function
+
+    score_batch receives a list of items and must return a list of results in
+    the same order.
+    """
+
+    def __init__(self, score_batch, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait=DEFAULT_MAX_WAIT):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.loop = None
+        self._queue = None
+        self._thread = None
+        self._worker = None
+        self._stats_lock = threading.Lock()
+        self._inflight = 0
+        self.batches = 0
+        self.items = 0
+        self.max_queue_depth = 0
+        self.batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+
+    def start(self):
+        """Run the event loop in a daemon thread"""
+        ready = threading.Event()
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            self._queue = asyncio.Queue()
+            self._worker = self.loop.create_task(self._run())
+            ready.set()
+            self.loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="micro-batcher", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        if self.loop is None:
+            return
+
+        async def shutdown():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self.loop.stop()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop)
+        self._thread.join(timeout=1.0)
+        self.loop.close()
+        self.loop = None
+
+    async def submit(self, item):
+        """Queue one item and wait for its result (call from the batcher's loop)"""
+        future = self.loop.create_future()
+        await self._queue.put((item, future))
+        depth = self._queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        return await future
+
+    def submit_threadsafe(self, item, timeout=None):
+        """Submit from any thread and block until the item has been scored"""
+        with self._stats_lock:
+            self._inflight += 1
+        try:
+            return asyncio.run_coroutine_threadsafe(self.submit(item), self.loop).result(timeout)
+        finally:
+            with self._stats_lock:
+                self._inflight -= 1
+
+    async def _run(self):
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = self.loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                # Take whatever is already queued without yielding, then wait out the window
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                if len(batch) >= self._inflight:
+                    break
+                remaining = deadline - self.loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            self._score(batch)
+
+    def _score(self, batch):
+        items = [item for item, _ in batch]
+        try:
+            results = self.score_batch(items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        self._record(len(batch))
+
+    def _record(self, size):
+        bucket = next((i for i, bound in enumerate(BATCH_SIZE_BUCKETS) if size <= bound),
+                      len(BATCH_SIZE_BUCKETS))
+        with self._stats_lock:
+            self.batches += 1
+            self.items += size
+            self.batch_size_counts[bucket] += 1
+
+    def stats(self):
+        """Queue depth and batch size histogram for monitoring"""
+        with self._stats_lock:
+            histogram = {f"le_{bound}": count for bound, count in zip(BATCH_SIZE_BUCKETS, self.batch_size_counts)}
+            histogram["le_inf"] = self.batch_size_counts[-1]
+            return {
+                "queueDepth": self._queue.qsize() if self._queue is not None else 0,
+                "maxQueueDepth": self.max_queue_depth,
+                "batches": self.batches,
+                "items": self.items,
+                "meanBatchSize": self.items / self.batches if self.batches else 0.0,
+                "maxBatchSize": self.max_batch_size,
+                "maxWaitMs": self.max_wait * 1000.0,
+                "batchSizeHistogram": histogram,
+            }
+
+
+def prediction_batcher(predictor, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait=DEFAULT_MAX_WAIT):
+    """MicroBatcher that scores (home_team, away_team, date) items with predictor.predict_games"""
+
+    def score_batch(games):
+        return split_results(predictor.predict_games(games))
+
+    return MicroBatcher(score_batch, max_batch_size, max_wait)
@@ -0,0 +1,109 @@
+"""
+Explanation benchmark and correctness check
+Scores a large synthetic batch with and without explain=k and checks that
+explaining leaves the probabilities unchanged, that every side's terms add
+up to its decision value, that argpartition picks the same top-k
+features as a full sort, and that explained calls still take their
+probabilities from the matchup matrix and the prediction cache
+
+Usage: python benchmarks/bench_explain.py [games] [k]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics  # noqa: E402
+from cache import PredictionCache  # noqa: E402
+from feature_index import FeatureIndex  # noqa: E402
+from matchup_matrix import MatchupMatrix  # noqa: E402
+from predictor import ARTIFACT_DIR, COMPILED_MODEL_FILE, CompiledModel, Predictor  # noqa: E402
+from synthetic import TEAM_CODES, synthetic_games  # noqa: E402
+
+ROUNDS = 3
+BUDGET_SECONDS = 1.0  # for 100k explained games
+
+
+def best_time(function):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def span_counts(*names):
+    spans = metrics.snapshot()
+    return [spans[name].count if name in spans else 0 for name in names]
+
+
+def check_fast_paths(model, source, games, k):
+    """True if explained calls read the cache and the matrix and leave the cached results bare"""
+    predictor = Predictor(model, source, PredictionCache())
+    home, away, day = games["home_team"][0], games["away_team"][0], games["date"][0]
+    plain = predictor.predict_game(home, away, day)
+    scored = span_counts("score")
+    explained = predictor.predict_game(home, away, day, explain=k)
+    cached = (span_counts("score") == scored and predictor.cache.hits == 1
+              and {name: explained[name] for name in plain} == plain
+              and predictor.predict_game(home, away, day) == plain)
+
+    slate = games[games["date"] == day]
+    predictor.matchups = MatchupMatrix.build(predictor, day, 0)
+    before = span_counts("matrix_lookup_many", "score_many")
+    columns = predictor.predict_games(slate, explain=k)
+    lookups, scores = (after - start for after, start in zip(span_counts("matrix_lookup_many", "score_many"), before))
+    from_matrix = lookups == 1 and scores == 0 and len(columns["homeTopFeatures"]) == len(slate)
+    print(f"explained calls: single game {'from the cache' if cached else 'RESCORED'}, "
+          f"slate {'from the matchup matrix' if from_matrix else 'RESCORED'}")
+    return cached and from_matrix
+
+
+def main(argv):
+    n_games = int(argv[1]) if len(argv) > 1 else 100_000
+    k = int(argv[2]) if len(argv) > 2 else 5
+    rows = synthetic_games(seasons=1)
+    model = CompiledModel.load(os.path.join(ARTIFACT_DIR, COMPILED_MODEL_FILE))
+    predictor = Predictor(model, FeatureIndex.build(rows, initial_row=model.baseline))
+
+    rng = np.random.default_rng(0)
+    codes = np.array(TEAM_CODES)
+    home = rng.integers(0, len(codes), n_games)
+    away = (home + rng.integers(1, len(codes), n_games)) % len(codes)
+    days = np.unique(np.array([row["date"] for row in rows], dtype="datetime64[D]"))
+    games = pd.DataFrame({"home_team": codes[home], "away_team": codes[away], "date": rng.choice(days, n_games)})
+
+    plain_seconds, plain = best_time(lambda: predictor.predict_games(games))
+    explained_seconds, explained = best_time(lambda: predictor.predict_games(games, explain=k))
+    print(f"{n_games} games: {plain_seconds * 1000:.0f}ms plain, {explained_seconds * 1000:.0f}ms with top-{k} "
+          f"explanations ({n_games / explained_seconds:,.0f} games/s)")
+
+    unchanged = all(np.array_equal(plain[name], explained[name]) for name in plain)
+    features = predictor.feature_source.lookup(np.concatenate([games["home_team"], games["away_team"]]),
+                                               np.tile(games["date"].to_numpy().astype("datetime64[D]"), 2))
+    terms = model.contributions(features)
+    intercept = model.bias - model.contribution_offset.sum()
+    adds_up = np.allclose(terms.sum(axis=1) + intercept, model.decision(features))
+    expected = np.array(model.feature_names)[np.argsort(-np.abs(terms), axis=1, kind="stable")[:, :k]]
+    chosen = np.concatenate([explained["homeTopFeatures"], explained["awayTopFeatures"]])
+    mismatched = int(np.any(chosen != expected, axis=1).sum())
+    print(f"probabilities {'unchanged' if unchanged else 'CHANGED'}, terms "
+          f"{'add up' if adds_up else 'DO NOT add up'} to the decision values, {mismatched} sides with a "
+          f"different top-{k} than a full sort")
+
+    budget = BUDGET_SECONDS * n_games / 100_000
+    if explained_seconds > budget:
+        print(f"FAILED: explaining {n_games} games took more than {budget:g}s")
+        return 1
+    fast = check_fast_paths(model, predictor.feature_source, games, k)
+    return 0 if unchanged and adds_up and not mismatched and fast else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,142 @@
+"""
+Streaming ingest benchmark and parity check
+Trains on the first seasons of synthetic game logs, replays the rest through
+ingest.py one game night per file and checks the refreshed weights against a
+single Ridge solve over every row in the deployed feature space, then drops
+one night twice into an ingestor without a history and checks that the
+second copy is rejected unapplied, that an ingestor seeded from a feature
+index alone still answers past dates point-in-time, and that a night read
+back from CSV keeps its home flags in the history store and in train.py's
+game logs
+
+Usage: python benchmarks/bench_ingest.py [seasons] [ingested seasons]
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feature_index import FeatureIndex  # noqa: E402
+from history_store import open_or_create  # noqa: E402
+from ingest import Ingestor, read_box_scores  # noqa: E402
+from predictor import COMPILED_MODEL_FILE, CompiledModel, Predictor  # noqa: E402
+from ridge import RIDGE_STATS_FILE, RidgeStats, refit  # noqa: E402
+from synthetic import synthetic_games  # noqa: E402
+from train import build_features, prepare_game_logs, train  # noqa: E402
+
+
+def csv_round_trip(night, scratch):
+    """Write one night as CSV, read it back as ingest does; True if the home flags survive"""
+    path = os.path.join(scratch, "night.csv")
+    night.to_csv(path, index=False)
+    box_scores = read_box_scores(path)
+    stored = open_or_create(os.path.join(scratch, "csv-history")).append(box_scores).to_frame()
+    expected = night.set_index("team")["home"].astype(bool)
+    same = (stored.set_index("team")["home"].astype(bool).sort_index().equals(expected.sort_index())
+            and prepare_game_logs(box_scores).set_index("team")["home"].sort_index().equals(expected.sort_index()))
+    print(f"{len(night)} box scores through CSV: home flags {'kept' if same else 'CHANGED'} "
+          f"({int((~expected).sum())} away sides)")
+    return same
+
+
+def index_seeded(model, base, games, scratch, source_dir):
+    """Ingest every night over a FeatureIndex of the base seasons; True if lookups match an index of all games"""
+    drop_dir = os.path.join(scratch, "over-index")
+    shutil.copytree(source_dir, drop_dir)
+    predictor = Predictor(model, FeatureIndex.build(base.to_dict("records"), initial_row=model.baseline))
+    Ingestor(predictor, drop_dir, state_dir=os.path.join(scratch, "over-index-state")).poll()
+
+    expected = FeatureIndex.build(games.to_dict("records"), initial_row=model.baseline)
+    days = np.array(sorted(set(games["date"])), dtype="datetime64[D]")
+    dates = np.concatenate([days[::25], [days[-1] + 1]])
+    teams = np.repeat(expected.teams, dates.shape[0])
+    dates = np.tile(dates, len(expected.teams))
+    # Within the ingested nights the store only knows each team's latest game
+    asked = (dates <= days[days <= np.datetime64(base["date"].max(), "D")][-1] + 1) | (dates > days[-1])
+    error = np.abs(predictor.feature_source.lookup(teams[asked], dates[asked])
+                   - expected.lookup(teams[asked], dates[asked])).max()
+    print(f"ingested over a feature index: max feature difference {error:.2e} on {int(asked.sum())} lookups")
+    return error < 1e-9
+
+
+def ingest_twice(model, scratch, name, source_dir):
+    """Drop one file, then the same file again; True if the second copy changed nothing"""
+    drop_dir = os.path.join(scratch, "twice")
+    os.makedirs(drop_dir)
+    predictor = Predictor(model)
+    ingestor = Ingestor(predictor, drop_dir, state_dir=os.path.join(scratch, "twice-state"))
+    shutil.copy(os.path.join(source_dir, name), drop_dir)
+    ingestor.poll()
+    weights, store_version, rows = predictor.model.weights.copy(), ingestor.store.version, ingestor.rows
+    shutil.copy(os.path.join(source_dir, name), drop_dir)
+    ingestor.poll()
+    rejected = (ingestor.failed == 1 and ingestor.rows == rows and ingestor.store.version == store_version
+                and np.array_equal(predictor.model.weights, weights))
+    print(f"{name} dropped twice: second copy {'rejected' if rejected else 'APPLIED AGAIN'}")
+    return rejected
+
+
+def main(argv):
+    seasons = int(argv[1]) if len(argv) > 1 else 4
+    ingested = int(argv[2]) if len(argv) > 2 else 1
+    games = pd.DataFrame(synthetic_games(seasons=seasons))
+    cutoff = games["season"].max() - ingested
+    base, new = games[games["season"] <= cutoff], games[games["season"] > cutoff]
+
+    with tempfile.TemporaryDirectory() as scratch:
+        artifacts = os.path.join(scratch, "artifacts")
+        drop_dir = os.path.join(scratch, "incoming")
+        os.makedirs(drop_dir)
+        train(base, artifacts, 1)
+        open_or_create(os.path.join(scratch, "history")).append(base)
+        model = CompiledModel.load(os.path.join(artifacts, COMPILED_MODEL_FILE))
+        for date, night in new.groupby("date"):
+            with open(os.path.join(drop_dir, f"{date}.jsonl"), "w") as f:
+                f.writelines(json.dumps(row) + "\n" for row in night.to_dict("records"))
+
+        predictor = Predictor(model)
+        ingestor = Ingestor(predictor, drop_dir, state_dir=os.path.join(scratch, "state"),
+                            history_dir=os.path.join(scratch, "history"),
+                            stats=RidgeStats.load(os.path.join(artifacts, RIDGE_STATS_FILE)))
+        start = time.perf_counter()
+        files = ingestor.poll()
+        elapsed = time.perf_counter() - start
+        round_trip = csv_round_trip(new[new["date"] == new["date"].min()], scratch)
+        processed = os.path.join(drop_dir, "processed")
+        rejected = ingest_twice(model, scratch, sorted(os.listdir(processed))[-1], processed)
+        point_in_time = index_seeded(model, base, games, scratch, processed)
+
+    print(f"{files} game nights, {ingestor.rows} training rows in {elapsed:.2f}s "
+          f"({elapsed / max(files, 1) * 1000:.1f} ms per night including state saves)")
+
+    features, labels, _ = build_features(prepare_game_logs(games), 1)
+    stats = RidgeStats(len(model.feature_names))
+    stats.update(features.values * model.scale + model.offset, labels.values)
+    expected = refit(model, stats)
+    error = np.abs(expected.weights - predictor.model.weights).max()
+    print(f"max weight difference against a full solve {error:.2e}; {stats.samples} rows in both")
+    if not error < 1e-9 or ingestor.failed or stats.samples != ingestor.stats.samples:
+        print("FAILED: incremental refresh does not match the full solve")
+        return 1
+    if not rejected:
+        print("FAILED: ingesting the same file twice changed the features or model")
+        return 1
+    if not point_in_time:
+        print("FAILED: ingesting over a feature index changed its point-in-time rows")
+        return 1
+    if not round_trip:
+        print("FAILED: home flags read from CSV do not match the source games")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,59 @@
+"""
+Matchup matrix benchmark and parity check
+Builds the all-pairs matrix over a synthetic season's features, times
+rebuilds and single-game predictions with and without it, and checks that
+every pair on every day matches the pipeline exactly
+
+Usage: python benchmarks/bench_matchups.py [days]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feature_index import FeatureIndex  # noqa: E402
+from matchup_matrix import TEAM_CODES, MatchupMatrix  # noqa: E402
+from predictor import ARTIFACT_DIR, COMPILED_MODEL_FILE, CompiledModel, Predictor, split_results  # noqa: E402
+from synthetic import synthetic_games  # noqa: E402
+
+REPEATS = 200
+SINGLE_CALLS = 20_000
+
+
+def per_call(function, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls
+
+
+def main(argv):
+    days = int(argv[1]) if len(argv) > 1 else 7
+    rows = synthetic_games(seasons=1)
+    model = CompiledModel.load(os.path.join(ARTIFACT_DIR, COMPILED_MODEL_FILE))
+    predictor = Predictor(model, FeatureIndex.build(rows, initial_row=model.baseline))
+    start = np.datetime64(rows[-1]["date"], "D") - days // 2
+
+    build = per_call(lambda: MatchupMatrix.build(predictor, start, days), REPEATS)
+    games = [(home, away, start + day) for day in range(days + 1)
+             for home in TEAM_CODES for away in TEAM_CODES if home != away]
+    expected = split_results(predictor.predict_games(games))
+    pipeline = per_call(lambda: predictor.predict_game("BOS", "LAL", start), SINGLE_CALLS)
+
+    predictor.matchups = MatchupMatrix.build(predictor, start, days)
+    actual = split_results(predictor.predict_games(games))
+    singles = sum(predictor.predict_game(*game) != result for game, result in zip(games, expected))
+    lookup = per_call(lambda: predictor.predict_game("BOS", "LAL", start), SINGLE_CALLS)
+
+    mismatched = sum(a != b for a, b in zip(actual, expected)) + singles
+    print(f"{days + 1} day(s) x 870 pairs rebuilt in {build * 1000:.2f} ms; predict_game "
+          f"{pipeline * 1e6:.1f}us -> {lookup * 1e6:.1f}us; {mismatched} of {2 * len(games)} results differ")
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,176 @@
+"""
+Span recording overhead and correctness check
+Times predict_game with recording on and off, through the pipeline and the
+matchup matrix, and checks that concurrent threads lose no counts, that every
+value lands in the bucket that covers it, and that /metrics serves a
+well-formed histogram, and that short-lived threads (Streamlit runs each
+rerun on a new one) leave a bounded number of bucket lists behind
+
+Usage: python benchmarks/bench_metrics.py [calls] [threads]
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics  # noqa: E402
+from feature_index import FeatureIndex  # noqa: E402
+from matchup_matrix import MatchupMatrix  # noqa: E402
+from predictor import ARTIFACT_DIR, COMPILED_MODEL_FILE, CompiledModel, Predictor  # noqa: E402
+from server import create_server  # noqa: E402
+from synthetic import synthetic_games  # noqa: E402
+
+ROUNDS = 5
+OVERHEAD_BUDGET_US = 5.0
+
+
+def per_call(function, calls):
+    """Best of ROUNDS timings, so scheduler noise doesn't swamp a microsecond"""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+
+def overhead(label, function, calls, cost_per_span):
+    """Spans recorded per prediction times the measured cost of one span
+
+    End-to-end traced/untraced timings are printed too, but on a busy machine
+    their difference is mostly noise at this scale.
+    """
+    metrics.enable(False)
+    off = per_call(function, calls)
+    metrics.enable(True)
+    metrics.reset()
+    on = per_call(function, calls)
+    spans = sum(histogram.count for histogram in metrics.snapshot().values()) / (ROUNDS * calls)
+    added = spans * cost_per_span * 1e6
+    print(f"{label:>9}: {off * 1e6:.1f}us untraced, {on * 1e6:.1f}us traced; {spans:g} spans per "
+          f"prediction = +{added:.2f}us")
+    return added
+
+
+def span_cost(calls):
+    """Seconds per mark() call, net of the loop around it"""
+    started = metrics.clock()
+    loop = per_call(lambda: None, calls)
+    return per_call(lambda: metrics.mark("bench", started), calls) - loop
+
+
+def check_threads(threads, per_thread):
+    metrics.reset()
+    values = np.random.default_rng(0).integers(1, 1 << 36, per_thread)
+
+    def worker():
+        for value in values.tolist():
+            metrics.record("threaded", value)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    histogram = metrics.snapshot()["threaded"]
+    expected = np.zeros(metrics.N_BUCKETS, dtype=np.int64)
+    np.add.at(expected, [metrics.bucket_of(value) for value in values.tolist()], threads)
+    misplaced = sum(
+        not metrics.bucket_bounds(metrics.bucket_of(v))[0] <= v < metrics.bucket_bounds(metrics.bucket_of(v))[1]
+        for v in values.tolist()
+    )
+    exact = (histogram.buckets == expected.tolist() and histogram.sum == threads * int(values.sum())
+             and histogram.max == int(values.max()))
+    print(f"{threads} threads x {per_thread} records: {histogram.count} counted, "
+          f"{'exact' if exact else 'MISMATCHED'} totals, {misplaced} values outside their bucket")
+    return exact and not misplaced
+
+
+def check_thread_churn(threads, spans=5):
+    """Record from many short-lived threads; lists of exited threads must be folded away"""
+    metrics.reset()
+    names = [f"churn_{i}" for i in range(spans)]
+
+    def worker():
+        for name in names:
+            metrics.record(name, 1000)
+
+    for _ in range(threads):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    started = time.perf_counter()
+    histograms = metrics.snapshot()
+    seconds = time.perf_counter() - started
+    lists = sum(len(metrics._shards.get(name, ())) for name in names)
+    counted = all(histograms[name].count == threads for name in names)
+    bounded = lists <= spans  # at most the lists of the one thread not yet seen to exit
+    print(f"{threads} short-lived threads: {lists} bucket lists kept, "
+          f"{'exact' if counted else 'MISMATCHED'} counts, snapshot in {seconds * 1000:.1f}ms")
+    return counted and bounded
+
+
+def check_endpoint(predictor):
+    server = create_server("127.0.0.1", 0, predictor=predictor, workers=2, batch_size=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        body = json.dumps({"date": "2024-01-15", "home_team": "BOS", "away_team": "LAL"}).encode()
+        request = urllib.request.Request(f"{base}/predict", body, {"Content-Type": "application/json"})
+        urllib.request.urlopen(request).read()
+        with urllib.request.urlopen(f"{base}/metrics") as response:
+            content_type = response.headers["Content-Type"]
+            text = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    buckets = {}
+    counts = {}
+    for line in text.splitlines():
+        if line.startswith("nba_span_seconds_bucket"):
+            labels, value = line.rsplit(" ", 1)
+            span = labels.split('span="', 1)[1].split('"', 1)[0]
+            buckets.setdefault(span, []).append(int(value))
+        elif line.startswith("nba_span_seconds_count"):
+            labels, value = line.rsplit(" ", 1)
+            counts[labels.split('span="', 1)[1].split('"', 1)[0]] = int(value)
+    well_formed = (
+        content_type.startswith("text/plain") and "http_predict" in counts
+        and all(b == sorted(b) and b[-1] == counts[span] for span, b in buckets.items())
+    )
+    print(f"/metrics: {len(counts)} spans, {'well-formed' if well_formed else 'MALFORMED'} histograms")
+    return well_formed
+
+
+def main(argv):
+    calls = int(argv[1]) if len(argv) > 1 else 20_000
+    threads = int(argv[2]) if len(argv) > 2 else 8
+    rows = synthetic_games(seasons=1)
+    model = CompiledModel.load(os.path.join(ARTIFACT_DIR, COMPILED_MODEL_FILE))
+    predictor = Predictor(model, FeatureIndex.build(rows, initial_row=model.baseline))
+    day = np.datetime64(rows[-1]["date"], "D")
+
+    cost = span_cost(calls)
+    print(f"one span: {cost * 1e9:.0f}ns")
+    pipeline = overhead("pipeline", lambda: predictor.predict_game("BOS", "LAL", day), calls, cost)
+    predictor.matchups = MatchupMatrix.build(predictor, day, 0)
+    matrix = overhead("matrix", lambda: predictor.predict_game("BOS", "LAL", day), calls, cost)
+
+    ok = check_threads(threads, 20_000) and check_thread_churn(2000) and check_endpoint(predictor)
+    if max(pipeline, matrix) > OVERHEAD_BUDGET_US:
+        print(f"FAILED: tracing costs more than {OVERHEAD_BUDGET_US:g}us per prediction")
+        return 1
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
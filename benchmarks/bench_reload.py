@@ -0,0 +1,111 @@
+"""
+Hot reload benchmark and consistency check
+Serves predictions from several threads while registry.py flips between two
+model versions every few milliseconds.  Every result must match the model
+named by its modelVersion, and latency percentiles are compared with a run
+without reloads.
+
+Usage: python benchmarks/bench_reload.py [seconds] [threads]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from predictor import ARTIFACT_DIR, COMPILED_MODEL_FILE, CompiledModel, Predictor  # noqa: E402
+from registry import ModelRegistry, deploy  # noqa: E402
+from teams import NBA_TEAMS  # noqa: E402
+
+TEAM_CODES = [team["value"] for team in NBA_TEAMS]
+RELOAD_EVERY = 0.005
+
+
+def variant(model, factor, version):
+    return CompiledModel(model.feature_names, model.weights * factor, model.bias * factor, model.scale,
+                         model.offset, model.coef * factor, model.baseline, version)
+
+
+def serve(predictor, seconds, threads):
+    """Per-call latencies and results from `threads` threads calling predict_game"""
+    deadline = time.perf_counter() + seconds
+    latencies = [[] for _ in range(threads)]
+    results = [[] for _ in range(threads)]
+
+    def worker(i):
+        rng = np.random.default_rng(i)
+        while time.perf_counter() < deadline:
+            home, away = rng.choice(TEAM_CODES, 2, replace=False)
+            start = time.perf_counter()
+            result = predictor.predict_game(home, away, "2024-01-15")
+            latencies[i].append(time.perf_counter() - start)
+            results[i].append(result)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return np.concatenate(latencies), [result for chunk in results for result in chunk]
+
+
+def describe(label, latencies):
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+    print(f"{label:>16}: {latencies.shape[0]} calls, p50 {p50:.0f}us, p99 {p99:.0f}us, "
+          f"max {latencies.max() * 1e6:.0f}us")
+    return p99
+
+
+def main(argv):
+    seconds = float(argv[1]) if len(argv) > 1 else 2.0
+    threads = int(argv[2]) if len(argv) > 2 else 8
+    base = CompiledModel.load(os.path.join(ARTIFACT_DIR, COMPILED_MODEL_FILE))
+    models = {name: variant(base, factor, name) for name, factor in (("blue", 1.0), ("green", 1.5))}
+
+    with tempfile.TemporaryDirectory() as scratch:
+        for name, model in models.items():
+            os.makedirs(os.path.join(scratch, name))
+            model.save(os.path.join(scratch, name, COMPILED_MODEL_FILE))
+        deploy("blue", scratch)
+        predictor = Predictor(models["blue"])
+        registry = ModelRegistry(predictor, artifacts_dir=scratch, root_dir=scratch)
+
+        steady, _ = serve(predictor, seconds, threads)
+        stop = threading.Event()
+
+        def flip():
+            names = ["green", "blue"]
+            while not stop.is_set():
+                deploy(names[registry.reloads % 2], scratch)
+                registry.check()
+                stop.wait(RELOAD_EVERY)
+
+        flipper = threading.Thread(target=flip)
+        flipper.start()
+        reloading, results = serve(predictor, seconds, threads)
+        stop.set()
+        flipper.join()
+
+    describe("steady", steady)
+    describe("reloading", reloading)
+    print(f"{registry.reloads} reloads, {registry.failures} failures")
+
+    mismatched = 0
+    for result in results:
+        expected = Predictor(models[result["modelVersion"]]).predict_game(
+            result["homeTeam"], result["awayTeam"], result["gameDate"])
+        mismatched += expected != result
+    print(f"{len(results)} results checked against their modelVersion, {mismatched} mismatched")
+    if mismatched or registry.failures or registry.reloads < 2:
+        print("FAILED: a reload served inconsistent results")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
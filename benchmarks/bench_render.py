@@ -0,0 +1,141 @@
+"""
+Streamlit render benchmark
+Drives the app through a fixed interaction script with AppTest and reports,
+per rerun, the bytes of ForwardMsgs the script emitted, the bytes that would
+reach the browser once Streamlit's message cache sends repeats as hash
+references, and the wall time of the script run.  Also checks that the
+latency spans recorded on every rerun's fresh thread do not pile up
+
+Usage: python benchmarks/bench_render.py [app.py] [rounds]
+"""
+
+import os
+import statistics
+import sys
+import threading
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import metrics  # noqa: E402
+from streamlit import config  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from streamlit.runtime.forward_msg_cache import create_reference_msg, populate_hash_if_needed  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner  # noqa: E402
+
+_captured = []
+_script_seconds = []
+_run = LocalScriptRunner.run
+_run_script = LocalScriptRunner._run_script
+
+
+def _recording_run(self, *args, **kwargs):
+    tree = _run(self, *args, **kwargs)
+    _captured.append(list(self.forward_msgs()))
+    return tree
+
+
+def _timed_run_script(self, rerun_data):
+    start = time.perf_counter()
+    try:
+        _run_script(self, rerun_data)
+    finally:
+        _script_seconds.append(time.perf_counter() - start)
+
+
+LocalScriptRunner.run = _recording_run
+LocalScriptRunner._run_script = _timed_run_script
+
+
+class WireModel:
+    """Mimics Runtime._send_message: cacheable messages already seen go out as references"""
+
+    def __init__(self):
+        self.min_size = int(config.get_option("global.minCachedMessageSize"))
+        self.seen = set()
+
+    def size(self, msg):
+        if msg.ByteSize() < self.min_size:
+            return msg.ByteSize()
+        copy = ForwardMsg()
+        copy.CopyFrom(msg)
+        digest = populate_hash_if_needed(copy)
+        if digest in self.seen:
+            return create_reference_msg(copy).ByteSize()
+        self.seen.add(digest)
+        return msg.ByteSize()
+
+
+def interactions(at):
+    """(step name, action) pairs covering every view of the app"""
+    return [
+        ("load", lambda: at.run()),
+        ("pick home", lambda: at.selectbox[0].select_index(2).run()),
+        ("pick away", lambda: at.selectbox[1].select_index(14).run()),
+        ("predict", lambda: at.button[0].click().run()),
+        ("back", lambda: at.button[0].click().run()),
+        ("rerun", lambda: at.run()),
+        ("slate", lambda: at.radio[0].set_value("Full Slate").run()),
+        ("single", lambda: at.radio[0].set_value("Single Game").run()),
+    ]
+
+
+def run_round(app_path, wire):
+    at = AppTest.from_file(app_path, default_timeout=30)
+    samples = []
+    for name, action in interactions(at):
+        del _captured[:]
+        del _script_seconds[:]
+        action()
+        elapsed = sum(_script_seconds)
+        if at.exception:
+            raise RuntimeError(f"{name}: {at.exception[0].value}")
+        messages = [msg for batch in _captured for msg in batch]
+        samples.append((
+            name,
+            sum(msg.ByteSize() for msg in messages),
+            sum(wire.size(msg) for msg in messages),
+            elapsed,
+        ))
+    return samples
+
+
+def main(argv):
+    app_path = os.path.abspath(argv[1]) if len(argv) > 1 else os.path.join(ROOT, "app.py")
+    rounds = int(argv[2]) if len(argv) > 2 else 5
+    warnings.simplefilter("ignore")
+    wire = WireModel()
+    run_round(app_path, WireModel())  # warm imports and the predictor
+    by_step = {}
+    for _ in range(rounds):
+        for name, emitted, sent, elapsed in run_round(app_path, wire):
+            by_step.setdefault(name, []).append((emitted, sent, elapsed))
+
+    print(f"{os.path.relpath(app_path, ROOT)}: {rounds} rounds")
+    print(f"{'step':<12}{'emitted B':>12}{'wire B':>12}{'render ms':>12}")
+    totals = []
+    for name, samples in by_step.items():
+        emitted, sent, elapsed = zip(*samples)
+        totals.extend(samples)
+        print(f"{name:<12}{statistics.mean(emitted):>12.0f}{statistics.mean(sent):>12.0f}"
+              f"{statistics.median(elapsed) * 1000:>12.2f}")
+    emitted, sent, elapsed = zip(*totals)
+    print(f"{'per rerun':<12}{statistics.mean(emitted):>12.0f}{statistics.mean(sent):>12.0f}"
+          f"{statistics.median(elapsed) * 1000:>12.2f}")
+
+    # Span bucket lists may only belong to threads that are still running
+    spans = metrics.snapshot()
+    lists = sum(len(shards) for shards in metrics._shards.values())
+    limit = len(spans) * threading.active_count()
+    print(f"{len(totals)} reruns: {lists} span bucket lists kept for {threading.active_count()} live threads")
+    if lists > limit:
+        print(f"FAILED: more than {limit} bucket lists kept; exited threads are leaking them")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
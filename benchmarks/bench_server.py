@@ -0,0 +1,109 @@
+"""
+HTTP load benchmark for server.py's micro-batching
+Sends /predict requests from many keep-alive clients at a server with
+batching off and on, and from one client to time a lone request.  Reports
+throughput, latency and the batcher's /stats, and checks that batching was
+used and that every response matches a direct predict_game call.
+
+Usage: python benchmarks/bench_server.py [requests] [clients]
+"""
+
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feature_index import FeatureIndex  # noqa: E402
+from predictor import ARTIFACT_DIR, COMPILED_MODEL_FILE, CompiledModel, Predictor  # noqa: E402
+from server import create_server  # noqa: E402
+from synthetic import TEAM_CODES, synthetic_games  # noqa: E402
+
+LONE_REQUESTS = 500
+
+
+def workload(n, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    days = np.unique(np.array([row["date"] for row in rows], dtype="datetime64[D]"))
+    games = []
+    for _ in range(n):
+        home, away = rng.choice(len(TEAM_CODES), 2, replace=False)
+        games.append((TEAM_CODES[home], TEAM_CODES[away], str(rng.choice(days))))
+    return games
+
+
+def client(port, games, results, latencies):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    for home, away, day in games:
+        body = json.dumps({"date": day, "home_team": home, "away_team": away})
+        started = time.perf_counter()
+        connection.request("POST", "/predict", body, {"Content-Type": "application/json"})
+        results.append(((home, away, day), json.loads(connection.getresponse().read())))
+        latencies.append(time.perf_counter() - started)
+    connection.close()
+
+
+def run(predictor, games, n_clients, batch_size):
+    server = create_server("127.0.0.1", 0, predictor=predictor, workers=max(16, n_clients), batch_size=batch_size)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    try:
+        lone, lone_latencies = [], []
+        client(port, games[:LONE_REQUESTS], lone, lone_latencies)
+
+        results, latencies = [], []
+        pool = [threading.Thread(target=client, args=(port, games[i::n_clients], results, latencies))
+                for i in range(n_clients)]
+        started = time.perf_counter()
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        seconds = time.perf_counter() - started
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        connection.request("GET", "/stats")
+        batcher = json.loads(connection.getresponse().read())["batcher"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    label = f"batching {'on' if batch_size else 'off'}"
+    print(f"{label:>13}: lone p50 {np.percentile(lone_latencies, 50) * 1e6:.0f}us; {n_clients} clients "
+          f"{len(results) / seconds:,.0f} req/s, p50 {np.percentile(latencies, 50) * 1e3:.1f}ms, "
+          f"p99 {np.percentile(latencies, 99) * 1e3:.1f}ms", end="")
+    if batcher is not None:
+        print(f"; {batcher['batches']} batches, mean size {batcher['meanBatchSize']:.1f}", end="")
+    print()
+    return len(results) / seconds, batcher, lone + results
+
+
+def main(argv):
+    n_requests = int(argv[1]) if len(argv) > 1 else 4000
+    n_clients = int(argv[2]) if len(argv) > 2 else 64
+    rows = synthetic_games(seasons=1)
+    model = CompiledModel.load(os.path.join(ARTIFACT_DIR, COMPILED_MODEL_FILE))
+    predictor = Predictor(model, FeatureIndex.build(rows, initial_row=model.baseline))
+    games = workload(n_requests, rows)
+
+    unbatched, _, plain = run(predictor, games, n_clients, 0)
+    batched, batcher, pooled = run(predictor, games, n_clients, 64)
+    print(f"throughput x{batched / unbatched:.2f} with batching")
+
+    mismatched = sum(result != predictor.predict_game(*game) for game, result in plain + pooled)
+    # The lone client's requests are batches of one; the concurrent ones must share batches
+    concurrent_batches = batcher["batches"] - LONE_REQUESTS
+    shared = batcher["items"] == LONE_REQUESTS + n_requests and concurrent_batches < n_requests
+    print(f"{mismatched} responses differ from predict_game")
+    if mismatched or not shared:
+        print("FAILED: batching was not used or returned different results")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
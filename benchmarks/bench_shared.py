@@ -0,0 +1,156 @@
+"""
+Shared model memory benchmark
+Starts several worker processes that each serve from a large feature index,
+first loading their own copy from feature_index.npz, then attaching to one
+shared_model.py snapshot.  Reports every worker's RSS, proportional set size
+(PSS, shared pages split between the processes mapping them) and private
+memory while all of them are alive, then publishes a new model and times how
+long the shared workers take to pick it up.
+
+Usage: python benchmarks/bench_shared.py [workers] [rows_per_team]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from feature_index import KEY_STRIDE, FEATURE_INDEX_FILE, FeatureIndex  # noqa: E402
+from feature_store import N_FEATURES  # noqa: E402
+from predictor import ARTIFACT_DIR, COMPILED_MODEL_FILE, CompiledModel  # noqa: E402
+from shared_model import attach, publish  # noqa: E402
+from teams import TEAMS  # noqa: E402
+
+WORKER = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+import numpy as np
+from predictor import CompiledModel, Predictor
+from feature_index import FeatureIndex
+from shared_model import SharedModelWatcher, attach
+
+mode, directory = sys.argv[1], sys.argv[2]
+started = time.perf_counter()
+if mode == "shared":
+    model, source, snapshot = attach(directory)
+else:
+    model = CompiledModel.load(directory + "/model.npz")
+    source = FeatureIndex.load(directory + "/feature_index.npz", initial_row=model.baseline)
+loaded = time.perf_counter() - started
+predictor = Predictor(model, source)
+checksum = float(np.asarray(source.rows).sum())  # touch every page, as a long-running server would
+predictor.predict_games([("BOS", "LAL", "2024-01-15")] * 100)
+print(json.dumps({{"loadMs": loaded * 1000.0, "checksum": checksum}}), flush=True)
+
+sys.stdin.readline()  # the parent has read our memory use
+if mode == "shared":
+    watcher = SharedModelWatcher(predictor, snapshot, directory, interval=0.01)
+    sys.stdin.readline()  # a new snapshot is published
+    started = time.perf_counter()
+    while not watcher.check():
+        time.sleep(0.005)
+    print(json.dumps({{"version": predictor.model.version, "swapMs": (time.perf_counter() - started) * 1000.0}}),
+          flush=True)
+    sys.stdin.readline()
+"""
+
+
+def memory(pid):
+    """RSS, PSS and private memory of a process in MB, from smaps_rollup"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024.0
+    return fields["Rss"], fields["Pss"], fields["Private_Clean"] + fields["Private_Dirty"]
+
+
+def large_index(rows_per_team, model):
+    rng = np.random.default_rng(0)
+    n_teams = len(TEAMS)
+    days = np.arange(rows_per_team) + np.datetime64("2000-01-01", "D").astype(np.int64)
+    keys = (np.arange(n_teams)[:, None] * KEY_STRIDE + days[None, :]).ravel()
+    rows = rng.random((keys.shape[0], N_FEATURES))
+    seasons = np.full(keys.shape[0], 2024)
+    return FeatureIndex(TEAMS.codes, keys, rows, seasons, initial_row=model.baseline)
+
+
+def run_workers(mode, directory, n_workers, publish_next=None):
+    script = WORKER.format(root=ROOT)
+    workers = [
+        subprocess.Popen([sys.executable, "-c", script, mode, directory], stdin=subprocess.PIPE,
+                         stdout=subprocess.PIPE, text=True)
+        for _ in range(n_workers)
+    ]
+    ready = [json.loads(worker.stdout.readline()) for worker in workers]
+    usage = [memory(worker.pid) for worker in workers]
+    swaps = []
+    for worker in workers:
+        worker.stdin.write("\n")
+        worker.stdin.flush()
+    if publish_next is not None:
+        time.sleep(0.1)  # let every worker start its watcher on the current snapshot
+        publish_next()
+        for worker in workers:
+            worker.stdin.write("\n")
+            worker.stdin.flush()
+        swaps = [json.loads(worker.stdout.readline()) for worker in workers]
+    for worker in workers:
+        worker.stdin.close()
+        worker.wait()
+
+    rss, pss, private = (sum(column) for column in zip(*usage))
+    load = max(result["loadMs"] for result in ready)
+    print(f"{mode:>8}: {n_workers} workers, total RSS {rss:.0f} MB, total PSS {pss:.0f} MB, "
+          f"private {private / n_workers:.0f} MB per worker, load {load:.1f} ms")
+    return pss, private / n_workers, {result["checksum"] for result in ready}, swaps
+
+
+def main(argv):
+    n_workers = int(argv[1]) if len(argv) > 1 else 4
+    rows_per_team = int(argv[2]) if len(argv) > 2 else 20_000
+    model = CompiledModel.load(os.path.join(ARTIFACT_DIR, COMPILED_MODEL_FILE))
+
+    with tempfile.TemporaryDirectory() as scratch:
+        index = large_index(rows_per_team, model)
+        table_mb = index.rows.nbytes / 2**20
+        model.save(os.path.join(scratch, COMPILED_MODEL_FILE))
+        index.save(os.path.join(scratch, FEATURE_INDEX_FILE))
+        shared_dir = os.path.join(scratch, "shared")
+        os.makedirs(shared_dir)
+        publish(model, index, shared_dir)
+        del index
+        print(f"feature table: {rows_per_team * len(TEAMS)} rows, {table_mb:.0f} MB")
+
+        _, private_copy, private_sums, _ = run_workers("private", scratch, n_workers)
+
+        def publish_next():
+            variant = CompiledModel(model.feature_names, model.weights * 1.5, model.bias, model.scale,
+                                    model.offset, model.coef, model.baseline, "next")
+            _, source, _ = attach(shared_dir)
+            publish(variant, source, shared_dir)
+
+        _, private_shared, shared_sums, swaps = run_workers("shared", shared_dir, n_workers, publish_next)
+
+    swapped = all(swap["version"] == "next" for swap in swaps)
+    print(f"reload reached {sum(swap['version'] == 'next' for swap in swaps)} of {n_workers} workers, "
+          f"slowest after {max(swap['swapMs'] for swap in swaps):.1f} ms")
+    same = private_sums == shared_sums and len(shared_sums) == 1
+    if not swapped or not same or private_shared > table_mb / 2:
+        print("FAILED: shared workers did not share the table, disagreed with the private copies, "
+              "or missed the reload")
+        return 1
+    print(f"private memory per worker {private_copy:.0f} MB -> {private_shared:.0f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,78 @@
+"""
+Season simulator benchmark and sanity check
+Plays the first half of a synthetic season into a FeatureIndex, simulates the
+second half, and checks the projection against exact expectations: mean wins
+equal current wins plus the sum of each team's game probabilities, every
+conference fills seeds 1-15, six top-six and eight playoff teams, and the
+result does not depend on the number of worker processes.
+
+Usage: python benchmarks/bench_simulator.py [simulations] [workers]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feature_index import FeatureIndex  # noqa: E402
+from predictor import ARTIFACT_DIR, COMPILED_MODEL_FILE, CompiledModel, Predictor  # noqa: E402
+from simulator import CONFERENCE_SIZE, TEAM_CODES, current_records, simulate_season  # noqa: E402
+from synthetic import synthetic_games  # noqa: E402
+
+
+def main(argv):
+    simulations = int(argv[1]) if len(argv) > 1 else 100_000
+    workers = int(argv[2]) if len(argv) > 2 else os.cpu_count()
+    games = pd.DataFrame(synthetic_games(seasons=1))
+    days = sorted(games["date"].unique())
+    played = games[games["date"] <= days[len(days) // 2]]
+    remaining = games[(games["date"] > days[len(days) // 2]) & games["home"].astype(bool)]
+    schedule = pd.DataFrame({
+        "home_team": remaining["team"].values,
+        "away_team": remaining["opponent"].values,
+        "date": remaining["date"].values,
+    })
+
+    model = CompiledModel.load(os.path.join(ARTIFACT_DIR, COMPILED_MODEL_FILE))
+    predictor = Predictor(model, FeatureIndex.build(played.to_dict("records"), initial_row=model.baseline))
+    wins, _, _ = current_records(played)
+
+    start = time.perf_counter()
+    projection = simulate_season(predictor, schedule, wins, simulations, workers=1)
+    serial = time.perf_counter() - start
+    start = time.perf_counter()
+    pooled = simulate_season(predictor, schedule, wins, simulations, workers=workers)
+    parallel = time.perf_counter() - start
+    print(f"{simulations} simulations of {len(schedule)} games: {serial:.2f}s serial, "
+          f"{parallel:.2f}s with {workers} workers")
+
+    probability = predictor.home_probabilities(schedule)
+    index = {code: t for t, code in enumerate(TEAM_CODES)}
+    expected = wins + np.bincount(schedule["home_team"].map(index), weights=probability, minlength=len(TEAM_CODES)) \
+        + np.bincount(schedule["away_team"].map(index), weights=1.0 - probability, minlength=len(TEAM_CODES))
+    projected = projection.set_index("team").loc[TEAM_CODES, "projected_wins"].to_numpy()
+    error = np.abs(projected - expected).max()
+    print(f"max projected-wins error {error:.3f} (home win probabilities {probability.min():.2f}-"
+          f"{probability.max():.2f})")
+
+    by_conference = projection.groupby("conference")
+    seeds = projection[[f"seed_{s + 1}" for s in range(CONFERENCE_SIZE)]]
+    checks = {
+        "projected wins": error < 0.05,
+        "seed odds sum to 1": np.allclose(seeds.sum(axis=1), 1.0),
+        "one team per seed": np.allclose(by_conference[list(seeds.columns)].sum(), 1.0),
+        "six top-six teams": np.allclose(by_conference["top_six"].sum(), 6.0),
+        "eight playoff teams": np.allclose(by_conference["playoffs"].sum(), 8.0),
+        "worker independent": projection.equals(pooled),
+    }
+    failed = [name for name, ok in checks.items() if not ok]
+    print("FAILED: " + ", ".join(failed) if failed else "all checks passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
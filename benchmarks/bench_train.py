@@ -0,0 +1,54 @@
+"""
+Training feature benchmark and parity check
+Times train.build_features on synthetic seasons, serially and with a process
+pool, and checks every pre-game row against FeatureIndex lookups, which
+replay the same games one at a time through TeamFeatureStore
+
+Usage: python benchmarks/bench_train.py [seasons] [workers]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feature_index import FeatureIndex  # noqa: E402
+from synthetic import synthetic_games  # noqa: E402
+from train import build_features, fit_pipeline, prepare_game_logs  # noqa: E402
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main(argv):
+    seasons = int(argv[1]) if len(argv) > 1 else 10
+    workers = int(argv[2]) if len(argv) > 2 else os.cpu_count()
+    rows = synthetic_games(seasons=seasons)
+    games = prepare_game_logs(pd.DataFrame(rows))
+    print(f"{len(games)} team-games over {seasons} seasons")
+
+    (features, labels, current), serial = timed(build_features, games, 1)
+    (parallel_features, _, _), parallel = timed(build_features, games, workers)
+    _, fit_seconds = timed(fit_pipeline, features, labels)
+    print(f"features: {serial:.2f}s serial, {parallel:.2f}s with {workers} workers; fit {fit_seconds:.2f}s")
+
+    index, replay = timed(FeatureIndex.build, rows)
+    expected = index.lookup(current["team"].values, current["date"].values.astype("datetime64[D]"))
+    error = np.abs(features.values - expected).max()
+    drift = np.abs(parallel_features.values - features.values).max()
+    print(f"FeatureIndex replay {replay:.2f}s; max difference {error:.2e}, serial vs pool {drift:.2e}")
+    if not error < 1e-9 or drift != 0.0:
+        print("FAILED: training features do not match the online feature store")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,289 @@
+"""
+Performance regression suite
+Runs headless on synthetic data (no network) and measures:
+
+    cold_start   fresh interpreter: import app.py, load the artifacts, first
+                 prediction; then the Streamlit script's own time to first
+                 paint and to first prediction (metrics.milestone)
+    single       app.predict_game latency percentiles, pipeline and matchup matrix paths
+    batch        predict_games throughput at 1, 100, 10k and 1M games
+    concurrent   predict_game throughput from 1 to 64 threads
+    feature      TeamFeatureStore.update rate
+    memory       peak RSS of the cold start and of this process
+
+Results go to stdout as JSON; progress and the baseline comparison go to
+stderr.  A metric more than SLACK worse than the baseline (2x by default)
+fails the run with exit code 1, so a stray sleep in the prediction path
+cannot slip through.
+
+Usage: python benchmarks/run.py [--quick] [--baseline FILE] [--save-baseline] [--slack X]
+    --quick skips the 1M-game batch and the 64-thread run and makes fewer
+    calls; the baseline defaults to benchmarks/baseline.json
+"""
+
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Background threads would make timings depend on what the builders are doing
+os.environ["NBA_MODEL_RELOAD_INTERVAL"] = "0"
+os.environ["NBA_MATCHUP_INTERVAL"] = "0"
+os.environ.pop("NBA_INGEST_DIR", None)
+
+import app  # noqa: E402
+import predictor as predictor_module  # noqa: E402
+from feature_index import FeatureIndex  # noqa: E402
+from feature_store import TeamFeatureStore  # noqa: E402
+from matchup_matrix import MatchupMatrix  # noqa: E402
+from predictor import ARTIFACT_DIR, COMPILED_MODEL_FILE, CompiledModel, Predictor  # noqa: E402
+from synthetic import TEAM_CODES, synthetic_games  # noqa: E402
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SLACK = 1.0  # fail when a metric is more than (1 + SLACK) times worse
+SEED = 0
+
+BATCH_SIZES = (1, 100, 10_000, 1_000_000)
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+SINGLE_CALLS = 20_000
+CONCURRENT_CALLS = 8_000
+COLD_START_RUNS = 3
+
+COLD_START = """
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+from predictor import get_predictor
+get_predictor()
+loaded = time.perf_counter()
+app.predict_game("BOS", "LAL", "2024-01-15")
+predicted = time.perf_counter()
+print(json.dumps({"import": imported - started, "load": loaded - imported, "first_prediction": predicted - loaded}))
+"""
+
+# Milestones are timed from the script's first run, after Streamlit itself is loaded
+APP_START = """
+import json
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=60).run()
+at.selectbox[0].select("Boston Celtics")
+at.selectbox[1].select("Los Angeles Lakers")
+at.button[0].click().run()
+from metrics import startup_times
+print(json.dumps({name: ms / 1000.0 for name, ms in startup_times().items()}))
+"""
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def metric(value, unit, better="lower"):
+    return {"value": round(float(value), 3), "unit": unit, "better": better}
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    return resource.getrusage(who).ru_maxrss / 1024.0  # kilobytes on Linux
+
+
+def build_predictor():
+    """Real model.npz over two synthetic seasons of features, with no cache"""
+    model = CompiledModel.load(os.path.join(ARTIFACT_DIR, COMPILED_MODEL_FILE))
+    rows = synthetic_games(seasons=2, seed=SEED)
+    source = FeatureIndex.build(rows, initial_row=model.baseline)
+    return Predictor(model, source), rows
+
+
+def random_games(n, rows, seed=SEED):
+    rng = np.random.default_rng(seed)
+    days = np.unique(np.array([row["date"] for row in rows], dtype="datetime64[D]"))
+    home = rng.integers(0, len(TEAM_CODES), n)
+    away = (home + rng.integers(1, len(TEAM_CODES), n)) % len(TEAM_CODES)
+    codes = np.array(TEAM_CODES)
+    return pd.DataFrame({"home_team": codes[home], "away_team": codes[away], "date": rng.choice(days, n)})
+
+
+def cold_start(results):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    for script, prefix in ((COLD_START, ""), (APP_START, "app_")):
+        best = None
+        for _ in range(COLD_START_RUNS):
+            started = time.perf_counter()
+            output = subprocess.run([sys.executable, "-W", "ignore", "-c", script], cwd=ROOT, env=env, check=True,
+                                    capture_output=True, text=True).stdout
+            timings = json.loads(output.strip().splitlines()[-1])
+            timings["process"] = time.perf_counter() - started
+            best = timings if best is None else {key: min(best[key], value) for key, value in timings.items()}
+        for key, value in best.items():
+            results[f"cold_start.{prefix}{key}_ms"] = metric(value * 1000.0, "ms")
+    results["memory.cold_start_peak_mb"] = metric(peak_rss_mb(resource.RUSAGE_CHILDREN), "MB")
+
+
+def latencies(function, games):
+    elapsed = np.empty(len(games))
+    clock = time.perf_counter_ns
+    for i, game in enumerate(games):
+        started = clock()
+        function(*game)
+        elapsed[i] = clock() - started
+    return elapsed / 1000.0
+
+
+def single(results, predictor, rows, calls):
+    games = list(random_games(calls, rows, SEED + 1).itertuples(index=False, name=None))
+    for path in ("pipeline", "matrix"):
+        if path == "matrix":
+            # Every game on the matrix's one day, so each call is a lookup
+            day = games[0][2]
+            predictor.matchups = MatchupMatrix.build(predictor, day, 0)
+            games = [(home, away, day) for home, away, _ in games]
+        latencies(app.predict_game, games[:calls // 10])  # warm up
+        timed = latencies(app.predict_game, games)
+        predictor.matchups = None
+        for q in (50, 90, 99):
+            results[f"single.{path}_p{q}_us"] = metric(np.percentile(timed, q), "us")
+
+
+def batch(results, predictor, rows, sizes):
+    for n in sizes:
+        games = random_games(n, rows, SEED + 2)
+        repeats = max(1, min(50, 100_000 // n))
+        predictor.predict_games(games)  # warm up
+        started = time.perf_counter()
+        for _ in range(repeats):
+            predictor.predict_games(games)
+        seconds = (time.perf_counter() - started) / repeats
+        results[f"batch.{n}_games_per_s"] = metric(n / seconds, "games/s", "higher")
+
+
+def concurrent(results, rows, thread_counts, calls):
+    games = list(random_games(calls, rows, SEED + 3).itertuples(index=False, name=None))
+    for threads in thread_counts:
+        shares = np.array_split(np.arange(calls), threads)
+        start = threading.Barrier(threads + 1)
+
+        def worker(share):
+            start.wait()
+            for i in share:
+                app.predict_game(*games[i])
+
+        pool = [threading.Thread(target=worker, args=(share,)) for share in shares]
+        for thread in pool:
+            thread.start()
+        start.wait()
+        started = time.perf_counter()
+        for thread in pool:
+            thread.join()
+        results[f"concurrent.{threads}_threads_per_s"] = metric(
+            calls / (time.perf_counter() - started), "calls/s", "higher")
+
+
+def feature_updates(results, rows):
+    store = TeamFeatureStore()
+    started = time.perf_counter()
+    for row in rows:
+        store.update(row)
+    results["feature.updates_per_s"] = metric(len(rows) / (time.perf_counter() - started), "updates/s", "higher")
+
+
+def run(quick=False):
+    results = {}
+    log("cold start")
+    cold_start(results)
+
+    predictor, rows = build_predictor()
+    predictor_module._predictor = predictor  # app.predict_game now serves the synthetic features
+    log("single-call latency")
+    single(results, predictor, rows, SINGLE_CALLS // 4 if quick else SINGLE_CALLS)
+    log("concurrent throughput")
+    concurrent(results, rows, THREAD_COUNTS[:-1] if quick else THREAD_COUNTS,
+               CONCURRENT_CALLS // 4 if quick else CONCURRENT_CALLS)
+    log("feature store updates")
+    feature_updates(results, rows)
+    results["memory.serving_peak_mb"] = metric(peak_rss_mb(), "MB")
+
+    log("batch throughput")
+    batch(results, predictor, rows, BATCH_SIZES[:-1] if quick else BATCH_SIZES)
+    results["memory.peak_mb"] = metric(peak_rss_mb(), "MB")
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, slack):
+    """Print current against baseline values; returns the names that regressed"""
+    regressed = []
+    log(f"{'metric':<38}{'baseline':>14}{'current':>14}{'ratio':>8}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None or not previous["value"] or not current["value"]:
+            continue
+        ratio = current["value"] / previous["value"]
+        worse = ratio if current["better"] == "lower" else 1.0 / ratio
+        status = ""
+        if worse > 1.0 + slack:
+            regressed.append(name)
+            status = "  REGRESSION"
+        log(f"{name:<38}{previous['value']:>14g}{current['value']:>14g}{ratio:>8.2f}{status}")
+    return regressed
+
+
+def main(argv):
+    args = argv[1:]
+    quick = "--quick" in args
+    save = "--save-baseline" in args
+    baseline_file = args[args.index("--baseline") + 1] if "--baseline" in args else BASELINE_FILE
+    slack = float(args[args.index("--slack") + 1]) if "--slack" in args else DEFAULT_SLACK
+
+    results = run(quick)
+    report = {"environment": environment(), "quick": quick, "results": results}
+    print(json.dumps(report, indent=2))
+
+    if save:
+        with open(baseline_file, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        log(f"Saved baseline to {baseline_file}")
+        return 0
+    if not os.path.exists(baseline_file):
+        log(f"No baseline at {baseline_file}; run with --save-baseline to record one")
+        return 0
+    with open(baseline_file) as f:
+        baseline = json.load(f)
+    regressed = compare(results, baseline["results"], slack)
+    if regressed:
+        log(f"FAILED: {len(regressed)} metric(s) more than {1.0 + slack:g}x worse than the baseline: "
+            f"{', '.join(regressed)}")
+        return 1
+    log("No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
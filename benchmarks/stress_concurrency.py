@@ -0,0 +1,80 @@
+"""
+Concurrency stress check for the prediction path
+Fires hundreds of simultaneous predict_game / predict_games calls
+from many threads and checks every result matches a single-threaded run
+
+Usage: python benchmarks/stress_concurrency.py [threads] [calls_per_thread]
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache import PredictionCache  # noqa: E402
+from feature_index import FeatureIndex  # noqa: E402
+from predictor import ARTIFACT_DIR, COMPILED_MODEL_FILE, CompiledModel, Predictor  # noqa: E402
+from synthetic import TEAM_CODES, synthetic_games  # noqa: E402
+
+
+def build_predictor():
+    model = CompiledModel.load(os.path.join(ARTIFACT_DIR, COMPILED_MODEL_FILE))
+    index = FeatureIndex.build(synthetic_games(seasons=2), initial_row=model.baseline)
+    return Predictor(model, index, PredictionCache(maxsize=256))
+
+
+def workload(n_calls, seed):
+    """Random (home, away, date) matchups drawn from the synthetic seasons"""
+    rng = np.random.default_rng(seed)
+    games = []
+    for _ in range(n_calls):
+        home, away = rng.choice(len(TEAM_CODES), 2, replace=False)
+        day = np.datetime64("2015-10-20") + int(rng.integers(0, 30)) * 20
+        games.append((TEAM_CODES[home], TEAM_CODES[away], day.astype(object)))
+    return games
+
+
+def run_call(predictor, game):
+    home, away, game_date = game
+    single = predictor.predict_game(home, away, game_date)
+    batch = predictor.predict_games([game])
+    return single, float(batch["winProbability"][0])
+
+
+def main(argv):
+    n_threads = int(argv[1]) if len(argv) > 1 else 64
+    calls_per_thread = int(argv[2]) if len(argv) > 2 else 20
+    predictor = build_predictor()
+    games = workload(n_threads * calls_per_thread, seed=1)
+
+    # Reference results from one thread with a cold, private cache
+    reference_predictor = Predictor(predictor.model, predictor.feature_source)
+    expected = [run_call(reference_predictor, game) for game in games]
+
+    start = threading.Barrier(n_threads)
+
+    def worker(thread_id):
+        start.wait()
+        results = []
+        for i in range(thread_id, len(games), n_threads):
+            results.append((i, run_call(predictor, games[i])))
+        return results
+
+    with ThreadPoolExecutor(max_workers=n_threads) as pool:
+        outcomes = [item for chunk in pool.map(worker, range(n_threads)) for item in chunk]
+
+    mismatches = [i for i, result in outcomes if result != expected[i]]
+    print(f"{len(outcomes)} concurrent calls on {n_threads} threads, "
+          f"{len(mismatches)} mismatches, cache hits {predictor.cache.hits}")
+    if mismatches or len(outcomes) != len(games):
+        print(f"FAILED: first mismatch at call {mismatches[0] if mismatches else '?'}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,76 @@
+"""
+Synthetic NBA game logs for benchmarks and stress checks
+Produces one row per team per game with every box score field the feature
+store consumes, using a fixed seed so runs are reproducible and need no network
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from teams import NBA_TEAMS  # noqa: E402
+
+TEAM_CODES = [team["value"] for team in NBA_TEAMS]
+
+# (mean, standard deviation) per box score stat, roughly league-wide
+STAT_PROFILE = {
+    "pts": (112.0, 12.0),
+    "fg%": (0.47, 0.04),
+    "3p%": (0.36, 0.06),
+    "ft%": (0.78, 0.07),
+    "trb": (44.0, 6.0),
+    "ast": (25.0, 5.0),
+    "stl": (7.5, 2.5),
+    "blk": (5.0, 2.0),
+    "tov": (14.0, 3.5),
+    "pf": (20.0, 4.0),
+}
+GAMES_PER_NIGHT = 8
+NIGHTS_PER_SEASON = 165  # ~1230 games, 82 per team
+
+
+def synthetic_games(seasons=1, first_season=2016, seed=0):
+    """Game log rows for the given number of seasons, sorted by date"""
+    rng = np.random.default_rng(seed)
+    strength = rng.normal(0.0, 1.0, len(TEAM_CODES))
+    rows = []
+    for season in range(first_season, first_season + seasons):
+        day = np.datetime64(f"{season - 1}-10-20")
+        strength = 0.7 * strength + 0.3 * rng.normal(0.0, 1.0, len(TEAM_CODES))
+        for _ in range(NIGHTS_PER_SEASON):
+            order = rng.permutation(len(TEAM_CODES))[:2 * GAMES_PER_NIGHT]
+            for home, away in order.reshape(-1, 2):
+                rows.extend(_game_rows(rng, strength, home, away, day, season))
+            day += 1
+    return rows
+
+
+def _game_rows(rng, strength, home, away, day, season):
+    box = {}
+    for side, t in (("home", home), ("away", away)):
+        edge = strength[t] + (0.5 if side == "home" else 0.0)
+        box[side] = {
+            stat: float(rng.normal(mean + 0.5 * edge * std, std))
+            for stat, (mean, std) in STAT_PROFILE.items()
+        }
+    home_won = box["home"]["pts"] > box["away"]["pts"]
+    date = str(day)
+    rows = []
+    for side, t, other, won in (("home", home, away, home_won), ("away", away, home, not home_won)):
+        opponent_side = "away" if side == "home" else "home"
+        row = {
+            "team": TEAM_CODES[t],
+            "opponent": TEAM_CODES[other],
+            "home": int(side == "home"),
+            "date": date,
+            "season": season,
+            "won": int(won),
+            "opp_pts": box[opponent_side]["pts"],
+            "opp_fg%": box[opponent_side]["fg%"],
+        }
+        row.update(box[side])
+        rows.append(row)
+    return rows
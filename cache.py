@@ -0,0 +1,130 @@
+"""
+Process-wide prediction cache
+An in-memory LRU tier shared by every session in the process, plus an optional
+SQLite tier shared by every worker process on the machine.  Keys are stable
+digests (not Python's per-process randomized hash()), so all workers agree.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 4096
+DEFAULT_TTL = 15 * 60
+PURGE_EVERY = 256  # disk writes between sweeps of expired rows
+
+CACHE_DB_ENV = "NBA_PREDICTION_CACHE_DB"
+
+
+def prediction_key(home_team, away_team, game_date, model_version, feature_version=""):
+    """Stable digest of a matchup, the model that scores it and the features it reads"""
+    text = f"{home_team}|{away_team}|{game_date:%Y-%m-%d}|{model_version}|{feature_version}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+class PredictionCache:
+    """Bounded LRU cache with a TTL and an optional on-disk SQLite tier"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL, db_path=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.db_path = db_path
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self._disk_writes = 0
+        if db_path:
+            self._connection().execute(
+                "CREATE TABLE IF NOT EXISTS predictions "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+
+    def get(self, key):
+        """Cached result dict for key, or None"""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(value)
+                del self._entries[key]
+
+        value = self._disk_get(key) if self.db_path else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value, now)
+        return dict(value)
+
+    def set(self, key, value):
+        value = dict(value)
+        with self._lock:
+            self._store(key, value, self._clock())
+        if self.db_path:
+            self._disk_set(key, value)
+
+    def clear(self):
+        """Drop the in-memory tier, e.g. after the feature store changes"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _store(self, key, value, now):
+        self._entries[key] = (value, now + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    # SQLite connections cannot be shared across threads, so keep one per thread.
+    # Wall-clock expiry is used on disk because monotonic clocks differ per process.
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _disk_get(self, key):
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM predictions WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return json.loads(row[0]) if row else None
+
+    def _disk_set(self, key, value):
+        now = time.time()
+        self._disk_writes += 1
+        try:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO predictions (key, value, expires) VALUES (?, ?, ?)",
+                (key, json.dumps(value), now + self.ttl),
+            )
+            if self._disk_writes % PURGE_EVERY == 0:
+                connection.execute("DELETE FROM predictions WHERE expires <= ?", (now,))
+        except sqlite3.Error:
+            # A locked or read-only cache file must never fail a prediction
+            pass
+
+
+def cache_from_env():
+    """Prediction cache configured from the environment (disk tier is opt-in)"""
+    return PredictionCache(db_path=os.environ.get(CACHE_DB_ENV) or None)
@@ -0,0 +1,202 @@
+"""
+Win probability calibration for the Ridge decision function
+RidgeClassifier has no predict_proba; the app compares the two teams'
+decision values instead.  A Calibration maps that home-minus-away margin to
+a home-win probability, fitted on games the model was not trained on:
+
+    platt     sigmoid(slope * margin + intercept), two coefficients; the
+              intercept is home-court advantage
+    isotonic  monotone step fit (pool adjacent violators) stored as a short
+              table of knots and applied with np.interp
+
+Both are stored in model.npz and cost a few flops per prediction.  Models
+without one use sigmoid(2 * margin), the logit of the Ridge estimate of
+2p - 1 near even odds.
+
+Usage: python calibration.py games.csv [platt|isotonic]
+    Recalibrates the deployed model.npz on game logs with opponent and home
+    columns (use seasons the model was not trained on), writes the result to
+    artifacts/<new version>/ and deploys it
+"""
+
+import hashlib
+import os
+import sys
+
+import numpy as np
+
+MARGIN_SLOPE = 2.0
+METHODS = ("platt", "isotonic")
+NEWTON_ITERATIONS = 50
+NEWTON_TOLERANCE = 1e-10
+PLATT_RIDGE = 1e-6  # keeps the Newton step defined when the margins separate the outcomes
+PROBABILITY_FLOOR = 0.001  # isotonic blocks of all wins or all losses never reach 0% or 100%
+
+
+def sigmoid(x):
+    # tanh form cannot overflow for large margins
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+class Calibration:
+    """Margin -> home-win probability, either two Platt coefficients or an isotonic table"""
+
+    def __init__(self, slope=MARGIN_SLOPE, intercept=0.0, knots=None, values=None):
+        self.slope = float(slope)
+        self.intercept = float(intercept)
+        self.knots = None if knots is None or len(knots) == 0 else np.array(knots, dtype=np.float64)
+        self.values = None if self.knots is None else np.array(values, dtype=np.float64)
+        if self.knots is not None:
+            if self.values.shape != self.knots.shape or np.any(np.diff(self.knots) <= 0):
+                raise ValueError("Isotonic calibration needs increasing knots with one value each")
+            if np.any(np.diff(self.values) < 0) or self.values[0] < 0.0 or self.values[-1] > 1.0:
+                raise ValueError("Isotonic calibration values must be non-decreasing probabilities")
+            self.knots.flags.writeable = False
+            self.values.flags.writeable = False
+        elif not (np.isfinite(self.slope) and np.isfinite(self.intercept)):
+            raise ValueError("Platt calibration coefficients must be finite")
+
+    @property
+    def method(self):
+        return "platt" if self.knots is None else "isotonic"
+
+    def __call__(self, margin):
+        if self.knots is None:
+            return sigmoid(self.slope * margin + self.intercept)
+        return np.interp(margin, self.knots, self.values)
+
+    def to_arrays(self):
+        empty = np.empty(0)
+        return {
+            "calibration": np.array([self.slope, self.intercept]),
+            "calibration_knots": empty if self.knots is None else self.knots,
+            "calibration_values": empty if self.values is None else self.values,
+        }
+
+    @classmethod
+    def from_arrays(cls, data):
+        """Calibration saved by to_arrays, or the default for models saved without one"""
+        if "calibration" not in data:
+            return cls()
+        slope, intercept = data["calibration"]
+        return cls(slope, intercept, data["calibration_knots"], data["calibration_values"])
+
+    def digest(self):
+        digest = hashlib.sha256()
+        for array in self.to_arrays().values():
+            digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+        return digest.hexdigest()[:12]
+
+    def describe(self):
+        if self.knots is None:
+            return f"platt slope {self.slope:.3f}, intercept {self.intercept:+.3f}"
+        return f"isotonic, {self.knots.shape[0]} knots"
+
+
+def fit_platt(margins, outcomes):
+    """Logistic regression of outcomes on margins by Newton's method"""
+    margins = np.asarray(margins, dtype=np.float64)
+    outcomes = np.asarray(outcomes, dtype=np.float64)
+    design = np.column_stack([margins, np.ones_like(margins)])
+    params = np.array([MARGIN_SLOPE, 0.0])
+    for _ in range(NEWTON_ITERATIONS):
+        probability = sigmoid(design @ params)
+        gradient = design.T @ (outcomes - probability)
+        hessian = (design * (probability * (1.0 - probability))[:, None]).T @ design
+        step = np.linalg.solve(hessian + PLATT_RIDGE * np.eye(2), gradient)
+        params += step
+        if np.abs(step).max() < NEWTON_TOLERANCE:
+            break
+    return Calibration(params[0], params[1])
+
+
+def fit_isotonic(margins, outcomes):
+    """Non-decreasing fit by pool adjacent violators, kept as (mean margin, rate) per block"""
+    # Tied margins start out in one block so every knot is distinct
+    unique, inverse = np.unique(np.asarray(margins, dtype=np.float64), return_inverse=True)
+    wins = np.bincount(inverse, weights=np.asarray(outcomes, dtype=np.float64))
+    counts = np.bincount(inverse).astype(np.float64)
+
+    # Each block holds (sum of margins, sum of outcomes, count); merge while rates decrease
+    blocks = []
+    for margin, won, count in zip(unique, wins, counts):
+        blocks.append([margin * count, won, count])
+        while len(blocks) > 1 and blocks[-2][1] * blocks[-1][2] >= blocks[-1][1] * blocks[-2][2]:
+            margin_sum, outcome_sum, count = blocks.pop()
+            blocks[-1][0] += margin_sum
+            blocks[-1][1] += outcome_sum
+            blocks[-1][2] += count
+    sums = np.array(blocks)
+    knots = sums[:, 0] / sums[:, 2]
+    values = np.clip(sums[:, 1] / sums[:, 2], PROBABILITY_FLOOR, 1.0 - PROBABILITY_FLOOR)
+    return Calibration(knots=knots, values=values)
+
+
+def fit(margins, outcomes, method="platt"):
+    if method not in METHODS:
+        raise ValueError(f"Unknown calibration method {method!r}; expected one of {', '.join(METHODS)}")
+    return fit_platt(margins, outcomes) if method == "platt" else fit_isotonic(margins, outcomes)
+
+
+def calibrated(model, calibration):
+    """Copy of a CompiledModel with a new calibration and a version that reflects it"""
+    from predictor import CompiledModel
+
+    version = hashlib.sha256(f"{model.version}|{calibration.digest()}".encode()).hexdigest()[:12]
+    return CompiledModel(
+        feature_names=model.feature_names,
+        weights=model.weights,
+        bias=model.bias,
+        scale=model.scale,
+        offset=model.offset,
+        coef=model.coef,
+        baseline=model.baseline,
+        version=version,
+        calibration=calibration,
+    )
+
+
+def game_margins(model, features, labels, rows):
+    """Home-minus-away decision margins and home results for every paired game"""
+    from backtest import pair_games
+
+    paired = pair_games(features, labels, rows)
+    decisions = model.decision(features.to_numpy())
+    margins = decisions[paired["home_row"].to_numpy()] - decisions[paired["away_row"].to_numpy()]
+    return margins, paired["home_won"].to_numpy().astype(np.float64)
+
+
+def main(argv):
+    from backtest import evaluate
+    from predictor import CompiledModel
+    from registry import add_version, deploy, deployed_path
+    from train import build_features, prepare_game_logs, read_game_logs
+
+    if len(argv) < 2:
+        print(__doc__[__doc__.index("Usage:"):].rstrip())
+        return 1
+    method = argv[2] if len(argv) > 2 else "platt"
+    path = deployed_path()
+    model = CompiledModel.load(path)
+    features, labels, rows = build_features(prepare_game_logs(read_game_logs(argv[1])))
+    margins, outcomes = game_margins(model, features, labels, rows)
+    calibration = fit(margins, outcomes, method)
+
+    before = evaluate(model.calibration(margins), outcomes)
+    after = evaluate(calibration(margins), outcomes)
+    updated = calibrated(model, calibration)
+    # A new version rather than an overwrite, so the old one stays intact for rollback
+    directory = add_version(updated, os.path.dirname(path), {
+        "recalibrated_from": model.version,
+        "calibration": {"method": method, "games": int(outcomes.shape[0]), "fit": calibration.describe(),
+                        "log_loss_uncalibrated": before["log_loss"], "log_loss": after["log_loss"]},
+    })
+    deploy(updated.version)
+    print(f"Calibrated {model.version} on {outcomes.shape[0]} games ({calibration.describe()}): log-loss "
+          f"{before['log_loss']:.4f} -> {after['log_loss']:.4f}, Brier {before['brier']:.4f} -> "
+          f"{after['brier']:.4f}; deployed {directory} (version {updated.version})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
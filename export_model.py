@@ -0,0 +1,157 @@
+"""
+Compile the pickled scikit-learn pipeline into a pickle-free model.npz
+Folds the SelectKBest mask, MinMaxScaler and RidgeClassifier into one weight
+vector plus bias so the app can score games without importing scikit-learn
+
+Usage: python export_model.py [artifact_dir] [output_path]
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+
+from predictor import ARTIFACT_DIR, COMPILED_MODEL_FILE, ArtifactError, CompiledModel
+
+FEATURES_FILE = "features.pkl"
+SELECTOR_FILE = "feature_selector.pkl"
+SCALER_FILE = "scaler.pkl"
+MODEL_FILE = "model.pkl"
+
+ARTIFACT_FILES = (FEATURES_FILE, SELECTOR_FILE, SCALER_FILE, MODEL_FILE)
+
+
+class _NumpyCompatUnpickler(pickle.Unpickler):
+    """Unpickler that lets NumPy 1.x read pickles written under NumPy 2.x"""
+
+    def find_class(self, module, name):
+        if module.startswith("numpy._core") and not hasattr(np, "_core"):
+            module = "numpy.core" + module[len("numpy._core"):]
+        return super().find_class(module, name)
+
+
+def _load_pickle(artifact_dir, filename):
+    path = os.path.join(artifact_dir, filename)
+    if not os.path.exists(path):
+        raise ArtifactError(f"Missing model artifact: {path}")
+    with open(path, "rb") as f:
+        return _NumpyCompatUnpickler(f).load()
+
+
+def load_artifacts(artifact_dir=ARTIFACT_DIR):
+    """Load features.pkl, feature_selector.pkl, scaler.pkl and model.pkl"""
+    return {
+        "features": _load_pickle(artifact_dir, FEATURES_FILE),
+        "selector": _load_pickle(artifact_dir, SELECTOR_FILE),
+        "scaler": _load_pickle(artifact_dir, SCALER_FILE),
+        "model": _load_pickle(artifact_dir, MODEL_FILE),
+    }
+
+
+def validate_artifacts(artifacts):
+    """Check that the feature list, selector, scaler and model agree on their columns"""
+    features = list(artifacts["features"])
+    selector = artifacts["selector"]
+    scaler = artifacts["scaler"]
+    model = artifacts["model"]
+
+    if len(set(features)) != len(features):
+        raise ArtifactError("features.pkl contains duplicate feature names")
+    if selector.n_features_in_ != len(features):
+        raise ArtifactError(
+            f"Selector expects {selector.n_features_in_} features, "
+            f"features.pkl lists {len(features)}"
+        )
+    selector_names = getattr(selector, "feature_names_in_", None)
+    if selector_names is not None and list(selector_names) != features:
+        raise ArtifactError("Selector was fitted on a different feature order than features.pkl")
+
+    support = selector.get_support()
+    n_selected = int(support.sum())
+    if n_selected != selector.k:
+        raise ArtifactError(f"Selector keeps {n_selected} features but k={selector.k}")
+    if scaler.n_features_in_ != n_selected:
+        raise ArtifactError(
+            f"Scaler expects {scaler.n_features_in_} features, selector keeps {n_selected}"
+        )
+    if model.n_features_in_ != n_selected:
+        raise ArtifactError(
+            f"Model expects {model.n_features_in_} features, selector keeps {n_selected}"
+        )
+    if len(model.classes_) != 2:
+        raise ArtifactError("Model must be a binary win/loss classifier")
+
+    return features, support
+
+
+def artifact_digest(artifact_dir=ARTIFACT_DIR):
+    """Short content hash of the pickled artifacts, used as the model version"""
+    digest = hashlib.sha256()
+    for filename in ARTIFACT_FILES:
+        with open(os.path.join(artifact_dir, filename), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def compile_model(artifacts, version, calibration=None):
+    """Fold selector, scaler and Ridge coefficients into a CompiledModel"""
+    features, support = validate_artifacts(artifacts)
+    scaler = artifacts["scaler"]
+    model = artifacts["model"]
+    n_features = len(features)
+
+    # Scaled feature j is x_j * scale_j + min_j, so the Ridge decision
+    # coef . scaled + intercept is x . (coef * scale) + (intercept + coef . min)
+    scale = np.zeros(n_features)
+    offset = np.zeros(n_features)
+    coef = np.zeros(n_features)
+    scale[support] = scaler.scale_
+    offset[support] = scaler.min_
+    coef[support] = np.ravel(model.coef_)
+    intercept = float(np.ravel(model.intercept_)[0])
+
+    baseline = np.zeros(n_features)
+    baseline[support] = scaler.data_min_ + scaler.data_range_ / 2.0
+
+    return CompiledModel(
+        feature_names=features,
+        weights=coef * scale,
+        bias=intercept + float(coef @ offset),
+        scale=scale,
+        offset=offset,
+        coef=coef,
+        baseline=baseline,
+        version=version,
+        calibration=calibration,
+    )
+
+
+def verify_compiled(compiled, artifacts):
+    """Make sure the folded weights reproduce scikit-learn's decision function"""
+    span = np.zeros(len(compiled.feature_names))
+    span[artifacts["selector"].get_support()] = artifacts["scaler"].data_range_
+    rng = np.random.default_rng(0)
+    probe = compiled.baseline + (rng.random((16, span.shape[0])) - 0.5) * span
+    selected = artifacts["selector"].transform(pd.DataFrame(probe, columns=compiled.feature_names))
+    expected = artifacts["model"].decision_function(artifacts["scaler"].transform(selected))
+    if not np.allclose(compiled.decision(probe), expected):
+        raise ArtifactError("Compiled weights do not reproduce the pickled model")
+
+
+def main(argv):
+    artifact_dir = argv[1] if len(argv) > 1 else ARTIFACT_DIR
+    output_path = argv[2] if len(argv) > 2 else os.path.join(artifact_dir, COMPILED_MODEL_FILE)
+
+    artifacts = load_artifacts(artifact_dir)
+    compiled = compile_model(artifacts, artifact_digest(artifact_dir))
+
+    verify_compiled(compiled, artifacts)
+    compiled.save(output_path)
+    print(f"Wrote {output_path} (version {compiled.version})")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,208 @@
+"""
+Point-in-time feature index keyed by (team, date)
+Stores every team's feature row as it stood after each of its games in one
+columnar table sorted by (team, date), so "features for team X as of date D"
+is a single np.searchsorted call for a whole batch of lookups
+
+Usage: python feature_index.py games.csv|history_dir [output.npz]
+"""
+
+import hashlib
+import os
+import sys
+
+import numpy as np
+
+from feature_store import (
+    BACK_TO_BACK,
+    FEATURE_NAMES,
+    MAX_WINDOW,
+    N_FEATURES,
+    REST_DAYS,
+    SEASON_PROGRESS,
+    TeamFeatureStore,
+    seasons_of_days,
+    to_day,
+)
+from teams import registry_for
+
+FEATURE_INDEX_FILE = "feature_index.npz"
+
+# Keys pack (team ordinal, day) into one int64 so all teams share one sorted array
+KEY_STRIDE = 1 << 32
+
+
+class FeatureIndex:
+    """Sorted (team, date) -> feature row table answering as-of lookups"""
+
+    def __init__(self, teams, keys, rows, seasons, initial_row=None, version=None):
+        self.teams = list(teams)
+        self.registry = registry_for(self.teams)
+        self.feature_names = list(FEATURE_NAMES)
+        self.keys = np.asarray(keys, dtype=np.int64)
+        self.rows = np.asarray(rows, dtype=np.float64).reshape(-1, N_FEATURES)
+        self.seasons = np.asarray(seasons, dtype=np.int64)
+        if not self.keys.shape[0] == self.rows.shape[0] == self.seasons.shape[0]:
+            raise ValueError("Feature index keys, rows and seasons must have the same length")
+        if np.any(np.diff(self.keys) <= 0):
+            raise ValueError("Feature index keys must be strictly increasing")
+        self.initial_row = np.zeros(N_FEATURES) if initial_row is None else np.asarray(initial_row, dtype=np.float64)
+        # shared_model.py passes the version it published rather than rehashing the rows
+        self.version = _content_digest(self.keys, self.rows) if version is None else version
+
+    @classmethod
+    def build(cls, box_scores, teams=None, initial_row=None):
+        """Replay box scores through a TeamFeatureStore, recording every team's row after each game"""
+        store = TeamFeatureStore(teams=teams)
+        # Teams can only play once per day; like train.prepare_game_logs, the later row wins
+        latest = {}
+        for box_score in box_scores:
+            latest[store.index_of(box_score["team"]), to_day(box_score["date"])] = box_score
+        keys = []
+        rows = []
+        seasons = []
+        for box_score in sorted(latest.values(), key=lambda game: to_day(game["date"])):
+            store.update(box_score)
+            t = store.index_of(box_score["team"])
+            keys.append(t * KEY_STRIDE + int(store.last_day[t]))
+            rows.append(store.features[t].copy())
+            seasons.append(int(store.season[t]))
+
+        keys = np.array(keys, dtype=np.int64)
+        order = np.argsort(keys, kind="stable")
+        rows = np.array(rows).reshape(-1, N_FEATURES)[order]
+        return cls(store.teams, keys[order], rows, np.array(seasons, dtype=np.int64)[order], initial_row)
+
+    def encode(self, teams):
+        """Team codes (or aliases) to ordinals"""
+        return self.registry.encode(teams)
+
+    def positions(self, ordinals, days):
+        """Row position of each team's last game strictly before each day, or -1"""
+        query = ordinals * KEY_STRIDE + days
+        position = np.searchsorted(self.keys, query, side="left") - 1
+        found = position >= 0
+        found[found] = self.keys[position[found]] // KEY_STRIDE == ordinals[found]
+        return np.where(found, position, -1)
+
+    def lookup(self, teams, dates):
+        """Feature rows for each (team, date) as they stood before that date's games"""
+        ordinals = self.encode(teams)
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        days = dates.astype(np.int64)
+        position = self.positions(ordinals, days)
+        found = position >= 0
+
+        rows = np.empty((ordinals.shape[0], N_FEATURES))
+        rows[:] = self.initial_row
+        hit = position[found]
+        rows[found] = self.rows[hit]
+
+        rest = days[found] - self.keys[hit] % KEY_STRIDE
+        rows[found, REST_DAYS] = rest
+        rows[found, BACK_TO_BACK] = rest == 1
+        new_season = np.zeros_like(found)
+        new_season[found] = seasons_of_days(dates[found]) != self.seasons[hit]
+        rows[new_season, SEASON_PROGRESS] = 0.0
+        return rows
+
+    def history(self, team, start=None, end=None):
+        """Dates and rows recorded for one team between start and end (inclusive)"""
+        t = self.registry.ordinal(team)
+        lo_day = to_day(start) if start is not None else 0
+        hi_day = to_day(end) + 1 if end is not None else KEY_STRIDE - 1
+        lo, hi = np.searchsorted(self.keys, [t * KEY_STRIDE + lo_day, t * KEY_STRIDE + hi_day])
+        days = (self.keys[lo:hi] % KEY_STRIDE).astype("datetime64[D]")
+        return days, self.rows[lo:hi]
+
+    def last_days(self):
+        """Day of each team's latest indexed game (by ordinal), -1 for teams without one"""
+        ordinals = np.arange(len(self.teams))
+        position = self.positions(ordinals, np.full(ordinals.shape[0], KEY_STRIDE - 1))
+        return np.where(position >= 0, self.keys[position] % KEY_STRIDE, -1)
+
+    def latest_store(self):
+        """TeamFeatureStore standing where every team's latest indexed game left it"""
+        store = TeamFeatureStore(teams=self.teams, initial_row=self.initial_row)
+        for t in range(len(self.teams)):
+            lo, hi = np.searchsorted(self.keys, [t * KEY_STRIDE, (t + 1) * KEY_STRIDE])
+            if hi > lo:
+                store.seed_team(t, self.rows[max(lo, hi - 2 * MAX_WINDOW):hi], int(hi - lo),
+                                int(self.keys[hi - 1] % KEY_STRIDE), int(self.seasons[hi - 1]))
+        return store
+
+    def save(self, path):
+        np.savez(
+            path,
+            teams=np.array(self.teams),
+            feature_names=np.array(self.feature_names),
+            keys=self.keys,
+            rows=self.rows,
+            seasons=self.seasons,
+        )
+
+    @classmethod
+    def load(cls, path, initial_row=None):
+        with np.load(path, allow_pickle=False) as data:
+            if data["feature_names"].tolist() != FEATURE_NAMES:
+                raise ValueError(f"Feature index {path} was written for a different feature set")
+            return cls(data["teams"].tolist(), data["keys"], data["rows"], data["seasons"], initial_row)
+
+
+class IndexedStore:
+    """A live TeamFeatureStore in front of the FeatureIndex it was seeded from
+
+    Dates up to a team's latest indexed game are answered from the index as
+    the team stood then; later dates from the store, which ingest.py keeps
+    current.
+    """
+
+    def __init__(self, store, index):
+        if store.teams != index.teams:
+            raise ValueError("The store and the feature index must list the same teams")
+        self.store = store
+        self.index = index
+        self.feature_names = list(FEATURE_NAMES)
+        self.last_indexed = index.last_days()
+
+    @property
+    def version(self):
+        return f"{self.index.version}+{self.store.version}"
+
+    def lookup(self, teams, dates):
+        rows = self.store.lookup(teams, dates)
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        indexed = dates.astype(np.int64) <= self.last_indexed[self.index.encode(teams)]
+        if indexed.any():
+            rows[indexed] = self.index.lookup(np.asarray(teams)[indexed], dates[indexed])
+        return rows
+
+
+def _content_digest(*arrays):
+    digest = hashlib.sha256()
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()[:12]
+
+
+def main(argv):
+    import pandas as pd
+
+    if len(argv) < 2:
+        print(__doc__.strip().splitlines()[-1])
+        return 1
+    output_path = argv[2] if len(argv) > 2 else os.path.join(os.path.dirname(os.path.abspath(__file__)), FEATURE_INDEX_FILE)
+    if os.path.isdir(argv[1]):
+        from history_store import GameHistory
+
+        box_scores = GameHistory.open(argv[1]).records()
+    else:
+        box_scores = pd.read_csv(argv[1]).to_dict("records")
+    index = FeatureIndex.build(box_scores)
+    index.save(output_path)
+    print(f"Wrote {output_path} ({index.keys.shape[0]} team-games)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,352 @@
+"""
+Incremental per-team feature store for the 40 model features
+Every team keeps fixed-size ring buffers of its last box scores, so a new game
+updates all rolling windows in O(1) instead of recomputing from full history
+
+Feature definitions (all describe a team *before* the game being predicted):
+    <stat>_avg_<w>    mean of the stat over the team's last w games
+    win_streak        consecutive wins coming into the game
+    loss_streak       consecutive losses coming into the game
+    recent_form_<w>   share of the last w games won
+    momentum_score    exponentially weighted win rate (alpha = MOMENTUM_ALPHA)
+    rest_days         days since the previous game (0 before the first game)
+    back_to_back      1 when rest_days == 1
+    season_progress   games already played this season / GAMES_PER_SEASON
+    opp_pts_avg       season-to-date mean of points allowed
+    opp_fg_pct_avg    season-to-date mean of opponent field goal percentage
+"""
+
+import threading
+from datetime import date, datetime
+
+import numpy as np
+
+from teams import TEAMS, registry_for
+
+ROLLING_STATS = ("pts", "fg%", "3p%", "ft%", "trb", "ast", "stl", "blk", "tov", "pf")
+WINDOWS = (3, 5, 10)
+FORM_WINDOWS = (5, 10)
+MAX_WINDOW = max(WINDOWS + FORM_WINDOWS)
+MOMENTUM_ALPHA = 1.0 / 3.0
+GAMES_PER_SEASON = 82
+
+FEATURE_NAMES = [f"{stat}_avg_{window}" for stat in ROLLING_STATS for window in WINDOWS] + [
+    "win_streak",
+    "loss_streak",
+    "recent_form_5",
+    "recent_form_10",
+    "momentum_score",
+    "rest_days",
+    "back_to_back",
+    "season_progress",
+    "opp_pts_avg",
+    "opp_fg_pct_avg",
+]
+
+# Column positions inside a feature row
+N_FEATURES = len(FEATURE_NAMES)
+WIN_STREAK = FEATURE_NAMES.index("win_streak")
+LOSS_STREAK = FEATURE_NAMES.index("loss_streak")
+RECENT_FORM = [FEATURE_NAMES.index(f"recent_form_{window}") for window in FORM_WINDOWS]
+MOMENTUM = FEATURE_NAMES.index("momentum_score")
+REST_DAYS = FEATURE_NAMES.index("rest_days")
+BACK_TO_BACK = FEATURE_NAMES.index("back_to_back")
+SEASON_PROGRESS = FEATURE_NAMES.index("season_progress")
+OPP_PTS = FEATURE_NAMES.index("opp_pts_avg")
+OPP_FG_PCT = FEATURE_NAMES.index("opp_fg_pct_avg")
+
+# Box score fields consumed by the store, one record per team per game
+BOX_SCORE_FIELDS = ("team", "date", "won", "opp_pts", "opp_fg%") + ROLLING_STATS
+
+# Spellings of a win accepted in the "won" column of game logs
+WIN_VALUES = ("1", "true", "w", "win", "yes")
+
+SNAPSHOT_ARRAYS = (
+    "history", "wins", "cursor", "count", "sums", "win_sums", "streak",
+    "momentum", "last_day", "season", "season_games", "opp_sums", "features",
+)
+
+
+def season_of(game_date):
+    """NBA season label for a date, named after the year the season ends"""
+    return game_date.year + 1 if game_date.month >= 8 else game_date.year
+
+
+def seasons_of_days(days):
+    """Vectorized season_of for an array of datetime64[D] values"""
+    days = np.asarray(days, dtype="datetime64[D]")
+    years = days.astype("datetime64[Y]").astype(np.int64) + 1970
+    months = days.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    return years + (months >= 8)
+
+
+def as_date(value):
+    """Coerce a date, datetime or ISO string to a date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def to_day(value):
+    """Days since the Unix epoch for a date, datetime or ISO string"""
+    return int(np.datetime64(as_date(value), "D").astype(np.int64))
+
+
+class TeamFeatureStore:
+    """Ring-buffer backed rolling features for every team"""
+
+    def __init__(self, teams=None, initial_row=None):
+        self.teams = list(TEAMS.codes) if teams is None else list(teams)
+        self.registry = registry_for(self.teams)
+        self.feature_names = list(FEATURE_NAMES)
+        n_teams = len(self.teams)
+        n_stats = len(ROLLING_STATS)
+
+        self.history = np.zeros((n_teams, MAX_WINDOW, n_stats))
+        self.wins = np.zeros((n_teams, MAX_WINDOW))
+        self.cursor = np.zeros(n_teams, dtype=np.int64)
+        self.count = np.zeros(n_teams, dtype=np.int64)
+        self.sums = np.zeros((n_teams, len(WINDOWS), n_stats))
+        self.win_sums = np.zeros((n_teams, len(FORM_WINDOWS)))
+        self.streak = np.zeros(n_teams, dtype=np.int64)  # > 0 winning, < 0 losing
+        self.momentum = np.zeros(n_teams)
+        self.last_day = np.full(n_teams, -1, dtype=np.int64)
+        self.season = np.zeros(n_teams, dtype=np.int64)
+        self.season_games = np.zeros(n_teams, dtype=np.int64)
+        self.opp_sums = np.zeros((n_teams, 2))
+
+        # One preallocated feature row per team, rewritten in place on update
+        self.features = np.zeros((n_teams, N_FEATURES))
+        if initial_row is not None:
+            self.features[:] = initial_row
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        """Changes on every update, so cached predictions never outlive the features they used"""
+        return f"store-{self.generation}"
+
+    def index_of(self, team):
+        return self.registry.ordinal(team)
+
+    def update(self, box_score):
+        """Add one finished game for one team; box_score carries BOX_SCORE_FIELDS"""
+        t = self.index_of(box_score["team"])
+        game_date = as_date(box_score["date"])
+        day = to_day(game_date)
+        season = box_score.get("season") or season_of(game_date)
+        values = np.array([float(box_score[stat]) for stat in ROLLING_STATS])
+        won = 1.0 if is_win(box_score["won"]) else 0.0
+
+        with self._lock:
+            if day <= self.last_day[t]:
+                raise ValueError(
+                    f"Box score for {box_score['team']} on {box_score['date']} "
+                    "is not newer than the team's latest game"
+                )
+            self._push(t, values, won)
+            self._update_results(t, won, day, int(season),
+                                 float(box_score["opp_pts"]), float(box_score["opp_fg%"]))
+            self._write_row(t)
+            self.generation += 1
+
+    def update_many(self, box_scores):
+        """Add box scores in date order"""
+        for box_score in sorted(box_scores, key=lambda game: to_day(game["date"])):
+            self.update(box_score)
+
+    def seed_team(self, t, rows, n_games, day, season):
+        """Set team t to where its n_games-th game left it, from its last post-game feature rows
+
+        rows are the team's rows after each of its last games (at most
+        2 * MAX_WINDOW), as FeatureIndex records them.  The box score stats
+        are solved back out of the rolling means and results read off the
+        streaks, so later updates roll the windows as a full replay would.
+        """
+        rows = np.asarray(rows, dtype=np.float64)
+        n_rows = rows.shape[0]
+        first_game = n_games - n_rows
+        n_stats = len(ROLLING_STATS)
+        equations, targets = [], []
+        for j in range(n_rows):
+            for i, window in enumerate(WINDOWS):
+                start = max(first_game + j - window + 1, 0)
+                if start >= first_game:
+                    equation = np.zeros(n_rows)
+                    equation[start - first_game:j + 1] = 1.0
+                    equations.append(equation)
+                    targets.append(rows[j, i:len(WINDOWS) * n_stats:len(WINDOWS)] * (first_game + j + 1 - start))
+        values = np.linalg.lstsq(np.array(equations), np.array(targets), rcond=None)[0]
+        won = (rows[:, WIN_STREAK] > 0).astype(np.float64)
+
+        latest = rows[-1]
+        count = min(n_games, MAX_WINDOW)
+        with self._lock:
+            self.cursor[t] = n_games % MAX_WINDOW
+            slots = (self.cursor[t] - count + np.arange(count)) % MAX_WINDOW
+            self.history[t, slots] = values[-count:]
+            self.wins[t, slots] = won[-count:]
+            self.count[t] = count
+            self._resum(t)
+            self.streak[t] = int(latest[WIN_STREAK]) - int(latest[LOSS_STREAK])
+            self.momentum[t] = latest[MOMENTUM]
+            self.last_day[t] = day
+            self.season[t] = season
+            self.season_games[t] = round(latest[SEASON_PROGRESS] * GAMES_PER_SEASON)
+            self.opp_sums[t] = latest[OPP_PTS:OPP_FG_PCT + 1] * self.season_games[t]
+            self._write_row(t)
+            self.generation += 1
+
+    def _push(self, t, values, won):
+        pos = self.cursor[t]
+        count = self.count[t]
+        for i, window in enumerate(WINDOWS):
+            if count >= window:
+                self.sums[t, i] -= self.history[t, (pos - window) % MAX_WINDOW]
+            self.sums[t, i] += values
+        for i, window in enumerate(FORM_WINDOWS):
+            if count >= window:
+                self.win_sums[t, i] -= self.wins[t, (pos - window) % MAX_WINDOW]
+            self.win_sums[t, i] += won
+
+        self.history[t, pos] = values
+        self.wins[t, pos] = won
+        self.cursor[t] = (pos + 1) % MAX_WINDOW
+        self.count[t] = min(count + 1, MAX_WINDOW)
+
+        # Re-derive the sums from the buffer once per lap so float error cannot build up
+        if self.cursor[t] == 0:
+            self._resum(t)
+
+    def _resum(self, t):
+        count = self.count[t]
+        newest_first = (self.cursor[t] - 1 - np.arange(count)) % MAX_WINDOW
+        for i, window in enumerate(WINDOWS):
+            self.sums[t, i] = self.history[t, newest_first[:window]].sum(axis=0)
+        for i, window in enumerate(FORM_WINDOWS):
+            self.win_sums[t, i] = self.wins[t, newest_first[:window]].sum()
+
+    def _update_results(self, t, won, day, season, opp_pts, opp_fg_pct):
+        if won:
+            self.streak[t] = max(self.streak[t], 0) + 1
+        else:
+            self.streak[t] = min(self.streak[t], 0) - 1
+
+        if self.last_day[t] < 0:
+            self.momentum[t] = won
+        else:
+            self.momentum[t] += MOMENTUM_ALPHA * (won - self.momentum[t])
+
+        if season != self.season[t]:
+            self.season[t] = season
+            self.season_games[t] = 0
+            self.opp_sums[t] = 0.0
+        self.season_games[t] += 1
+        self.opp_sums[t] += (opp_pts, opp_fg_pct)
+        self.last_day[t] = day
+
+    def _write_row(self, t):
+        row = self.features[t]
+        count = self.count[t]
+        n_stats = len(ROLLING_STATS)
+        for i, window in enumerate(WINDOWS):
+            # Stat-major layout: pts_avg_3, pts_avg_5, pts_avg_10, fg%_avg_3, ...
+            row[i:len(WINDOWS) * n_stats:len(WINDOWS)] = self.sums[t, i] / min(count, window)
+        for i, window in enumerate(FORM_WINDOWS):
+            row[RECENT_FORM[i]] = self.win_sums[t, i] / min(count, window)
+        row[WIN_STREAK] = max(self.streak[t], 0)
+        row[LOSS_STREAK] = max(-self.streak[t], 0)
+        row[MOMENTUM] = self.momentum[t]
+        row[SEASON_PROGRESS] = self.season_games[t] / GAMES_PER_SEASON
+        row[OPP_PTS:OPP_FG_PCT + 1] = self.opp_sums[t] / self.season_games[t]
+        row[REST_DAYS] = 0.0
+        row[BACK_TO_BACK] = 0.0
+
+    def row(self, team, game_date=None, out=None):
+        """The team's current feature row
+
+        Without game_date or out this is a read-only view of the preallocated
+        row, which later updates overwrite.  With game_date the row is copied
+        into out (allocated if not given) and rest days are counted to that date.
+        """
+        t = self.index_of(team)
+        if game_date is None and out is None:
+            view = self.features[t]
+            view.flags.writeable = False
+            return view
+        if out is None:
+            out = np.empty(N_FEATURES)
+        with self._lock:
+            out[:] = self.features[t]
+            last_day = self.last_day[t]
+            season = self.season[t]
+        if game_date is not None and last_day >= 0:
+            game_date = as_date(game_date)
+            rest = max(to_day(game_date) - last_day, 0)
+            out[REST_DAYS] = rest
+            out[BACK_TO_BACK] = 1.0 if rest == 1 else 0.0
+            if season_of(game_date) != season:
+                out[SEASON_PROGRESS] = 0.0
+        return out
+
+    def lookup(self, teams, dates):
+        """Current feature rows for many teams, with rest days counted to each date"""
+        index = self.registry.encode(teams)
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        days = dates.astype(np.int64)
+        with self._lock:
+            rows = self.features[index]
+            last_day = self.last_day[index]
+            season = self.season[index]
+        played = last_day >= 0
+        rest = np.where(played, np.maximum(days - last_day, 0), 0)
+        rows[:, REST_DAYS] = rest
+        rows[:, BACK_TO_BACK] = rest == 1
+        rows[played & (seasons_of_days(dates) != season), SEASON_PROGRESS] = 0.0
+        return rows
+
+    def save(self, path):
+        """Snapshot the store so a restart does not replay the season"""
+        with self._lock:
+            arrays = {name: getattr(self, name).copy() for name in SNAPSHOT_ARRAYS}
+            generation = self.generation
+        np.savez(
+            path,
+            teams=np.array(self.teams),
+            feature_names=np.array(self.feature_names),
+            generation=np.array(generation),
+            **arrays,
+        )
+
+    def copy(self):
+        """Independent store with the same state, e.g. to apply updates off to the side"""
+        store = TeamFeatureStore(teams=self.teams)
+        with self._lock:
+            for name in SNAPSHOT_ARRAYS:
+                setattr(store, name, getattr(self, name).copy())
+            store.generation = self.generation
+        return store
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if data["feature_names"].tolist() != FEATURE_NAMES:
+                raise ValueError(f"Snapshot {path} was written for a different feature set")
+            store = cls(teams=data["teams"].tolist())
+            for name in SNAPSHOT_ARRAYS:
+                array = data[name]
+                if array.shape != getattr(store, name).shape:
+                    raise ValueError(f"Snapshot {path} has a malformed '{name}' array")
+                setattr(store, name, array.copy())
+            store.generation = int(data["generation"])
+        return store
+
+
+def is_win(value):
+    """Interpret a game log "won" value (bool, 0/1 or a string such as "W")"""
+    if isinstance(value, str):
+        return value.strip().lower() in WIN_VALUES
+    return bool(value)
@@ -0,0 +1,279 @@
+"""
+Columnar on-disk store of per-team game logs
+One raw little-endian file per column (team, date, result and every box score
+stat), rows in date order, plus a per-team row index so one team's games are
+a contiguous, date-sorted slice.  Readers open every column with np.memmap,
+so any number of processes share the same pages through the OS page cache and
+opening the store costs a few milliseconds however long the history is.
+
+Appending a game night writes only the new rows at the end of each column
+file and rebuilds the small team index; manifest.json, replaced atomically,
+records how many rows are committed, so readers never see a half-written
+append.  One writer at a time is assumed.
+
+Usage: python history_store.py games.csv [history_dir]    (import or append)
+       python history_store.py [history_dir]              (summary)
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+
+from feature_store import BOX_SCORE_FIELDS, ROLLING_STATS, WIN_VALUES, seasons_of_days, to_day
+from teams import TEAMS, registry_for
+
+HISTORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history")
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+# (column, dtype); team and opponent are ordinals into the manifest's team list
+COLUMNS = (
+    ("team", "<i2"),
+    ("opponent", "<i2"),
+    ("home", "i1"),
+    ("day", "<i4"),
+    ("season", "<i2"),
+    ("won", "i1"),
+    ("opp_pts", "<f8"),
+    ("opp_fg%", "<f8"),
+) + tuple((stat, "<f8") for stat in ROLLING_STATS)
+
+UNKNOWN = -1  # opponent or home flag missing from the source logs
+
+
+def column_file(name):
+    return name.replace("%", "_pct") + ".bin"
+
+
+class GameHistory:
+    """Read-only, memory-mapped view of a history directory"""
+
+    def __init__(self, path, manifest):
+        self.path = path
+        self.manifest = manifest
+        self.teams = list(manifest["teams"])
+        self.registry = registry_for(self.teams)
+        self.rows = int(manifest["rows"])
+        self.columns = {name: self._map(column_file(name), dtype, self.rows) for name, dtype in COLUMNS}
+        self.team_offsets = self._map(manifest["team_offsets"], "<i8", len(self.teams) + 1)
+        self.team_rows = self._map(manifest["team_rows"], "<i8", self.rows)
+
+    def _map(self, filename, dtype, length):
+        if length == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, filename), dtype=dtype, mode="r", shape=(length,))
+
+    @classmethod
+    def open(cls, path=HISTORY_DIR):
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{path} was written by an unsupported history store format")
+        return cls(path, manifest)
+
+    @classmethod
+    def create(cls, path=HISTORY_DIR, teams=None):
+        """Start an empty store (the directory may exist but must not hold one)"""
+        if os.path.exists(os.path.join(path, MANIFEST_FILE)):
+            raise FileExistsError(f"{path} already holds a game history")
+        os.makedirs(path, exist_ok=True)
+        for name, _ in COLUMNS:
+            open(os.path.join(path, column_file(name)), "wb").close()
+        teams = list(TEAMS.codes) if teams is None else list(teams)
+        manifest = _write_index(path, np.empty(0, dtype="<i2"), teams, 0)
+        return cls(path, manifest)
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def version(self):
+        return f"history-{self.rows}"
+
+    @property
+    def last_day(self):
+        return int(self.columns["day"][-1]) if self.rows else None
+
+    def column(self, name):
+        return self.columns[name]
+
+    def team_games(self, team, start=None, end=None):
+        """One team's games between start and end (inclusive) as a dict of column arrays"""
+        t = self.registry.ordinal(team)
+        rows = self.team_rows[self.team_offsets[t]:self.team_offsets[t + 1]]
+        days = self.columns["day"][rows]
+        lo = np.searchsorted(days, to_day(start)) if start is not None else 0
+        hi = np.searchsorted(days, to_day(end), side="right") if end is not None else days.shape[0]
+        rows = rows[lo:hi]
+        return {name: column[rows] for name, column in self.columns.items()}
+
+    def to_frame(self):
+        """The whole history as a game log DataFrame (the CSV layout train.py reads)"""
+        import pandas as pd
+
+        teams = np.array(self.teams + [""])  # UNKNOWN indexes the trailing blank
+        frame = pd.DataFrame({
+            "team": teams[self.columns["team"]],
+            "date": self.columns["day"].astype("datetime64[D]"),
+            "season": np.asarray(self.columns["season"], dtype=np.int64),
+            "won": np.asarray(self.columns["won"], dtype=np.int64),
+        })
+        for name in ("opp_pts", "opp_fg%") + ROLLING_STATS:
+            frame[name] = np.asarray(self.columns[name])
+        if self.rows and np.all(self.columns["opponent"] != UNKNOWN):
+            frame["opponent"] = teams[self.columns["opponent"]]
+        if self.rows and np.all(self.columns["home"] != UNKNOWN):
+            frame["home"] = np.asarray(self.columns["home"], dtype=np.int64)
+        return frame
+
+    def records(self):
+        """Rows as box score dicts, e.g. for FeatureIndex.build"""
+        return self.to_frame().to_dict("records")
+
+    def append(self, box_scores):
+        """Append one or more game nights and return a GameHistory that includes them
+
+        Rows must not be older than the latest stored day, and a team can
+        appear at most once per day.
+        """
+        teams = list(self.teams)
+        new = _encode(box_scores, teams)
+        n_new = new["day"].shape[0]
+        if n_new == 0:
+            return self
+        order = np.lexsort((new["team"], new["day"]))
+        new = {name: values[order] for name, values in new.items()}
+
+        keys = new["day"].astype(np.int64) * len(teams) + new["team"]
+        if np.any(np.diff(keys) == 0):
+            raise ValueError("A team appears more than once on the same day")
+        last_day = self.last_day
+        if last_day is not None:
+            if new["day"][0] < last_day:
+                raise ValueError("Appended games are older than the latest stored game night")
+            stored_last_night = self.columns["team"][self.columns["day"] == last_day]
+            if np.any(np.isin(new["team"][new["day"] == last_day], stored_last_night)):
+                raise ValueError("A team already has a game stored on that day")
+
+        for name, dtype in COLUMNS:
+            path = os.path.join(self.path, column_file(name))
+            with open(path, "r+b") as f:
+                # Drop anything a crashed append left past the committed rows
+                f.truncate(self.rows * np.dtype(dtype).itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(np.ascontiguousarray(new[name], dtype=dtype).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+        team = np.concatenate([np.asarray(self.columns["team"]), new["team"].astype("<i2")])
+        previous = (self.manifest["team_offsets"], self.manifest["team_rows"])
+        manifest = _write_index(self.path, team, teams, self.rows + n_new)
+        for filename in previous:
+            if filename not in (manifest["team_offsets"], manifest["team_rows"]):
+                # Readers that still map the old index keep it alive until they close it
+                os.remove(os.path.join(self.path, filename))
+        return GameHistory(self.path, manifest)
+
+
+def _write_index(path, team, teams, rows):
+    """Write the per-team row index for `rows` committed rows, then the manifest"""
+    team_rows = np.argsort(team, kind="stable").astype("<i8")  # rows are in date order
+    counts = np.bincount(team, minlength=len(teams)) if rows else np.zeros(len(teams), dtype=np.int64)
+    team_offsets = np.concatenate([[0], np.cumsum(counts)]).astype("<i8")
+    manifest = {
+        "format": FORMAT_VERSION,
+        "rows": rows,
+        "teams": teams,
+        "columns": {name: {"file": column_file(name), "dtype": dtype} for name, dtype in COLUMNS},
+        "team_offsets": f"team_offsets-{rows}.bin",
+        "team_rows": f"team_rows-{rows}.bin",
+    }
+    for key, array in (("team_offsets", team_offsets), ("team_rows", team_rows)):
+        with open(os.path.join(path, manifest[key]), "wb") as f:
+            f.write(array.tobytes())
+            os.fsync(f.fileno())
+    _replace_json(os.path.join(path, MANIFEST_FILE), manifest)
+    return manifest
+
+
+def _replace_json(path, payload):
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(payload, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def _encode(box_scores, teams):
+    """Column arrays for box score dicts or a DataFrame, adding unseen teams to `teams`"""
+    import pandas as pd
+
+    games = pd.DataFrame(box_scores)
+    if games.empty:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS}
+    games.columns = [str(column).strip().lower() for column in games.columns]
+    missing = [field for field in BOX_SCORE_FIELDS if field not in games.columns]
+    if missing:
+        raise ValueError(f"Box scores are missing field(s): {', '.join(missing)}")
+
+    def ordinals(codes):
+        codes = TEAMS.canonical_codes(codes)
+        teams.extend(code for code in dict.fromkeys(codes.tolist()) if code not in teams)
+        return registry_for(teams).encode(codes)
+
+    days = pd.to_datetime(games["date"]).to_numpy().astype("datetime64[D]")
+    won = games["won"]
+    if won.dtype == object:
+        won = won.astype(str).str.strip().str.lower().isin(WIN_VALUES)
+    home = np.full(len(games), UNKNOWN)
+    if "home" in games.columns:
+        # CSV rows hold "0"/"1" strings, and astype(bool) reads "0" as True
+        home = pd.to_numeric(games["home"]).astype(bool).to_numpy()
+    season = seasons_of_days(days)
+    if "season" in games.columns:
+        season = games["season"].fillna(pd.Series(season, index=games.index)).to_numpy()
+    columns = {
+        "team": ordinals(games["team"]),
+        "opponent": ordinals(games["opponent"]) if "opponent" in games.columns else np.full(len(games), UNKNOWN),
+        "home": home,
+        "day": days.astype(np.int64),
+        "season": season,
+        "won": won.astype(bool).to_numpy(),
+    }
+    for name in ("opp_pts", "opp_fg%") + ROLLING_STATS:
+        columns[name] = games[name].to_numpy(dtype=np.float64)
+    return {name: np.asarray(columns[name]).astype(dtype) for name, dtype in COLUMNS}
+
+
+def open_or_create(path=HISTORY_DIR):
+    if os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        return GameHistory.open(path)
+    return GameHistory.create(path)
+
+
+def main(argv):
+    import pandas as pd
+
+    if len(argv) > 1 and os.path.isfile(argv[1]):
+        path = argv[2] if len(argv) > 2 else HISTORY_DIR
+        games = pd.read_parquet(argv[1]) if argv[1].lower().endswith((".parquet", ".pq")) else pd.read_csv(argv[1])
+        before = open_or_create(path)
+        history = before.append(games)
+        print(f"Appended {len(history) - len(before)} team-games to {path} ({len(history)} total)")
+        return 0
+
+    path = argv[1] if len(argv) > 1 else HISTORY_DIR
+    if not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        print(__doc__[__doc__.index("Usage:"):].rstrip())
+        return 1
+    history = GameHistory.open(path)
+    last = np.datetime64(history.last_day, "D") if history.rows else "-"
+    print(f"{path}: {len(history)} team-games, {len(history.teams)} teams, last game night {last}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
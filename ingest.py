@@ -0,0 +1,323 @@
+"""
+Streaming ingest of finished games with incremental model refresh
+Tails a drop directory for JSONL or CSV files of box scores (one record per
+team per game with the BOX_SCORE_FIELDS of feature_store.py).  For each file:
+
+    1. every team's pre-game feature row and result becomes a training row
+       folded into the Ridge sufficient statistics (ridge.py),
+    2. the games are applied to a copy of the live TeamFeatureStore (and
+       appended to the history store, if one is configured),
+    3. the 41x41 system is re-solved and the new store and model replace the
+       running Predictor's, so requests see either the old pair or the new one.
+       When the Predictor served a FeatureIndex, the store goes in front of it
+       (feature_index.IndexedStore) so dates up to each team's latest indexed
+       game are still answered point-in-time.
+
+Processed files move to <drop_dir>/processed/ and rejected ones to
+<drop_dir>/failed/ next to a .error note.  Writers should create files under a
+name starting with a dot and rename them once complete.  The feature store,
+Ridge stats and latest model are saved under ingest_state/, so a restart picks
+up where it left off until a different base model.npz is deployed.
+
+Usage: python ingest.py drop_dir    (one pass over the directory)
+    NBA_INGEST_DIR starts a background ingest thread in the app and the JSON
+    API; NBA_INGEST_INTERVAL sets the poll period in seconds.  The live feature
+    store is seeded from the served feature index's latest rows plus any newer
+    games in NBA_HISTORY_DIR (default history/ if present); with neither it only
+    knows the games ingested so far
+"""
+
+import csv
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+import numpy as np
+
+from feature_index import FeatureIndex, IndexedStore
+from feature_store import TeamFeatureStore, is_win, to_day
+from predictor import ARTIFACT_DIR, COMPILED_MODEL_FILE, CompiledModel
+from ridge import RIDGE_STATS_FILE, RidgeStats, refit
+
+INGEST_STATE_DIR = os.path.join(ARTIFACT_DIR, "ingest_state")
+STORE_SNAPSHOT_FILE = "feature_store.npz"
+STATE_FILE = "ingest.json"
+DEFAULT_POLL_INTERVAL = 5.0
+INGEST_SUFFIXES = (".jsonl", ".csv")
+
+
+def read_box_scores(path):
+    """Box score dicts from a JSONL or CSV file"""
+    with open(path, newline="") as f:
+        if path.lower().endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
+        return list(csv.DictReader(f))
+
+
+class Ingestor:
+    """Folds new box scores into a Predictor's features and Ridge weights"""
+
+    def __init__(self, predictor, drop_dir, state_dir=INGEST_STATE_DIR, history_dir=None,
+                 interval=DEFAULT_POLL_INTERVAL, stats=None):
+        self.predictor = predictor
+        self.drop_dir = drop_dir
+        self.state_dir = state_dir
+        self.interval = interval
+        self.history = None
+        if history_dir is not None:
+            from history_store import open_or_create
+
+            self.history = open_or_create(history_dir)
+
+        # Refits keep the deployed scaler, so the base model fixes the feature space
+        self.base_model = predictor.model
+        source = predictor.feature_source
+        self.index = source if isinstance(source, FeatureIndex) else None
+        self.files = 0
+        self.rows = 0
+        self.failed = 0
+        self.last_error = None
+        self.last_ingest = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.store, self.stats = self._restore(stats)
+
+    def _restore(self, stats=None):
+        """Resume saved state for this base model, else start from the index, history and the model's weights"""
+        state_path = os.path.join(self.state_dir, STATE_FILE)
+        if os.path.exists(state_path):
+            with open(state_path) as f:
+                state = json.load(f)
+            if state.get("base_version") == self.base_model.version:
+                store = TeamFeatureStore.load(os.path.join(self.state_dir, STORE_SNAPSHOT_FILE))
+                stats = RidgeStats.load(os.path.join(self.state_dir, RIDGE_STATS_FILE))
+                model = CompiledModel.load(os.path.join(self.state_dir, COMPILED_MODEL_FILE))
+                self.files, self.rows = state["files"], state["rows"]
+                self._publish(store, model)
+                return store, stats
+
+        if self.index is not None:
+            store = self.index.latest_store()
+        else:
+            store = TeamFeatureStore(initial_row=self.base_model.baseline)
+        if self.history is not None and len(self.history):
+            store.update_many(
+                box_score for box_score in self.history.records()
+                if to_day(box_score["date"]) > store.last_day[store.index_of(box_score["team"])]
+            )
+        return store, stats if stats is not None else initial_stats(self.base_model)
+
+    def rebase(self, model, model_dir=ARTIFACT_DIR):
+        """Continue from a newly deployed model (see registry.py)
+
+        Games already ingested stay in the feature store; the new model is
+        assumed to have been trained on them, so its own statistics replace
+        the running ones.
+        """
+        with self._lock:
+            self.base_model = model
+            self.stats = initial_stats(model, model_dir)
+            self._publish(self.store, model)
+        self._save()
+
+    def pending(self):
+        """Complete files waiting in the drop directory, oldest name first"""
+        if not os.path.isdir(self.drop_dir):
+            return []
+        names = sorted(
+            name for name in os.listdir(self.drop_dir)
+            if not name.startswith(".") and name.lower().endswith(INGEST_SUFFIXES)
+            and os.path.isfile(os.path.join(self.drop_dir, name))
+        )
+        return [os.path.join(self.drop_dir, name) for name in names]
+
+    def poll(self):
+        """Ingest every pending file; returns how many were ingested"""
+        ingested = 0
+        for path in self.pending():
+            name = os.path.basename(path)
+            try:
+                self.ingest(read_box_scores(path))
+            except Exception as e:
+                self.failed += 1
+                self.last_error = f"{name}: {e}"
+                self._move(path, "failed")
+                with open(os.path.join(self.drop_dir, "failed", name + ".error"), "w") as f:
+                    f.write(f"{e}\n")
+            else:
+                ingested += 1
+                self.files += 1
+                self._move(path, "processed")
+                self._save()
+        return ingested
+
+    def ingest(self, box_scores):
+        """Apply finished games, refit and swap the result into the predictor"""
+        box_scores = sorted(box_scores, key=lambda game: to_day(game["date"]))
+        with self._lock:
+            store = self.store.copy()
+            self._check(store, box_scores)
+
+            model = self.base_model
+            features = np.empty((len(box_scores), len(model.feature_names)))
+            labels = np.empty(len(box_scores))
+            n_rows = 0
+            for box_score in box_scores:
+                team = box_score["team"]
+                # Teams without a game yet would only contribute the baseline row
+                if store.last_day[store.index_of(team)] >= 0:
+                    store.row(team, box_score["date"], out=features[n_rows])
+                    labels[n_rows] = is_win(box_score["won"])
+                    n_rows += 1
+                store.update(box_score)
+
+            stats = self.stats
+            if n_rows:
+                stats = self.stats.copy()
+                stats.update(features[:n_rows] * model.scale + model.offset, labels[:n_rows])
+            if self.history is not None:
+                self.history = self.history.append(box_scores)
+
+            self.store, self.stats = store, stats
+            self.rows += n_rows
+            self.last_ingest = time.time()
+            self._publish(store, refit(model, stats) if n_rows else self.predictor.model)
+        return n_rows
+
+    def _check(self, store, box_scores):
+        """Reject a file up front rather than half-applying it
+
+        A game on or before the team's latest one, which includes a file
+        dropped twice, would be counted again in its rolling windows.
+        """
+        last_day = store.last_day.copy()
+        for box_score in box_scores:
+            t = store.index_of(box_score["team"])
+            day = to_day(box_score["date"])
+            if day <= last_day[t]:
+                raise ValueError(f"{box_score['team']} on {box_score['date']} is not newer than its latest game")
+            last_day[t] = day
+
+    def _publish(self, store, model):
+        # Readers snapshot model and source per call; the new source goes first
+        # so a request never pairs the refreshed model with stale features
+        self.predictor.feature_source = store if self.index is None else IndexedStore(store, self.index)
+        self.predictor.model = model
+
+    def _move(self, path, folder):
+        target = os.path.join(self.drop_dir, folder)
+        os.makedirs(target, exist_ok=True)
+        shutil.move(path, os.path.join(target, os.path.basename(path)))
+
+    def _save(self):
+        os.makedirs(self.state_dir, exist_ok=True)
+        with self._lock:
+            self.store.save(os.path.join(self.state_dir, STORE_SNAPSHOT_FILE))
+            self.stats.save(os.path.join(self.state_dir, RIDGE_STATS_FILE))
+            self.predictor.model.save(os.path.join(self.state_dir, COMPILED_MODEL_FILE))
+            state = {"base_version": self.base_model.version, "files": self.files, "rows": self.rows}
+        temporary = os.path.join(self.state_dir, STATE_FILE + ".tmp")
+        with open(temporary, "w") as f:
+            json.dump(state, f)
+        os.replace(temporary, os.path.join(self.state_dir, STATE_FILE))
+
+    def start(self):
+        """Poll the drop directory from a daemon thread"""
+
+        def run():
+            while not self._stop.is_set():
+                self.poll()
+                self._stop.wait(self.interval)
+
+        self._thread = threading.Thread(target=run, name="ingest", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1.0)
+
+    def stats_summary(self):
+        return {
+            "dropDir": self.drop_dir,
+            "files": self.files,
+            "rows": self.rows,
+            "failed": self.failed,
+            "lastError": self.last_error,
+            "lastIngest": self.last_ingest,
+            "samples": self.stats.samples,
+            "modelVersion": self.predictor.model.version,
+            "featureVersion": self.store.version,
+        }
+
+
+def initial_stats(model, model_dir=ARTIFACT_DIR):
+    """Ridge stats to continue `model` from
+
+    Training stats saved next to the model give exact updates; otherwise the
+    regression is anchored at the deployed coefficients.
+    """
+    path = os.path.join(model_dir, RIDGE_STATS_FILE)
+    if os.path.exists(path):
+        stats = RidgeStats.load(path)
+        if np.allclose(refit(model, stats).weights, model.weights):
+            return stats
+    return RidgeStats.anchored(model)
+
+
+def history_dir_from_env():
+    """NBA_HISTORY_DIR, else history/ when it exists; the live store is seeded from it"""
+    from history_store import HISTORY_DIR, MANIFEST_FILE
+
+    path = os.environ.get("NBA_HISTORY_DIR")
+    if path:
+        return path
+    return HISTORY_DIR if os.path.exists(os.path.join(HISTORY_DIR, MANIFEST_FILE)) else None
+
+
+_ingestor = None
+
+
+def get_ingestor():
+    """The background Ingestor started by start_from_env, if any"""
+    return _ingestor
+
+
+def start_from_env(predictor, model_dir=ARTIFACT_DIR):
+    """Start background ingest when NBA_INGEST_DIR is set (called once per process)"""
+    global _ingestor
+    drop_dir = os.environ.get("NBA_INGEST_DIR")
+    if not drop_dir or _ingestor is not None:
+        return _ingestor
+    interval = float(os.environ.get("NBA_INGEST_INTERVAL", DEFAULT_POLL_INTERVAL))
+    _ingestor = Ingestor(predictor, drop_dir, history_dir=history_dir_from_env(), interval=interval,
+                         stats=initial_stats(predictor.model, model_dir)).start()
+    return _ingestor
+
+
+def main(argv):
+    from predictor import Predictor, load_feature_source
+    from registry import deployed_path
+
+    if len(argv) < 2:
+        print(__doc__[__doc__.index("Usage:"):].rstrip())
+        return 1
+    path = deployed_path()
+    model = CompiledModel.load(path)
+    predictor = Predictor(model, load_feature_source(model))
+    ingestor = Ingestor(predictor, argv[1], history_dir=history_dir_from_env(),
+                        stats=initial_stats(model, os.path.dirname(path)))
+    ingested = ingestor.poll()
+    summary = ingestor.stats_summary()
+    print(f"Ingested {ingested} file(s), {summary['rows']} training rows so far; "
+          f"model {summary['modelVersion']}, {summary['failed']} failed")
+    return 1 if ingestor.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,196 @@
+"""
+Precomputed all-pairs matchup matrix
+With 30 teams a date has only 870 ordered home/away pairs, and a game's
+probability depends only on the two teams' decision values.  Building the
+matrix therefore takes one feature lookup per team per day (30 rows, not 870)
+and one broadcast subtraction:
+
+    probabilities[day, home, away] = calibration(d[day, home] - d[day, away])
+
+The Predictor reads it for single games and slates within its date range, an
+O(1) array read in place of the feature lookup and dot products.  A matrix is
+tied to the model and feature version it was built from; until the
+background builder catches up with a newer model or feature store, or with a
+new day, predictions fall back to the pipeline.
+
+Usage: python matchup_matrix.py [days]    (build once and report the timing)
+    NBA_MATCHUP_DAYS sets how many days after today are covered (default 7)
+    and NBA_MATCHUP_INTERVAL how often the builder checks for changes, in
+    seconds (0 disables the matrix)
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import date
+
+import numpy as np
+
+from teams import TEAMS
+
+TEAM_CODES = list(TEAMS.codes)
+DEFAULT_DAYS = 7
+DEFAULT_INTERVAL = 1.0
+
+
+class MatchupMatrix:
+    """Home-win probabilities for every ordered team pair on consecutive days"""
+
+    def __init__(self, model, feature_version, start_day, probabilities, build_seconds):
+        self.model = model
+        self.feature_version = feature_version
+        self.start_day = np.datetime64(start_day, "D")
+        self.probabilities = probabilities
+        self.probabilities.flags.writeable = False
+        self.build_seconds = build_seconds
+        self.built_at = time.time()
+
+    @classmethod
+    def build(cls, predictor, start=None, days=DEFAULT_DAYS):
+        """Score all pairs for `start` (default today) and the `days` days after it"""
+        started = time.perf_counter()
+        model, source = predictor.model, predictor.feature_source
+        feature_version = getattr(source, "version", "")
+        start_day = np.datetime64(date.today() if start is None else start, "D")
+        n_days, n_teams = days + 1, len(TEAM_CODES)
+        day_of_row = np.repeat(start_day + np.arange(n_days), n_teams)
+        rows = source.lookup(np.tile(TEAM_CODES, n_days), day_of_row)
+        decisions = model.decision(rows).reshape(n_days, n_teams)
+        probabilities = model.probability(decisions[:, :, None] - decisions[:, None, :])
+        return cls(model, feature_version, start_day, probabilities, time.perf_counter() - started)
+
+    @property
+    def days(self):
+        return self.probabilities.shape[0]
+
+    @property
+    def age(self):
+        return time.time() - self.built_at
+
+    def current(self, model, source):
+        """Whether the matrix was built from this model and the source's current features"""
+        return model is self.model and getattr(source, "version", "") == self.feature_version
+
+    def lookup(self, home_team, away_team, day):
+        """Home-win probability, or None outside the matrix's days and teams"""
+        offset = int((day - self.start_day).astype(np.int64))
+        home = TEAMS.find(home_team)
+        away = TEAMS.find(away_team)
+        if not 0 <= offset < self.days or home is None or away is None:
+            return None
+        return float(self.probabilities[offset, home, away])
+
+    def lookup_many(self, home, away, days):
+        """Home-win probabilities for arrays of games, or None unless all are covered"""
+        offsets = (days - self.start_day).astype(np.int64)
+        if offsets.size and (offsets.min() < 0 or offsets.max() >= self.days):
+            return None
+        try:
+            return self.probabilities[offsets, TEAMS.encode(home), TEAMS.encode(away)]
+        except KeyError:
+            return None
+
+    def stats(self):
+        return {
+            "modelVersion": self.model.version,
+            "featureVersion": self.feature_version,
+            "startDate": str(self.start_day),
+            "days": self.days,
+            "buildMs": round(self.build_seconds * 1000.0, 3),
+            "ageSeconds": round(self.age, 3),
+        }
+
+
+class MatrixBuilder:
+    """Rebuilds a Predictor's matchup matrix when its model, features or date change"""
+
+    def __init__(self, predictor, days=DEFAULT_DAYS, interval=DEFAULT_INTERVAL):
+        self.predictor = predictor
+        self.days = days
+        self.interval = interval
+        self.builds = 0
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """Rebuild if the predictor's matrix is stale; returns True after a rebuild"""
+        predictor = self.predictor
+        matrix = predictor.matchups
+        today = np.datetime64(date.today(), "D")
+        if matrix is not None and matrix.start_day == today and matrix.current(predictor.model,
+                                                                                 predictor.feature_source):
+            return False
+        try:
+            predictor.matchups = MatchupMatrix.build(predictor, today, self.days)
+        except Exception as e:
+            self.last_error = str(e)
+            return False
+        self.builds += 1
+        return True
+
+    def start(self):
+        """Build now, then keep the matrix current from a daemon thread"""
+        self.check()
+
+        def run():
+            while not self._stop.wait(self.interval):
+                self.check()
+
+        self._thread = threading.Thread(target=run, name="matchup-matrix", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1.0)
+
+    def stats(self):
+        predictor = self.predictor
+        matrix = predictor.matchups
+        summary = {"builds": self.builds, "lastError": self.last_error, "matrix": None, "current": False}
+        if matrix is not None:
+            summary["matrix"] = matrix.stats()
+            summary["current"] = matrix.current(predictor.model, predictor.feature_source)
+        return summary
+
+
+_builder = None
+
+
+def get_builder():
+    """The MatrixBuilder started by start_from_env, if any"""
+    return _builder
+
+
+def start_from_env(predictor):
+    """Keep a matchup matrix for `predictor` unless NBA_MATCHUP_INTERVAL is 0 (called once per process)"""
+    global _builder
+    interval = float(os.environ.get("NBA_MATCHUP_INTERVAL", DEFAULT_INTERVAL))
+    if interval <= 0 or _builder is not None:
+        return _builder
+    days = int(os.environ.get("NBA_MATCHUP_DAYS", DEFAULT_DAYS))
+    _builder = MatrixBuilder(predictor, days, interval).start()
+    return _builder
+
+
+def main(argv):
+    from predictor import CompiledModel, Predictor, load_feature_source
+    from registry import deployed_path
+
+    days = int(argv[1]) if len(argv) > 1 else DEFAULT_DAYS
+    model = CompiledModel.load(deployed_path())
+    predictor = Predictor(model, load_feature_source(model))
+    MatchupMatrix.build(predictor, days=days)  # first build pays for imports and page faults
+    matrix = MatchupMatrix.build(predictor, days=days)
+    pairs = matrix.probabilities.size - matrix.days * len(TEAMS)
+    print(f"Built {matrix.days} day(s) x {len(TEAMS)}x{len(TEAMS)} matchups "
+          f"({pairs} games) in {matrix.build_seconds * 1000.0:.2f} ms; model {model.version}, "
+          f"features {matrix.feature_version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
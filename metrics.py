@@ -0,0 +1,286 @@
+"""
+Latency spans for the prediction hot path
+Each span (feature lookup, scoring, cache, render, ...) feeds a log-linear
+histogram in the style of HdrHistogram: values below 2 * SUB_BUCKETS
+nanoseconds get exact buckets, and every power of two above that is split
+into SUB_BUCKETS linear buckets (about 6% relative error).  Every thread
+records into its own bucket list, so recording takes no lock.  Readers add
+up the threads' lists; once a thread exits, its counts are folded into a
+per-span total and its list is dropped, so Streamlit's thread per rerun
+does not pile up lists.
+
+    started = clock()
+    ...
+    started = mark("feature_lookup", started)   # record and restart
+    ...
+    mark("score", started)
+
+Recording costs well under a microsecond per span.  GET /metrics on
+server.py serves the histograms in the Prometheus text format, and the
+Streamlit app shows them in its sidebar when NBA_METRICS_PANEL=1.
+
+milestone() records one-off startup spans measured from STARTED, the first
+import of this module: first_paint and first_prediction in the app,
+predictor_ready once the artifacts are loaded.
+
+Usage: python metrics.py [calls]    (time predict_game and print the spans)
+    NBA_METRICS=0 turns recording off
+"""
+
+import os
+import sys
+import threading
+from time import perf_counter_ns as clock
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_BITS = 40  # ~18 minutes; longer spans land in the last bucket
+N_BUCKETS = (MAX_BITS - SUB_BUCKET_BITS + 1) * SUB_BUCKETS
+MAX_NANOS = (1 << MAX_BITS) - 1
+SUM, MAX = N_BUCKETS, N_BUCKETS + 1  # extra slots after the buckets
+
+# Bucket bounds exported to Prometheus, in seconds
+EXPORT_BOUNDS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUANTILES = (0.5, 0.9, 0.99)
+
+ENABLED = os.environ.get("NBA_METRICS", "1") != "0"
+STARTED = clock()  # the app's first script run, or server start
+
+_local = threading.local()
+_shards = {}  # span name -> [(thread, bucket list)] for the threads recording it
+_retired = {}  # span name -> counts of threads that have exited
+_shards_lock = threading.Lock()
+_milestones = {}  # startup milestone -> nanoseconds after STARTED
+
+
+def bucket_of(nanos):
+    """Histogram bucket holding a duration in nanoseconds"""
+    if nanos < 2 * SUB_BUCKETS:
+        return nanos if nanos > 0 else 0
+    if nanos > MAX_NANOS:
+        nanos = MAX_NANOS
+    shift = nanos.bit_length() - SUB_BUCKET_BITS - 1
+    return shift * SUB_BUCKETS + (nanos >> shift)
+
+
+def bucket_bounds(index):
+    """[lower, upper) nanoseconds covered by a bucket"""
+    if index < 2 * SUB_BUCKETS:
+        return index, index + 1
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index - shift * SUB_BUCKETS
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+def _shard(span):
+    """This thread's bucket list for a span, registered on first use"""
+    try:
+        shards = _local.shards
+    except AttributeError:
+        shards = _local.shards = {}
+    counts = shards[span] = [0] * (N_BUCKETS + 2)
+    thread = threading.current_thread()
+    with _shards_lock:
+        _retire_exited()
+        _shards.setdefault(span, []).append((thread, counts))
+    return counts
+
+
+def _fold(total, counts):
+    """Add one bucket list into another"""
+    total[:SUM + 1] = [a + b for a, b in zip(total[:SUM + 1], counts[:SUM + 1])]
+    total[MAX] = max(total[MAX], counts[MAX])
+
+
+def _retire_exited():
+    """Fold the lists of exited threads into _retired (call with _shards_lock held)"""
+    for span, shards in _shards.items():
+        if all(thread.is_alive() for thread, _ in shards):
+            continue
+        live = []
+        for thread, counts in shards:
+            if thread.is_alive():
+                live.append((thread, counts))
+            else:
+                _fold(_retired.setdefault(span, [0] * (N_BUCKETS + 2)), counts)
+        shards[:] = live
+
+
+def record(span, nanos):
+    """Add one duration to a span's histogram"""
+    if not ENABLED:
+        return
+    try:
+        counts = _local.shards[span]
+    except (AttributeError, KeyError):
+        counts = _shard(span)
+    # bucket_of(), inlined: this runs several times per prediction
+    shift = nanos.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        counts[nanos if nanos > 0 else 0] += 1
+    elif nanos <= MAX_NANOS:
+        counts[shift * SUB_BUCKETS + (nanos >> shift)] += 1
+    else:
+        counts[N_BUCKETS - 1] += 1
+    counts[SUM] += nanos
+    if nanos > counts[MAX]:
+        counts[MAX] = nanos
+
+
+def mark(span, started):
+    """Record the time since `started` (a clock() reading) and return the current clock()"""
+    now = clock()
+    record(span, now - started)
+    return now
+
+
+def milestone(name):
+    """Record the time from STARTED to the first time `name` is reached; later calls do nothing"""
+    if name in _milestones:
+        return
+    with _shards_lock:
+        if name in _milestones:
+            return
+        _milestones[name] = clock() - STARTED
+    record(name, _milestones[name])
+
+
+def startup_times():
+    """Milliseconds from STARTED to each startup milestone reached so far"""
+    return {name: round(nanos / 1e6, 3) for name, nanos in _milestones.items()}
+
+
+class span:
+    """Context manager timing a block, for code off the per-prediction path"""
+
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = clock()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, clock() - self.started)
+        return False
+
+
+def enable(enabled=True):
+    global ENABLED
+    ENABLED = bool(enabled)
+
+
+def reset():
+    """Zero every histogram (threads keep their lists)"""
+    with _shards_lock:
+        _retired.clear()
+        for shards in _shards.values():
+            for _, counts in shards:
+                counts[:] = [0] * len(counts)
+
+
+class Snapshot:
+    """One span's histogram summed over all threads"""
+
+    def __init__(self, name, counts):
+        self.name = name
+        self.buckets = counts[:N_BUCKETS]
+        self.count = sum(self.buckets)
+        self.sum = counts[SUM]
+        self.max = counts[MAX]
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile, in nanoseconds"""
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(bucket_bounds(index)[1] - 1, self.max)
+        return self.max
+
+    def cumulative(self, bounds=EXPORT_BOUNDS):
+        """Counts at or below each bound in seconds (bucket upper bounds decide)"""
+        totals = []
+        index, seen = 0, 0
+        for bound in bounds:
+            limit = bound * 1e9
+            while index < N_BUCKETS and bucket_bounds(index)[1] - 1 <= limit:
+                seen += self.buckets[index]
+                index += 1
+            totals.append(seen)
+        return totals
+
+    def summary(self):
+        """Count, mean and quantiles in microseconds"""
+        mean = self.sum / self.count / 1000.0 if self.count else 0.0
+        summary = {"span": self.name, "count": self.count, "meanUs": round(mean, 2)}
+        for q in QUANTILES:
+            summary[f"p{round(q * 100)}Us"] = round(self.quantile(q) / 1000.0, 2)
+        summary["maxUs"] = round(self.max / 1000.0, 2)
+        return summary
+
+
+def snapshot():
+    """Snapshot of every span recorded so far, by name"""
+    with _shards_lock:
+        _retire_exited()
+        shards = {name: [counts for _, counts in entries] for name, entries in _shards.items()}
+        totals = {name: list(counts) for name, counts in _retired.items()}
+    merged = {}
+    for name in sorted(set(shards) | set(totals)):
+        counts = totals.get(name, [0] * (N_BUCKETS + 2))
+        for shard in shards.get(name, ()):
+            _fold(counts, list(shard))  # one consistent-enough copy while its thread keeps recording
+        merged[name] = Snapshot(name, counts)
+    return merged
+
+
+def summaries():
+    return [histogram.summary() for histogram in snapshot().values()]
+
+
+def prometheus_text():
+    """Every span as one Prometheus histogram family labelled by span"""
+    lines = [
+        "# HELP nba_span_seconds Time spent in each stage of the prediction flow",
+        "# TYPE nba_span_seconds histogram",
+    ]
+    for name, histogram in snapshot().items():
+        for bound, total in zip(EXPORT_BOUNDS, histogram.cumulative()):
+            lines.append(f'nba_span_seconds_bucket{{span="{name}",le="{bound:g}"}} {total}')
+        lines.append(f'nba_span_seconds_bucket{{span="{name}",le="+Inf"}} {histogram.count}')
+        lines.append(f'nba_span_seconds_sum{{span="{name}"}} {histogram.sum / 1e9:.9f}')
+        lines.append(f'nba_span_seconds_count{{span="{name}"}} {histogram.count}')
+    return "\n".join(lines) + "\n"
+
+
+def main(argv):
+    from datetime import date
+
+    # Run as a script this module is __main__; the predictor records into `metrics`
+    from metrics import summaries
+    from predictor import get_predictor
+    from teams import TEAMS
+
+    calls = int(argv[1]) if len(argv) > 1 else 10_000
+    predictor = get_predictor()
+    codes = TEAMS.codes
+    for i in range(calls):
+        home, away = codes[i % len(codes)], codes[(i * 7 + 1) % len(codes)]
+        if home != away:
+            predictor.predict_game(home, away, date.today())
+    for summary in summaries():
+        print("  ".join(f"{key} {value}" for key, value in summary.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,442 @@
+"""
+Inference engine for the NBA Game Predictor
+Loads the deployed model.npz once per process (registry.py swaps in new
+versions) and scores games with a single dot product; scikit-learn and pickle
+are only needed by export_model.py.  preload() starts that load on a
+background thread, so the app can render before the artifacts are in memory
+"""
+
+import os
+import sys
+import threading
+from datetime import date, datetime
+
+import numpy as np
+
+from cache import cache_from_env, prediction_key
+from calibration import Calibration
+from metrics import clock, mark, milestone, span
+
+ARTIFACT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+COMPILED_MODEL_FILE = "model.npz"
+
+
+class ArtifactError(ValueError):
+    """Raised when the model artifacts are missing or disagree with each other"""
+
+
+def _frozen(values):
+    """Read-only float64 copy, so a model can be shared by threads without locking
+
+    Arrays that are already read-only float64, such as shared_model.py's
+    memory maps, are used as they are.
+    """
+    if isinstance(values, np.ndarray) and values.dtype == np.float64 and not values.flags.writeable:
+        return values
+    array = np.array(values, dtype=np.float64)
+    array.flags.writeable = False
+    return array
+
+
+class CompiledModel:
+    """Selector, MinMaxScaler and RidgeClassifier folded into one weight vector
+
+    `calibration` maps the home-minus-away decision margin to a home-win
+    probability (see calibration.py).
+    """
+
+    ARRAYS = ("weights", "scale", "offset", "coef", "baseline")
+
+    def __init__(self, feature_names, weights, bias, scale, offset, coef, baseline, version, calibration=None):
+        self.feature_names = [str(name) for name in feature_names]
+        self.weights = _frozen(weights)
+        self.bias = float(bias)
+        self.scale = _frozen(scale)
+        self.offset = _frozen(offset)
+        self.coef = _frozen(coef)
+        self.baseline = _frozen(baseline)
+        self.version = str(version)
+        self.calibration = Calibration() if calibration is None else calibration
+        self.contribution_offset = _frozen(self.coef * self.offset)
+
+        n_features = len(self.feature_names)
+        if len(set(self.feature_names)) != n_features:
+            raise ArtifactError("Compiled model contains duplicate feature names")
+        for name in self.ARRAYS:
+            if getattr(self, name).shape != (n_features,):
+                raise ArtifactError(
+                    f"Compiled model '{name}' has shape {getattr(self, name).shape}, "
+                    f"expected ({n_features},)"
+                )
+        if not np.all(np.isfinite(self.weights)) or not np.isfinite(self.bias):
+            raise ArtifactError("Compiled model weights must be finite")
+
+    def decision(self, features):
+        """Ridge decision value for each row of raw (unscaled) team features"""
+        return features @ self.weights + self.bias
+
+    def contributions(self, features):
+        """Each feature's term coef_j * scaled x_j of the decision value, for rows of raw features
+
+        A row's terms plus the Ridge intercept add up to its decision value.
+        """
+        return features * self.weights + self.contribution_offset
+
+    def probability(self, margin):
+        """Home-win probability for home-minus-away decision margins"""
+        return self.calibration(margin)
+
+    def save(self, path):
+        # Write then rename, so a process watching the file never loads half of it
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            np.savez(
+                f,
+                feature_names=np.array(self.feature_names),
+                bias=np.array(self.bias),
+                version=np.array(self.version),
+                **{name: getattr(self, name) for name in self.ARRAYS},
+                **self.calibration.to_arrays(),
+            )
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            raise ArtifactError(f"Missing compiled model: {path} (run export_model.py)")
+        with span("artifact_load"), np.load(path, allow_pickle=False) as data:
+            missing = {"feature_names", "bias", "version", *cls.ARRAYS} - set(data.files)
+            if missing:
+                raise ArtifactError(f"Compiled model {path} is missing {sorted(missing)}")
+            return cls(
+                feature_names=data["feature_names"].tolist(),
+                bias=data["bias"],
+                version=data["version"],
+                calibration=Calibration.from_arrays(data),
+                **{name: data[name] for name in cls.ARRAYS},
+            )
+
+
+class BaselineFeatures:
+    """Feature source that returns the midpoint of the training range for every team"""
+
+    version = "baseline"
+
+    def __init__(self, row):
+        self.row = np.asarray(row, dtype=np.float64)
+
+    def lookup(self, teams, dates):
+        return np.broadcast_to(self.row, (len(teams), self.row.shape[0]))
+
+
+class Predictor:
+    """Scores games with the compiled scaler -> selector -> RidgeClassifier pipeline"""
+
+    def __init__(self, model, feature_source=None, cache=None):
+        self.model = model
+        self.cache = cache
+        self.matchups = None  # MatchupMatrix kept current by matchup_matrix.py
+        if feature_source is None:
+            feature_source = BaselineFeatures(model.baseline)
+        source_names = getattr(feature_source, "feature_names", None)
+        if source_names is not None and list(source_names) != model.feature_names:
+            raise ArtifactError("Feature source columns do not match the model's feature order")
+        self.feature_source = feature_source
+
+    # The prediction methods read self.model, self.feature_source, self.cache and
+    # self.matchups exactly once into locals and never write shared state, so any number of
+    # Streamlit sessions can call them concurrently, and a swapped-in model only
+    # affects calls that start after the swap.
+
+    def home_win_probability(self, home_features, away_features, model=None):
+        model = self.model if model is None else model
+        return model.probability(model.decision(home_features) - model.decision(away_features))
+
+    def predict_game(self, home_team, away_team, game_date, explain=0):
+        """Predict a single game and return the dict rendered by the UI
+
+        explain=k adds each side's k largest feature contributions (see
+        _explanation_columns).  The probability still comes from the matchup
+        matrix or the cache when they have it; the contributions are worked
+        out from the feature rows afterwards and never cached.
+        """
+        started = stage = clock()
+        model, source, cache, matchups = self.model, self.feature_source, self.cache, self.matchups
+        game_date = _as_date(game_date)
+        day = np.datetime64(game_date, "D")
+        result = rows = key = None
+        if matchups is not None and matchups.current(model, source):
+            home_probability = matchups.lookup(home_team, away_team, day)
+            stage = mark("matrix_lookup", stage)
+            if home_probability is not None:
+                result = _result_dict(home_team, away_team, game_date, home_probability, model.version)
+
+        if result is None and cache is not None:
+            feature_version = getattr(source, "version", "")
+            key = prediction_key(home_team, away_team, game_date, model.version, feature_version)
+            result = cache.get(key)
+            stage = mark("cache_get", stage)
+
+        if result is None:
+            rows = source.lookup([home_team, away_team], np.array([day, day]))
+            stage = mark("feature_lookup", stage)
+            # Scaling and feature selection are folded into model.weights (export_model.py)
+            home_probability = float(self.home_win_probability(rows[0], rows[1], model))
+            result = _result_dict(home_team, away_team, game_date, home_probability, model.version)
+            stage = mark("score", stage)
+            if key is not None:
+                cache.set(key, result)
+                stage = mark("cache_set", stage)
+
+        if explain:
+            if rows is None:
+                rows = source.lookup([home_team, away_team], np.array([day, day]))
+            # Cached dicts are shared between callers, so explanations go on a copy
+            result = dict(result)
+            for name, values in _explanation_columns(model, rows, 1, explain).items():
+                result[name] = values[0].tolist()
+            mark("explain", stage)
+        mark("predict_game", started)
+        return result
+
+    def predict_games(self, games, explain=0):
+        """Score a whole slate in one pass and return a dict of result columns
+
+        `games` is a DataFrame with home_team, away_team and date columns, or
+        any sequence of (home_team, away_team, date) rows.  explain=k adds
+        (games, k) columns of each side's largest feature contributions; the
+        probabilities still come from the matchup matrix when it covers the
+        slate, and the feature rows are looked up only for the explanations.
+        """
+        started = clock()
+        model, source, matchups = self.model, self.feature_source, self.matchups
+        home, away, days = _game_columns(games)
+        rows, home_probability = self._score(model, source, matchups, home, away, days)
+        result = _result_columns(home, away, days, home_probability, model.version)
+        if explain:
+            stage = clock()
+            if rows is None:
+                rows = source.lookup(np.concatenate([home, away]), np.concatenate([days, days]))
+            result.update(_explanation_columns(model, rows, home.shape[0], explain))
+            mark("explain_many", stage)
+        mark("predict_games", started)
+        return result
+
+    def home_probabilities(self, games):
+        """Unrounded home-win probability of each game (same input as predict_games)"""
+        model, source, matchups = self.model, self.feature_source, self.matchups
+        return self._score(model, source, matchups, *_game_columns(games))[1]
+
+    def _score(self, model, source, matchups, home, away, days):
+        """(feature rows, home-win probabilities); rows is None when the matchup matrix answered"""
+        stage = clock()
+        if matchups is not None and matchups.current(model, source):
+            home_probability = matchups.lookup_many(home, away, days)
+            stage = mark("matrix_lookup_many", stage)
+            if home_probability is not None:
+                return None, home_probability
+        return self._pipeline(model, source, home, away, days, stage)
+
+    @staticmethod
+    def _pipeline(model, source, home, away, days, stage):
+        """Feature rows of the home then the away teams, and the home-win probabilities"""
+        # One feature lookup and one matrix-vector product for both sides
+        n_games = home.shape[0]
+        rows = source.lookup(np.concatenate([home, away]), np.concatenate([days, days]))
+        stage = mark("feature_lookup_many", stage)
+        decisions = model.decision(rows)
+        home_probability = model.probability(decisions[:n_games] - decisions[n_games:])
+        mark("score_many", stage)
+        return rows, home_probability
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+def _game_columns(games):
+    """Split games into home, away and datetime64[D] date arrays"""
+    if hasattr(games, "columns"):
+        home = games["home_team"].to_numpy()
+        away = games["away_team"].to_numpy()
+        dates = games["date"].to_numpy()
+    else:
+        rows = list(games)
+        if not rows:
+            home = away = dates = []
+        else:
+            home, away, dates = zip(*rows)
+    home = np.asarray(home, dtype=str)
+    away = np.asarray(away, dtype=str)
+    days = np.asarray(dates, dtype="datetime64[D]")
+    if not home.shape == away.shape == days.shape:
+        raise ValueError("home_team, away_team and date columns must have the same length")
+    return home, away, days
+
+
+def _result_dict(home_team, away_team, game_date, home_probability, model_version):
+    home_wins = home_probability >= 0.5
+    winner_probability = home_probability if home_wins else 1.0 - home_probability
+    return {
+        'predictedWinner': home_team if home_wins else away_team,
+        'winProbability': round(100.0 * winner_probability, 1),
+        'confidence': round(100.0 * abs(2.0 * home_probability - 1.0), 1),
+        'homeTeam': home_team,
+        'awayTeam': away_team,
+        'gameDate': game_date.strftime("%Y-%m-%d"),
+        'modelVersion': model_version
+    }
+
+
+def _result_columns(home, away, days, home_probability, model_version):
+    # A season has a few hundred distinct dates, so format each one only once
+    unique_days, day_index = np.unique(days, return_inverse=True)
+    home_wins = home_probability >= 0.5
+    winner_probability = np.where(home_wins, home_probability, 1.0 - home_probability)
+    return {
+        'predictedWinner': np.where(home_wins, home, away),
+        'winProbability': np.round(100.0 * winner_probability, 1),
+        'confidence': np.round(100.0 * np.abs(2.0 * home_probability - 1.0), 1),
+        'homeTeam': home,
+        'awayTeam': away,
+        'gameDate': np.datetime_as_string(unique_days, unit="D")[day_index],
+        'modelVersion': np.full(home.shape, model_version)
+    }
+
+
+def _explanation_columns(model, rows, n_games, k):
+    """Top-k contributing features of each side, largest magnitude first
+
+    `rows` holds the home teams' features followed by the away teams'.  A
+    term pushes its own side's decision value up when positive; the home
+    side wins when its terms add up to more than the away side's.
+    """
+    terms = model.contributions(rows)
+    magnitude = np.abs(terms)
+    n_features = terms.shape[1]
+    k = min(int(k), n_features)
+    if k < n_features:
+        top = np.argpartition(magnitude, n_features - k, axis=1)[:, n_features - k:]
+    else:
+        top = np.broadcast_to(np.arange(n_features), terms.shape)
+    # Sort only the k chosen columns, largest last, then reverse
+    order = np.argsort(np.take_along_axis(magnitude, top, axis=1), axis=1)[:, ::-1]
+    top = np.take_along_axis(top, order, axis=1)
+    names = np.array(model.feature_names)[top]
+    values = np.round(np.take_along_axis(terms, top, axis=1), 4)
+    return {
+        'homeTopFeatures': names[:n_games],
+        'homeTopContributions': values[:n_games],
+        'awayTopFeatures': names[n_games:],
+        'awayTopContributions': values[n_games:]
+    }
+
+
+def feature_index_path(artifact_dir=ARTIFACT_DIR):
+    """feature_index.npz the serving processes read, whichever model version is deployed"""
+    from feature_index import FEATURE_INDEX_FILE
+
+    return os.path.join(artifact_dir, FEATURE_INDEX_FILE)
+
+
+def load_feature_source(model, artifact_dir=ARTIFACT_DIR):
+    """Point-in-time feature index if one has been built, else None for the baseline"""
+    from feature_index import FeatureIndex
+
+    path = feature_index_path(artifact_dir)
+    if not os.path.exists(path):
+        return None
+    with span("feature_index_load"):
+        return FeatureIndex.load(path, initial_row=model.baseline)
+
+
+def split_results(columns):
+    """Turn predict_games columns back into one result dict per game"""
+    names = list(columns)
+    values = [columns[name].tolist() for name in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+_predictor = None
+_predictor_lock = threading.Lock()
+
+
+def get_predictor():
+    """Return the process-wide Predictor, loading the artifacts on first use"""
+    global _predictor
+    if _predictor is None:
+        with _predictor_lock:
+            if _predictor is None:
+                from ingest import start_from_env as start_ingest
+                from registry import deployed_path, start_from_env as start_registry
+                from shared_model import (
+                    attach,
+                    shared_dir_from_env,
+                    start_from_env as start_shared,
+                    wait_for_snapshot,
+                    wait_from_env,
+                )
+
+                shared_dir = shared_dir_from_env()
+                if shared_dir is not None:
+                    # A worker: the loader process owns reloads, and ingest is unavailable
+                    if os.environ.get("NBA_INGEST_DIR"):
+                        print("NBA_INGEST_DIR is ignored in shared mode (NBA_SHARED_DIR is set)", file=sys.stderr)
+                    snapshot = wait_for_snapshot(shared_dir, wait_from_env())
+                    model, feature_source, snapshot = attach(shared_dir, snapshot)
+                    predictor = Predictor(model, feature_source, cache_from_env())
+                    start_shared(predictor, snapshot)
+                else:
+                    path = deployed_path()
+                    model = CompiledModel.load(path)
+                    predictor = Predictor(model, load_feature_source(model), cache_from_env())
+                    start_ingest(predictor, os.path.dirname(path))
+                    start_registry(predictor, path)
+                from matchup_matrix import start_from_env as start_matchups
+
+                start_matchups(predictor)
+                _predictor = predictor
+                milestone("predictor_ready")
+    return _predictor
+
+
+_preload_thread = None
+_preload_lock = threading.Lock()
+
+
+def preload():
+    """Load the Predictor on a daemon thread so the first prediction finds it ready
+
+    Cheap to call on every Streamlit rerun: only the first call starts a
+    thread.  A failed load is reported and left for get_predictor() to retry
+    on the request path.
+    """
+    global _preload_thread
+    if _predictor is not None or _preload_thread is not None:
+        return
+    with _preload_lock:
+        if _preload_thread is None:
+            # Import what the load needs on this thread: Streamlit inserts and
+            # removes sys.path[0] around every script run, and an import on
+            # another thread racing that can miss this directory
+            import feature_index, ingest, matchup_matrix, registry, shared_model  # noqa: F401
+
+            _preload_thread = threading.Thread(target=_load_in_background, name="predictor-preload", daemon=True)
+            _preload_thread.start()
+
+
+def _load_in_background():
+    try:
+        get_predictor()
+    except Exception as e:
+        print(f"Preloading the model failed, retrying on the first prediction: {e}", file=sys.stderr)
+
+
+def predict_games(games, explain=0):
+    """Score a slate of games with the process-wide Predictor (see Predictor.predict_games)"""
+    return get_predictor().predict_games(games, explain)
@@ -0,0 +1,261 @@
+"""
+Model registry with zero-downtime hot reload
+train.py writes each model to artifacts/<version>/; artifacts/CURRENT names
+the one to serve (without it, the model.npz next to app.py is served).  A
+background thread polls that file's path, size and mtime, loads and validates
+a changed model off the request path, then swaps it into the Predictor with a
+single attribute assignment.  Predictions read predictor.model once per call,
+so in-flight requests finish on the old version and later ones use the new
+one; every result carries the modelVersion that produced it.  A model that
+fails validation is logged and skipped, and the old one keeps serving.
+
+Usage: python registry.py                   (list versions, * marks the deployed one)
+       python registry.py deploy <version>  (serve artifacts/<version>/)
+       python registry.py deploy .          (serve the model.npz next to app.py)
+    Tools that derive a model from the deployed one (calibration.py) write
+    it as a new version with add_version() and deploy that
+    NBA_MODEL_RELOAD_INTERVAL sets the poll period in seconds (0 disables reloads)
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from predictor import ARTIFACT_DIR, COMPILED_MODEL_FILE, ArtifactError, CompiledModel
+
+ARTIFACTS_DIR = os.path.join(ARTIFACT_DIR, "artifacts")
+CURRENT_FILE = "CURRENT"
+TRAINING_INFO_FILE = "training.json"
+DEFAULT_RELOAD_INTERVAL = 10.0
+HISTORY_LENGTH = 10
+
+# What train.py writes next to model.npz, carried over to derived versions
+VERSION_FILES = ("features.pkl", "feature_selector.pkl", "scaler.pkl", "model.pkl", "ridge_stats.npz")
+
+
+def deployed_path(artifacts_dir=ARTIFACTS_DIR, root_dir=ARTIFACT_DIR):
+    """model.npz that should be serving: artifacts/<CURRENT>/ if set, else the root one"""
+    try:
+        with open(os.path.join(artifacts_dir, CURRENT_FILE)) as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        version = ""
+    if version and version != ".":
+        return os.path.join(artifacts_dir, version, COMPILED_MODEL_FILE)
+    return os.path.join(root_dir, COMPILED_MODEL_FILE)
+
+
+def deploy(version, artifacts_dir=ARTIFACTS_DIR):
+    """Point CURRENT at artifacts/<version>/ ("." for the root model); running apps pick it up"""
+    if version != ".":
+        load_model(os.path.join(artifacts_dir, version, COMPILED_MODEL_FILE))
+    os.makedirs(artifacts_dir, exist_ok=True)
+    temporary = os.path.join(artifacts_dir, CURRENT_FILE + ".tmp")
+    with open(temporary, "w") as f:
+        f.write(version + "\n")
+    os.replace(temporary, os.path.join(artifacts_dir, CURRENT_FILE))
+
+
+def add_version(model, based_on, info=None, artifacts_dir=ARTIFACTS_DIR):
+    """Write model to artifacts/<model.version>/ and return that directory
+
+    The pickles, Ridge statistics and training.json of the based_on directory
+    are copied along; `info` is merged into training.json.  Like train.py,
+    the directory is assembled under a scratch name and renamed into place.
+    """
+    final = os.path.join(artifacts_dir, model.version)
+    if os.path.exists(os.path.join(final, COMPILED_MODEL_FILE)):
+        return final
+    os.makedirs(artifacts_dir, exist_ok=True)
+    scratch = tempfile.mkdtemp(prefix=".version-", dir=artifacts_dir)
+    try:
+        for name in VERSION_FILES:
+            if os.path.exists(os.path.join(based_on, name)):
+                shutil.copy2(os.path.join(based_on, name), scratch)
+        training = {}
+        if os.path.exists(os.path.join(based_on, TRAINING_INFO_FILE)):
+            with open(os.path.join(based_on, TRAINING_INFO_FILE)) as f:
+                training = json.load(f)
+        with open(os.path.join(scratch, TRAINING_INFO_FILE), "w") as f:
+            json.dump(dict(training, **(info or {}), version=model.version), f, indent=2)
+        model.save(os.path.join(scratch, COMPILED_MODEL_FILE))
+        os.rename(scratch, final)
+    except BaseException:
+        shutil.rmtree(scratch, ignore_errors=True)
+        raise
+    return final
+
+
+def versions(artifacts_dir=ARTIFACTS_DIR):
+    """Complete version directories under artifacts_dir, oldest first"""
+    if not os.path.isdir(artifacts_dir):
+        return []
+    found = [
+        name for name in os.listdir(artifacts_dir)
+        if not name.startswith(".") and os.path.exists(os.path.join(artifacts_dir, name, COMPILED_MODEL_FILE))
+    ]
+    return sorted(found, key=lambda name: os.path.getmtime(os.path.join(artifacts_dir, name, COMPILED_MODEL_FILE)))
+
+
+def load_model(path, feature_source=None):
+    """Load a compiled model and check it can serve next to feature_source"""
+    model = CompiledModel.load(path)
+    source_names = getattr(feature_source, "feature_names", None)
+    if source_names is not None and list(source_names) != model.feature_names:
+        raise ArtifactError(f"{path} does not match the feature source's columns")
+    for name in CompiledModel.ARRAYS:
+        if not np.all(np.isfinite(getattr(model, name))):
+            raise ArtifactError(f"{path} has non-finite '{name}' values")
+    # Score one row so the first real request doesn't pay for a cold model
+    if not np.isfinite(model.decision(model.baseline)):
+        raise ArtifactError(f"{path} produces a non-finite decision value")
+    return model
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+class ModelRegistry:
+    """Watches the deployed model and swaps new versions into a Predictor"""
+
+    def __init__(self, predictor, path=None, artifacts_dir=ARTIFACTS_DIR, root_dir=ARTIFACT_DIR,
+                 interval=DEFAULT_RELOAD_INTERVAL):
+        self.predictor = predictor
+        self.artifacts_dir = artifacts_dir
+        self.root_dir = root_dir
+        self.interval = interval
+        # The file the predictor's current model came from
+        path = deployed_path(artifacts_dir, root_dir) if path is None else path
+        self.path = path
+        self._signature = _signature(path)
+        self._rejected = None
+        self.reloads = 0
+        self.failures = 0
+        self.last_error = None
+        self.history = deque([(predictor.model.version, path, time.time())], maxlen=HISTORY_LENGTH)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """Reload if the deployed model changed; returns True when a new model was swapped in"""
+        path = deployed_path(self.artifacts_dir, self.root_dir)
+        signature = _signature(path)
+        if signature is None or signature in (self._signature, self._rejected):
+            return False
+        try:
+            model = load_model(path, self.predictor.feature_source)
+        except Exception as e:
+            if _signature(path) == signature:
+                # Not a file caught mid-write: skip it until it changes again
+                self._rejected = signature
+                self.failures += 1
+                self.last_error = f"{path}: {e}"
+                print(f"Model reload skipped, still serving {self.predictor.model.version}: {e}",
+                      file=sys.stderr)
+            return False
+        if _signature(path) != signature:
+            return False  # replaced while loading; the next poll loads the newer file
+
+        self._swap(model, os.path.dirname(path))
+        self.path = path
+        self._signature = signature
+        self.reloads += 1
+        self.history.append((model.version, path, time.time()))
+        return True
+
+    def _swap(self, model, model_dir):
+        from ingest import get_ingestor
+
+        ingestor = get_ingestor()
+        if ingestor is not None and ingestor.predictor is self.predictor:
+            # Ingest keeps refitting, so it has to continue from the new model
+            ingestor.rebase(model, model_dir)
+        else:
+            self.predictor.model = model
+
+    def start(self):
+        """Poll for new versions from a daemon thread"""
+
+        def run():
+            while not self._stop.wait(self.interval):
+                self.check()
+
+        self._thread = threading.Thread(target=run, name="model-registry", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1.0)
+
+    def stats(self):
+        return {
+            "modelVersion": self.predictor.model.version,
+            "path": self.path,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "lastError": self.last_error,
+            "history": [
+                {"version": version, "path": path, "deployedAt": deployed_at}
+                for version, path, deployed_at in self.history
+            ],
+        }
+
+
+_registry = None
+
+
+def get_registry():
+    """The ModelRegistry started by start_from_env, if any"""
+    return _registry
+
+
+def start_from_env(predictor, path=None):
+    """Watch for new model versions unless NBA_MODEL_RELOAD_INTERVAL is 0 (called once per process)"""
+    global _registry
+    interval = float(os.environ.get("NBA_MODEL_RELOAD_INTERVAL", DEFAULT_RELOAD_INTERVAL))
+    if interval <= 0 or _registry is not None:
+        return _registry
+    _registry = ModelRegistry(predictor, path, interval=interval).start()
+    return _registry
+
+
+def main(argv):
+    if len(argv) > 2 and argv[1] == "deploy":
+        deploy(argv[2])
+        print(f"Deployed {argv[2]}; running apps switch within {DEFAULT_RELOAD_INTERVAL:g}s by default")
+        return 0
+    if len(argv) > 1:
+        print(__doc__[__doc__.index("Usage:"):].rstrip())
+        return 1
+
+    current = deployed_path()
+    root = os.path.join(ARTIFACT_DIR, COMPILED_MODEL_FILE)
+    print(f"{'*' if current == root else ' '} .  {root}")
+    for version in versions():
+        path = os.path.join(ARTIFACTS_DIR, version, COMPILED_MODEL_FILE)
+        info_path = os.path.join(ARTIFACTS_DIR, version, TRAINING_INFO_FILE)
+        detail = ""
+        if os.path.exists(info_path):
+            with open(info_path) as f:
+                info = json.load(f)
+            detail = f"  trained {info.get('trained_at', '?')} on {info.get('samples', '?')} team-games"
+        print(f"{'*' if current == path else ' '} {version}{detail}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
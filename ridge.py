@@ -0,0 +1,132 @@
+"""
+Ridge regression from sufficient statistics
+RidgeClassifier fits a ridge regression to {-1, +1} targets.  Keeping only
+ZᵀZ and Zᵀy for Z = [scaled features, 1] (a 41×41 matrix and a 41-vector)
+lets new games be folded in and the model re-solved in microseconds, without
+revisiting the rows it was trained on.
+
+With stats accumulated over the training rows and a zero anchor, solve()
+reproduces scikit-learn's coef_ and intercept_ (the intercept is left
+unpenalized, which is what centering does).  A model whose training rows are
+gone can instead be anchored at its own coefficients: the penalty pulls
+towards them rather than towards zero, so no new data means no change, and
+the anchor counts as much as `anchor_rows` earlier games would.
+"""
+
+import hashlib
+
+import numpy as np
+
+from predictor import CompiledModel
+
+RIDGE_STATS_FILE = "ridge_stats.npz"
+
+# By default an anchored model weighs as much as one season of team-games
+DEFAULT_ANCHOR_ROWS = 82 * 30
+
+# MinMax-scaled features spread over [0, 1]; a uniform spread has variance 1/12,
+# which is what one row adds to a coefficient's diagonal of the centered ZᵀZ
+SCALED_FEATURE_VARIANCE = 1.0 / 12.0
+
+
+class RidgeStats:
+    """Running ZᵀZ / Zᵀy for ridge regression with an intercept"""
+
+    def __init__(self, n_features, alpha=1.0, anchor=None, anchor_intercept=None, anchor_rows=0):
+        self.n_features = n_features
+        self.alpha = float(alpha)
+        self.zz = np.zeros((n_features + 1, n_features + 1))
+        self.zy = np.zeros(n_features + 1)
+        self.anchor = np.zeros(n_features) if anchor is None else np.asarray(anchor, dtype=np.float64)
+        # None leaves the intercept unpenalized, as scikit-learn does
+        self.anchor_intercept = None if anchor_intercept is None else float(anchor_intercept)
+        self.anchor_rows = float(anchor_rows)
+
+    @classmethod
+    def anchored(cls, model, alpha=1.0, anchor_rows=DEFAULT_ANCHOR_ROWS):
+        """Empty stats that solve to the compiled model's own Ridge coefficients"""
+        intercept = model.bias - float(model.coef @ model.offset)
+        return cls(len(model.feature_names), alpha, model.coef, intercept, anchor_rows)
+
+    @property
+    def samples(self):
+        return int(round(self.zz[-1, -1]))
+
+    def update(self, scaled, won):
+        """Add rows of scaled features with 0/1 win labels"""
+        scaled = np.atleast_2d(np.asarray(scaled, dtype=np.float64))
+        target = 2.0 * np.asarray(won, dtype=np.float64).reshape(-1) - 1.0
+        z = np.hstack([scaled, np.ones((scaled.shape[0], 1))])
+        self.zz += z.T @ z
+        self.zy += z.T @ target
+
+    def copy(self):
+        stats = RidgeStats(self.n_features, self.alpha, self.anchor, self.anchor_intercept, self.anchor_rows)
+        stats.zz = self.zz.copy()
+        stats.zy = self.zy.copy()
+        return stats
+
+    def merge(self, other):
+        self.zz += other.zz
+        self.zy += other.zy
+
+    def solve(self):
+        """(coef, intercept) of the penalized least-squares fit"""
+        penalty = np.full(self.n_features + 1, self.alpha + self.anchor_rows * SCALED_FEATURE_VARIANCE)
+        prior = np.append(self.anchor, 0.0)
+        if self.anchor_intercept is None:
+            penalty[-1] = 0.0
+        else:
+            penalty[-1] = max(self.anchor_rows, 1.0)
+            prior[-1] = self.anchor_intercept
+        if self.samples == 0 and self.anchor_intercept is None:
+            return self.anchor.copy(), 0.0
+        solution = np.linalg.solve(self.zz + np.diag(penalty), self.zy + penalty * prior)
+        return solution[:-1], float(solution[-1])
+
+    def save(self, path):
+        np.savez(
+            path,
+            alpha=np.array(self.alpha),
+            zz=self.zz,
+            zy=self.zy,
+            anchor=self.anchor,
+            anchor_intercept=np.array(np.nan if self.anchor_intercept is None else self.anchor_intercept),
+            anchor_rows=np.array(self.anchor_rows),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            anchor_intercept = float(data["anchor_intercept"])
+            stats = cls(
+                data["anchor"].shape[0],
+                float(data["alpha"]),
+                anchor=data["anchor"],
+                anchor_intercept=None if np.isnan(anchor_intercept) else anchor_intercept,
+                anchor_rows=float(data["anchor_rows"]),
+            )
+            if data["zz"].shape != stats.zz.shape or data["zy"].shape != stats.zy.shape:
+                raise ValueError(f"Ridge stats {path} are malformed")
+            stats.zz = data["zz"].copy()
+            stats.zy = data["zy"].copy()
+        return stats
+
+
+def refit(model, stats):
+    """CompiledModel with the Ridge solution of `stats` folded into model's scaler"""
+    coef, intercept = stats.solve()
+    weights = coef * model.scale
+    bias = intercept + float(coef @ model.offset)
+    digest = hashlib.sha256(np.append(weights, bias).tobytes()).hexdigest()[:12]
+    return CompiledModel(
+        feature_names=model.feature_names,
+        weights=weights,
+        bias=bias,
+        scale=model.scale,
+        offset=model.offset,
+        coef=coef,
+        baseline=model.baseline,
+        version=digest,
+        calibration=model.calibration,
+    )
@@ -0,0 +1,258 @@
+"""
+Headless JSON prediction service for the React frontend
+Implements the contract in frontend/src/services/api.js:
+    POST /predict  {"date": "YYYY-MM-DD", "home_team": "BOS", "away_team": "LAL"}
+                   plus optional "explain": k for each team's k largest feature contributions
+    GET  /health
+    GET  /metrics  (Prometheus text format, see metrics.py)
+using only the standard library, HTTP/1.1 keep-alive and a fixed worker pool.
+Concurrent /predict calls are micro-batched (see batcher.py); GET /stats
+reports queue depth, batch sizes, streaming ingest progress (ingest.py),
+model reloads (registry.py), the matchup matrix's build time and age
+(matchup_matrix.py), the shared snapshot a worker follows (shared_model.py)
+and latency percentiles for every span.
+
+Usage: python server.py
+    PORT, NBA_API_HOST, NBA_API_WORKERS, NBA_API_CORS_ORIGIN,
+    NBA_API_BATCH_SIZE (0 disables batching) and NBA_API_BATCH_WAIT_MS override
+    the defaults; NBA_API_VERBOSE=1 logs every request
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from batcher import DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT, prediction_batcher
+from feature_store import N_FEATURES
+from ingest import get_ingestor
+from matchup_matrix import get_builder
+from metrics import clock, mark, prometheus_text, summaries
+from predictor import get_predictor
+from registry import get_registry
+from shared_model import get_watcher
+from teams import TEAMS
+
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 5000  # REACT_APP_API_URL default in frontend/.env
+DEFAULT_WORKERS = 16
+KEEP_ALIVE_TIMEOUT = 5.0  # seconds an idle keep-alive connection may hold a worker
+MAX_BODY_BYTES = 16 * 1024
+
+class RequestError(ValueError):
+    """Client error reported back as a JSON 4xx response"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_prediction_request(payload):
+    """Validate a /predict body and return (home_team, away_team, game_date)"""
+    if not isinstance(payload, dict):
+        raise RequestError("Request body must be a JSON object")
+    missing = [field for field in ("date", "home_team", "away_team") if not payload.get(field)]
+    if missing:
+        raise RequestError(f"Missing required field(s): {', '.join(missing)}")
+
+    teams = []
+    for team in (payload["home_team"], payload["away_team"]):
+        if str(team) not in TEAMS:
+            raise RequestError(f"Unknown team: {str(team).upper()}")
+        teams.append(TEAMS.canonical(str(team)))
+    home_team, away_team = teams
+    if home_team == away_team:
+        raise RequestError("Home team and away team cannot be the same")
+    try:
+        game_date = date.fromisoformat(str(payload["date"]))
+    except ValueError:
+        raise RequestError("date must be formatted as YYYY-MM-DD") from None
+    return home_team, away_team, game_date
+
+
+def parse_explain(payload):
+    """Validate the optional "explain" field of a /predict body (0 when absent)"""
+    explain = payload.get("explain", 0)
+    if isinstance(explain, bool) or not isinstance(explain, int) or not 0 <= explain <= N_FEATURES:
+        raise RequestError(f"explain must be an integer from 0 to {N_FEATURES}")
+    return explain
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = KEEP_ALIVE_TIMEOUT
+    # Headers and body are separate writes; without TCP_NODELAY every keep-alive
+    # response stalls on the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+    server_version = "NBAPredictor/1.0"
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors_headers()
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Access-Control-Max-Age", "86400")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/health":
+            predictor = self.server.predictor
+            self._send_json(200, {"status": "ok", "modelVersion": predictor.model.version})
+        elif path == "/stats":
+            batcher = self.server.batcher
+            ingestor = get_ingestor()
+            registry = get_registry()
+            builder = get_builder()
+            watcher = get_watcher()
+            self._send_json(200, {
+                "batcher": batcher.stats() if batcher is not None else None,
+                "ingest": ingestor.stats_summary() if ingestor is not None else None,
+                "registry": registry.stats() if registry is not None else None,
+                "matchups": builder.stats() if builder is not None else None,
+                "shared": watcher.stats() if watcher is not None else None,
+                "spans": summaries(),
+            })
+        elif path == "/metrics":
+            self._send(200, prometheus_text().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8")
+        else:
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0] != "/predict":
+            self._discard_body()
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+            return
+        started = clock()
+        try:
+            payload = self._read_json()
+            game = parse_prediction_request(payload)
+            result = self.server.predict(game, parse_explain(payload))
+        except RequestError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": f"Prediction failed: {e}"})
+        else:
+            self._send_json(200, result)
+        mark("http_predict", started)
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            raise RequestError("Invalid Content-Length") from None
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise RequestError("Request body too large", status=413)
+        body = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(body or b"null")
+        except json.JSONDecodeError:
+            raise RequestError("Request body must be valid JSON") from None
+
+    def _discard_body(self):
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        if 0 < length <= MAX_BODY_BYTES:
+            self.rfile.read(length)
+        elif length:
+            self.close_connection = True
+
+    def _cors_headers(self):
+        self.send_header("Access-Control-Allow-Origin", self.server.cors_origin)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self._cors_headers()
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that hands each connection to a fixed-size thread pool"""
+
+    request_queue_size = 128
+
+    def __init__(self, address, handler, predictor, workers=DEFAULT_WORKERS,
+                 cors_origin="*", verbose=False, batcher=None):
+        super().__init__(address, handler)
+        self.predictor = predictor
+        self.batcher = batcher
+        self.cors_origin = cors_origin
+        self.verbose = verbose
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="predict")
+
+    def predict(self, game, explain=0):
+        """Score one game through the micro-batcher when batching is on
+
+        The batcher scores as soon as its batch holds every request in flight,
+        so a lone request is not held for the batching window.  Explained
+        requests are scored directly; batches carry probabilities only.
+        """
+        if self.batcher is None or explain:
+            return self.predictor.predict_game(*game, explain=explain)
+        return self.batcher.submit_threadsafe(game)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process_request_thread, request, client_address)
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        if self.batcher is not None:
+            self.batcher.stop()
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, predictor=None, workers=DEFAULT_WORKERS,
+                  cors_origin="*", verbose=False, batch_size=DEFAULT_MAX_BATCH_SIZE,
+                  batch_wait=DEFAULT_MAX_WAIT):
+    """Build a ready-to-serve prediction server (port 0 picks a free port)"""
+    predictor = get_predictor() if predictor is None else predictor
+    batcher = None
+    if batch_size > 0:
+        batcher = prediction_batcher(predictor, batch_size, batch_wait).start()
+    return PooledHTTPServer((host, port), PredictionHandler, predictor, workers, cors_origin,
+                            verbose, batcher)
+
+
+def main():
+    host = os.environ.get("NBA_API_HOST", DEFAULT_HOST)
+    port = int(os.environ.get("PORT", DEFAULT_PORT))
+    workers = int(os.environ.get("NBA_API_WORKERS", DEFAULT_WORKERS))
+    cors_origin = os.environ.get("NBA_API_CORS_ORIGIN", "*")
+    verbose = os.environ.get("NBA_API_VERBOSE") == "1"
+    batch_size = int(os.environ.get("NBA_API_BATCH_SIZE", DEFAULT_MAX_BATCH_SIZE))
+    batch_wait = float(os.environ.get("NBA_API_BATCH_WAIT_MS", DEFAULT_MAX_WAIT * 1000.0)) / 1000.0
+    server = create_server(host, port, workers=workers, cors_origin=cors_origin, verbose=verbose,
+                           batch_size=batch_size, batch_wait=batch_wait)
+    print(f"Serving predictions on http://{host}:{server.server_address[1]} with {workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""
+Model and feature tables shared by every worker process on a machine
+One loader publishes the deployed model and the point-in-time feature index
+as a snapshot directory of .npy files plus manifest.json, and points
+shared/CURRENT at it.  Workers open the arrays with mmap, so all of them
+read the same page-cache pages: adding a worker costs its interpreter, not
+another copy of the tables.  Workers poll CURRENT (a few bytes) and attach
+to a new snapshot without parsing model.npz or feature_index.npz, swapping
+the features and then the model into their Predictor.
+
+Snapshots are named after the model and feature versions and written to a
+temporary directory that is renamed into place, so a worker never sees a
+half-written one.  The newest KEEP_SNAPSHOTS are kept; a worker still
+mapping a removed one keeps its pages until it moves on.
+
+Workers attach when NBA_SHARED_DIR is set, waiting up to NBA_SHARED_WAIT
+seconds (default 30) for the first snapshot before failing with an
+ArtifactError rather than loading their own copy.  They skip the model
+registry, which belongs to the loader.  Streaming ingest (ingest.py) is not
+available in shared mode: the watcher only republishes the deployed
+model.npz and feature_index.npz, so NBA_INGEST_DIR is ignored by workers.
+
+Usage: python shared_model.py publish [shared_dir]   (publish the deployed artifacts once)
+       python shared_model.py watch [shared_dir]     (republish whenever they change)
+       python shared_model.py [shared_dir]           (show the current snapshot)
+    NBA_SHARED_INTERVAL sets how often workers and the watcher poll, in seconds
+"""
+
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+import numpy as np
+
+from predictor import ARTIFACT_DIR, ArtifactError, BaselineFeatures, CompiledModel
+
+SHARED_DIR = os.path.join(ARTIFACT_DIR, "shared")
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+KEEP_SNAPSHOTS = 3
+DEFAULT_INTERVAL = 1.0
+DEFAULT_WAIT = 30.0
+
+CALIBRATION_ARRAYS = ("calibration", "calibration_knots", "calibration_values")
+FEATURE_ARRAYS = ("keys", "rows", "seasons")
+
+
+def snapshot_name(model, feature_index=None):
+    return f"{model.version}-{'baseline' if feature_index is None else feature_index.version}"
+
+
+def publish(model, feature_source=None, root=SHARED_DIR):
+    """Write a snapshot of the model and feature index and make it current
+
+    With no feature_source, workers serve the model's baseline row.
+    """
+    from feature_index import FeatureIndex
+
+    if feature_source is not None and not isinstance(feature_source, FeatureIndex):
+        raise ArtifactError(f"Only a FeatureIndex can be shared, not {type(feature_source).__name__}")
+    snapshot = snapshot_name(model, feature_source)
+    path = os.path.join(root, snapshot)
+    if not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        temporary = os.path.join(root, f".{snapshot}.{os.getpid()}.tmp")
+        os.makedirs(temporary)
+        arrays = {name: getattr(model, name) for name in CompiledModel.ARRAYS}
+        arrays.update(model.calibration.to_arrays())
+        manifest = {
+            "format": FORMAT_VERSION,
+            "model": {"version": model.version, "bias": model.bias, "feature_names": model.feature_names},
+            "features": None,
+        }
+        if feature_source is not None:
+            arrays.update({name: getattr(feature_source, name) for name in FEATURE_ARRAYS})
+            manifest["features"] = {"version": feature_source.version, "teams": feature_source.teams}
+        for name, array in arrays.items():
+            np.save(os.path.join(temporary, f"{name}.npy"), np.ascontiguousarray(array))
+        with open(os.path.join(temporary, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=1)
+        try:
+            os.rename(temporary, path)
+        except OSError:
+            shutil.rmtree(temporary)  # another loader published the same snapshot first
+    _replace_text(os.path.join(root, CURRENT_FILE), snapshot)
+    _remove_old(root, keep=snapshot)
+    return snapshot
+
+
+def current(root=SHARED_DIR):
+    """Name of the current snapshot, or None before the first publish"""
+    try:
+        with open(os.path.join(root, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def attach(root=SHARED_DIR, snapshot=None):
+    """(model, feature_source, snapshot) over memory-mapped arrays of a snapshot
+
+    feature_source is None for a snapshot published without a feature index.
+    """
+    from calibration import Calibration
+    from feature_index import FeatureIndex
+
+    snapshot = current(root) if snapshot is None else snapshot
+    if snapshot is None:
+        raise ArtifactError(f"No shared snapshot published in {root}")
+    path = os.path.join(root, snapshot)
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ArtifactError(f"Shared snapshot {path} has an unsupported format")
+
+    def mapped(name, mmap_mode="r"):
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+
+    info = manifest["model"]
+    model = CompiledModel(
+        feature_names=info["feature_names"],
+        bias=info["bias"],
+        version=info["version"],
+        # A handful of floats, possibly empty, which mmap refuses
+        calibration=Calibration.from_arrays({name: mapped(name, None) for name in CALIBRATION_ARRAYS}),
+        **{name: mapped(name) for name in CompiledModel.ARRAYS},
+    )
+    feature_source = None
+    features = manifest["features"]
+    if features is not None:
+        feature_source = FeatureIndex(features["teams"], *(mapped(name) for name in FEATURE_ARRAYS),
+                                      initial_row=model.baseline, version=features["version"])
+    return model, feature_source, snapshot
+
+
+def _replace_text(path, text):
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as f:
+        f.write(text + "\n")
+    os.replace(temporary, path)
+
+
+def _remove_old(root, keep):
+    snapshots = [
+        entry for entry in os.listdir(root)
+        if not entry.startswith(".") and os.path.exists(os.path.join(root, entry, MANIFEST_FILE))
+    ]
+    snapshots.sort(key=lambda entry: os.path.getmtime(os.path.join(root, entry, MANIFEST_FILE)), reverse=True)
+    for entry in [entry for entry in snapshots if entry != keep][KEEP_SNAPSHOTS - 1:]:
+        shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
+
+
+class SharedModelWatcher:
+    """Swaps newly published snapshots into a worker's Predictor"""
+
+    def __init__(self, predictor, snapshot, root=SHARED_DIR, interval=DEFAULT_INTERVAL):
+        self.predictor = predictor
+        self.snapshot = snapshot
+        self.root = root
+        self.interval = interval
+        self.reloads = 0
+        self.failures = 0
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """Attach to the current snapshot if it changed; returns True after a swap"""
+        snapshot = current(self.root)
+        if snapshot is None or snapshot == self.snapshot:
+            return False
+        try:
+            model, feature_source, snapshot = attach(self.root, snapshot)
+        except Exception as e:
+            # Usually a snapshot removed between reading CURRENT and opening it
+            self.failures += 1
+            self.last_error = f"{snapshot}: {e}"
+            return False
+        predictor = self.predictor
+        # Features first, so a request never pairs the new model with old features
+        predictor.feature_source = BaselineFeatures(model.baseline) if feature_source is None else feature_source
+        predictor.model = model
+        self.snapshot = snapshot
+        self.reloads += 1
+        return True
+
+    def start(self):
+        def run():
+            while not self._stop.wait(self.interval):
+                self.check()
+
+        self._thread = threading.Thread(target=run, name="shared-model", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1.0)
+
+    def stats(self):
+        return {
+            "snapshot": self.snapshot,
+            "modelVersion": self.predictor.model.version,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "lastError": self.last_error,
+        }
+
+
+def wait_for_snapshot(root=SHARED_DIR, timeout=DEFAULT_WAIT, interval=0.1):
+    """Name of the current snapshot, polling until one is published or timeout seconds pass"""
+    deadline = time.monotonic() + timeout
+    while True:
+        snapshot = current(root)
+        if snapshot is not None:
+            return snapshot
+        if time.monotonic() >= deadline:
+            raise ArtifactError(f"No shared snapshot published in {root} after {timeout:g}s "
+                                "(run shared_model.py publish or watch)")
+        time.sleep(interval)
+
+
+def shared_dir_from_env():
+    """NBA_SHARED_DIR, or None when this process should load the artifacts itself"""
+    return os.environ.get("NBA_SHARED_DIR") or None
+
+
+def wait_from_env():
+    return float(os.environ.get("NBA_SHARED_WAIT", DEFAULT_WAIT))
+
+
+def interval_from_env():
+    return float(os.environ.get("NBA_SHARED_INTERVAL", DEFAULT_INTERVAL))
+
+
+_watcher = None
+
+
+def get_watcher():
+    """The SharedModelWatcher started by start_from_env, if any"""
+    return _watcher
+
+
+def start_from_env(predictor, snapshot):
+    """Follow new snapshots in NBA_SHARED_DIR (called once per worker process)"""
+    global _watcher
+    if _watcher is None:
+        root = os.environ["NBA_SHARED_DIR"]
+        _watcher = SharedModelWatcher(predictor, snapshot, root, interval_from_env()).start()
+    return _watcher
+
+
+def publish_deployed(root=SHARED_DIR):
+    """Load the deployed model and feature index the way get_predictor() does and publish them"""
+    from predictor import load_feature_source
+    from registry import deployed_path
+
+    model = CompiledModel.load(deployed_path())
+    return publish(model, load_feature_source(model), root)
+
+
+def main(argv):
+    from registry import deployed_path
+
+    command = argv[1] if len(argv) > 1 and argv[1] in ("publish", "watch") else None
+    rest = argv[2:] if command else argv[1:]
+    root = rest[0] if rest else os.environ.get("NBA_SHARED_DIR", SHARED_DIR)
+    os.makedirs(root, exist_ok=True)
+    if command == "publish":
+        print(f"Published {publish_deployed(root)} to {root}")
+    elif command == "watch":
+        from predictor import feature_index_path
+
+        interval = interval_from_env()
+        seen = None
+        print(f"Publishing the deployed artifacts to {root} when they change (every {interval:g}s)")
+        while True:
+            watched = [deployed_path(), feature_index_path()]
+            signature = [(p, os.stat(p).st_mtime_ns) if os.path.exists(p) else None for p in watched]
+            if signature != seen:
+                try:
+                    print(f"Published {publish_deployed(root)}")
+                    seen = signature
+                except Exception as e:
+                    print(f"Publish failed, retrying: {e}", file=sys.stderr)
+            time.sleep(interval)
+    else:
+        snapshot = current(root)
+        if snapshot is None:
+            print(f"No snapshot published in {root}")
+            return 1
+        model, feature_source, _ = attach(root, snapshot)
+        rows = 0 if feature_source is None else feature_source.rows.shape[0]
+        print(f"{root}: {snapshot} (model {model.version}, {rows} feature rows)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,234 @@
+"""
+Monte Carlo season simulator for standings, seeding and playoff odds
+Scores every remaining game once with the model's home-win probability, then
+plays the rest of the season many times over as a (sims x games) Bernoulli
+matrix.  Win totals for all 30 teams come from one matrix product per chunk:
+each simulated result row times the games' ±1 home/away incidence matrix.
+Teams are seeded 1-15 within their conference (ties broken at random, not by
+the NBA's head-to-head rules), and seeds 7-10 play the play-in tournament
+with the model's probabilities as of the end of the schedule.
+
+Simulations run in chunks sized to keep memory bounded, each with its own
+SeedSequence child stream, so a given seed gives the same projection however
+many worker processes share the chunks.
+
+Usage: python simulator.py schedule.csv [standings] [sims] [seed]
+    The schedule needs home_team, away_team and date columns.  standings is a
+    CSV of team, wins, losses, or game logs / a history_store.py directory to
+    count the latest season from (games on or before its last date are
+    dropped from the schedule).  NBA_SIMULATION_WORKERS sets the pool size
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from teams import CONFERENCES, TEAM_CONFERENCES, TEAMS
+
+TEAM_CODES = list(TEAMS.codes)
+TEAM_CONFERENCE = TEAM_CONFERENCES
+CONFERENCE_SIZE = len(TEAM_CODES) // len(CONFERENCES)
+
+DEFAULT_SIMULATIONS = 100_000
+DEFAULT_SEED = 0
+MAX_CHUNK_BYTES = 32 << 20  # per chunk of float32 draws
+PLAYOFF_SEEDS = 6
+PLAY_IN_SEEDS = (7, 8, 9, 10)
+
+
+def current_records(standings):
+    """(wins, losses) arrays in NBA_TEAMS order from a standings table or game logs
+
+    Game logs are reduced to their latest season.  Also returns the last
+    date already played (None for a standings table).
+    """
+    frame = standings.rename(columns=lambda column: str(column).strip().lower())
+    codes = TEAMS.canonical_codes(frame["team"])
+    known = np.isin(codes, TEAMS.code_array)  # teams outside the league are ignored
+    if {"wins", "losses"} <= set(frame.columns):
+        last_played = None
+        teams = TEAMS.encode(codes[known])
+        wins = np.bincount(teams, frame["wins"].to_numpy()[known], minlength=len(TEAMS))
+        losses = np.bincount(teams, frame["losses"].to_numpy()[known], minlength=len(TEAMS))
+    else:
+        from feature_store import WIN_VALUES, seasons_of_days
+
+        days = pd.to_datetime(frame["date"]).to_numpy().astype("datetime64[D]")
+        season = frame["season"].to_numpy() if "season" in frame.columns else seasons_of_days(days)
+        latest = season == season.max()
+        won = frame["won"]
+        if won.dtype == object:
+            won = won.astype(str).str.strip().str.lower().isin(WIN_VALUES)
+        counted = latest & known
+        teams = TEAMS.encode(codes[counted])
+        won = won.astype(bool).to_numpy()[counted]
+        wins = np.bincount(teams, won, minlength=len(TEAMS))
+        losses = np.bincount(teams, ~won, minlength=len(TEAMS))
+        last_played = days[latest].max()
+    return wins.astype(np.int64), losses.astype(np.int64), last_played
+
+
+def matchup_probabilities(predictor, game_date):
+    """30x30 matrix of home-win probabilities (row hosts column) as of game_date"""
+    from matchup_matrix import MatchupMatrix
+
+    matrix = MatchupMatrix.build(predictor, game_date, days=0).probabilities[0].copy()
+    np.fill_diagonal(matrix, 0.5)
+    return matrix
+
+
+def chunk_sizes(simulations, n_games, max_chunk_bytes=MAX_CHUNK_BYTES):
+    """Split simulations into chunks whose float32 draw matrix fits max_chunk_bytes"""
+    per_chunk = max(1, min(simulations, max_chunk_bytes // max(4 * n_games, 1)))
+    full, rest = divmod(simulations, per_chunk)
+    return [per_chunk] * full + ([rest] if rest else [])
+
+
+def simulate_chunk(task):
+    """Simulate `sims` seasons; returns (win histogram, seed counts, playoff counts)"""
+    sims, seed, home, away, probability, wins, matchups, max_wins = task
+    rng = np.random.default_rng(seed)
+    n_teams = len(TEAM_CODES)
+
+    # won @ (H - A) adds a home win to the home team and takes it from the away
+    # team, whose remaining-game count already credited every away game as a win
+    incidence = np.zeros((probability.shape[0], n_teams), dtype=np.float32)
+    games = np.arange(probability.shape[0])
+    incidence[games, home] += 1.0
+    incidence[games, away] -= 1.0
+    away_games = np.bincount(away, minlength=n_teams)
+    home_won = rng.random((sims, probability.shape[0]), dtype=np.float32) < probability.astype(np.float32)
+    totals = wins + away_games + np.rint(home_won.astype(np.float32) @ incidence).astype(np.int64)
+
+    histogram = np.bincount(
+        (np.arange(n_teams) * (max_wins + 1) + totals).ravel(), minlength=n_teams * (max_wins + 1)
+    ).reshape(n_teams, max_wins + 1)
+
+    # Seed within each conference; the uniform jitter only ever breaks ties
+    order_key = totals + rng.random((sims, n_teams))
+    seeds = np.empty((sims, n_teams), dtype=np.int64)
+    seeded = {}
+    for c in range(len(CONFERENCES)):
+        members = np.flatnonzero(TEAM_CONFERENCE == c)
+        ranking = members[np.argsort(-order_key[:, members], axis=1)]  # (sims, 15) teams by seed
+        seeds[np.arange(sims)[:, None], ranking] = np.arange(1, members.shape[0] + 1)
+        seeded[c] = ranking
+    seed_counts = np.stack([np.bincount(seeds[:, t] - 1, minlength=CONFERENCE_SIZE) for t in range(n_teams)])
+
+    playoffs = np.zeros(n_teams, dtype=np.int64)
+    for c, ranking in seeded.items():
+        playoffs += np.bincount(ranking[:, :PLAYOFF_SEEDS].ravel(), minlength=n_teams)
+        seventh, eighth, ninth, tenth = (ranking[:, seed - 1] for seed in PLAY_IN_SEEDS)
+        # 7 hosts 8 for the seventh seed; 9 hosts 10; the 7/8 loser hosts the 9/10 winner for the eighth
+        first = rng.random(sims) < matchups[seventh, eighth]
+        seventh_seed = np.where(first, seventh, eighth)
+        second_chance = np.where(first, eighth, seventh)
+        elimination = np.where(rng.random(sims) < matchups[ninth, tenth], ninth, tenth)
+        final = rng.random(sims) < matchups[second_chance, elimination]
+        eighth_seed = np.where(final, second_chance, elimination)
+        playoffs += np.bincount(seventh_seed, minlength=n_teams) + np.bincount(eighth_seed, minlength=n_teams)
+    return histogram, seed_counts, playoffs
+
+
+def simulate_season(predictor, schedule, wins=None, simulations=DEFAULT_SIMULATIONS, seed=DEFAULT_SEED,
+                    workers=None, max_chunk_bytes=MAX_CHUNK_BYTES):
+    """Projected standings: one row per team with win totals, seed and playoff odds"""
+    schedule = schedule.reset_index(drop=True)
+    unknown = sorted({code for code in pd.concat([schedule["home_team"], schedule["away_team"]]).unique()
+                      if code not in TEAMS})
+    if unknown:
+        raise ValueError(f"Unknown team code(s) in schedule: {', '.join(map(str, unknown))}")
+    wins = np.zeros(len(TEAM_CODES), dtype=np.int64) if wins is None else np.asarray(wins, dtype=np.int64)
+
+    home = TEAMS.encode(schedule["home_team"].to_numpy())
+    away = TEAMS.encode(schedule["away_team"].to_numpy())
+    probability = predictor.home_probabilities(schedule[["home_team", "away_team", "date"]])
+    end = np.datetime64(pd.to_datetime(schedule["date"]).max(), "D") if len(schedule) else np.datetime64("today", "D")
+    matchups = matchup_probabilities(predictor, end)
+    games_left = np.bincount(home, minlength=len(TEAM_CODES)) + np.bincount(away, minlength=len(TEAM_CODES))
+    max_wins = int((wins + games_left).max())
+
+    sizes = chunk_sizes(simulations, probability.shape[0], max_chunk_bytes)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(sims, child, home, away, probability, wins, matchups, max_wins) for sims, child in zip(sizes, seeds)]
+    if workers == 1 or len(tasks) == 1:
+        results = [simulate_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(simulate_chunk, tasks))
+    histogram = sum(result[0] for result in results)
+    seed_counts = sum(result[1] for result in results)
+    playoffs = sum(result[2] for result in results)
+
+    win_values = np.arange(max_wins + 1)
+    cumulative = np.cumsum(histogram, axis=1) / simulations
+    seed_odds = seed_counts / simulations
+    projection = pd.DataFrame({
+        "team": TEAM_CODES,
+        "conference": [CONFERENCES[c] for c in TEAM_CONFERENCE],
+        "wins": wins,
+        "games_left": games_left,
+        "projected_wins": histogram @ win_values / simulations,
+        "wins_p10": np.argmax(cumulative >= 0.1, axis=1),
+        "wins_p90": np.argmax(cumulative >= 0.9, axis=1),
+        "average_seed": seed_odds @ np.arange(1, CONFERENCE_SIZE + 1),
+        "top_six": seed_odds[:, :PLAYOFF_SEEDS].sum(axis=1),
+        "play_in": seed_odds[:, PLAY_IN_SEEDS[0] - 1:PLAY_IN_SEEDS[-1]].sum(axis=1),
+        "playoffs": playoffs / simulations,
+    })
+    for s in range(CONFERENCE_SIZE):
+        projection[f"seed_{s + 1}"] = seed_odds[:, s]
+    return projection.sort_values(["conference", "average_seed"], ignore_index=True)
+
+
+def read_standings(path):
+    """Standings or game logs from a CSV, Parquet file or history_store.py directory"""
+    if os.path.isdir(path):
+        from history_store import GameHistory
+
+        return GameHistory.open(path).to_frame()
+    if path.lower().endswith((".parquet", ".pq")):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def main(argv):
+    from predictor import get_predictor
+
+    if len(argv) < 2:
+        print(__doc__[__doc__.index("Usage:"):].rstrip())
+        return 1
+    schedule = pd.read_csv(argv[1])
+    schedule.columns = [column.strip().lower() for column in schedule.columns]
+    for side in ("home_team", "away_team"):
+        schedule[side] = TEAMS.canonical_codes(schedule[side])
+    wins = None
+    if len(argv) > 2:
+        wins, _, last_played = current_records(read_standings(argv[2]))
+        if last_played is not None:
+            schedule = schedule[pd.to_datetime(schedule["date"]).to_numpy() > last_played]
+    simulations = int(argv[3]) if len(argv) > 3 else DEFAULT_SIMULATIONS
+    seed = int(argv[4]) if len(argv) > 4 else DEFAULT_SEED
+    workers = int(os.environ["NBA_SIMULATION_WORKERS"]) if os.environ.get("NBA_SIMULATION_WORKERS") else None
+
+    started = time.perf_counter()
+    projection = simulate_season(get_predictor(), schedule, wins, simulations, seed, workers)
+    elapsed = time.perf_counter() - started
+
+    columns = ["team", "wins", "games_left", "projected_wins", "wins_p10", "wins_p90", "average_seed",
+               "top_six", "play_in", "playoffs"]
+    with pd.option_context("display.float_format", "{:.3f}".format, "display.width", 120):
+        for conference, group in projection.groupby("conference"):
+            print(f"{conference}ern Conference")
+            print(group[columns].to_string(index=False))
+            print()
+    print(f"{simulations} simulations of {len(schedule)} remaining games in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
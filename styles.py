@@ -0,0 +1,860 @@
+"""
+Static styling and HTML fragments for the Streamlit app
+Everything here is minified once at import so each rerun re-sends the
+smallest possible payload and never rebuilds the strings; the dynamic result
+cards are small precompiled templates filled with str.format
+"""
+
+import html
+import re
+
+# One stylesheet request for both font families instead of two @imports
+FONTS_URL = ("https://fonts.googleapis.com/css2"
+             "?family=Inter:wght@300;400;500;600;700;800"
+             "&family=Poppins:wght@300;400;500;600;700;800&display=swap")
+
+_CSS = """
+/* Global styles with enhanced background */
+.stApp {
+    background: 
+        radial-gradient(circle at 20% 80%, rgba(239, 68, 68, 0.1) 0%, transparent 50%),
+        radial-gradient(circle at 80% 20%, rgba(185, 28, 28, 0.08) 0%, transparent 50%),
+        radial-gradient(circle at 40% 40%, rgba(127, 29, 29, 0.06) 0%, transparent 50%),
+        linear-gradient(135deg, #0a0a0a 0%, #1a1a1a 25%, #2d1b1b 50%, #1a1a1a 75%, #0a0a0a 100%);
+    background-attachment: fixed;
+    font-family: 'Poppins', 'Inter', sans-serif !important;
+    color: white !important;
+    min-height: 100vh;
+}
+
+/* Hide Streamlit branding completely */
+#MainMenu {visibility: hidden;}
+header {visibility: hidden;}
+footer {visibility: hidden;}
+.viewerBadge_container__1QSob {display: none !important;}
+a[href^="https://streamlit.io"] {display: none !important;}
+
+/* Enhanced container styling */
+.main .block-container {
+    padding-top: 3rem !important;
+    padding-bottom: 3rem !important;
+    max-width: 32rem !important;
+    margin: 0 auto !important;
+}
+
+/* Enhanced form styling with glass morphism */
+.stForm {
+    background: rgba(20, 20, 20, 0.7) !important;
+    border: 1px solid rgba(239, 68, 68, 0.2) !important;
+    border-radius: 1.5rem !important;
+    padding: 2.5rem !important;
+    backdrop-filter: blur(20px) !important;
+    box-shadow: 
+        0 8px 32px rgba(0, 0, 0, 0.4),
+        0 2px 16px rgba(239, 68, 68, 0.1),
+        inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
+    position: relative;
+    overflow: hidden;
+}
+
+/* Add subtle glow animation to form */
+.stForm::before {
+    content: '';
+    position: absolute;
+    top: -2px;
+    left: -2px;
+    right: -2px;
+    bottom: -2px;
+    background: linear-gradient(45deg, 
+        transparent 30%, 
+        rgba(239, 68, 68, 0.3) 50%, 
+        transparent 70%);
+    border-radius: 1.5rem;
+    z-index: -1;
+    animation: borderGlow 3s ease-in-out infinite alternate;
+}
+
+@keyframes borderGlow {
+    0% { opacity: 0.3; }
+    100% { opacity: 0.7; }
+}
+
+/* Enhanced input styling */
+.stDateInput > div > div > input,
+.stSelectbox > div > div > select {
+    background: linear-gradient(135deg, rgba(55, 65, 81, 0.8), rgba(75, 85, 99, 0.6)) !important;
+    border: 1px solid rgba(239, 68, 68, 0.3) !important;
+    border-radius: 1rem !important;
+    color: white !important;
+    font-size: 1rem !important;
+    font-weight: 500 !important;
+    padding: 1rem 1.25rem !important;
+    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
+    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1) !important;
+}
+
+.stDateInput > div > div > input:focus,
+.stSelectbox > div > div > select:focus {
+    border-color: rgba(239, 68, 68, 0.8) !important;
+    box-shadow: 
+        0 0 0 3px rgba(239, 68, 68, 0.2),
+        0 8px 16px rgba(0, 0, 0, 0.2) !important;
+    outline: none !important;
+    transform: translateY(-2px) !important;
+}
+
+.stDateInput > div > div > input:hover,
+.stSelectbox > div > div > select:hover {
+    border-color: rgba(239, 68, 68, 0.5) !important;
+    transform: translateY(-1px) !important;
+    box-shadow: 0 6px 12px rgba(0, 0, 0, 0.15) !important;
+}
+
+/* Enhanced label styling */
+.stDateInput > label,
+.stSelectbox > label {
+    color: #f3f4f6 !important;
+    font-weight: 600 !important;
+    font-size: 1rem !important;
+    margin-bottom: 0.75rem !important;
+    text-shadow: 0 1px 2px rgba(0, 0, 0, 0.3);
+}
+
+/* Spectacular button styling */
+.stButton > button {
+    background: linear-gradient(135deg, 
+        #dc2626 0%, 
+        #b91c1c 25%, 
+        #991b1b 50%, 
+        #7f1d1d 75%, 
+        #dc2626 100%) !important;
+    background-size: 200% 200% !important;
+    border: none !important;
+    border-radius: 1.25rem !important;
+    color: white !important;
+    font-weight: 700 !important;
+    font-size: 1.1rem !important;
+    padding: 1.25rem 2rem !important;
+    transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1) !important;
+    width: 100% !important;
+    height: 4rem !important;
+    box-shadow: 
+        0 10px 20px rgba(220, 38, 38, 0.3),
+        0 6px 6px rgba(0, 0, 0, 0.2),
+        inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
+    position: relative;
+    overflow: hidden;
+    cursor: pointer !important;
+    animation: gradientShift 3s ease-in-out infinite;
+}
+
+@keyframes gradientShift {
+    0%, 100% { background-position: 0% 50%; }
+    50% { background-position: 100% 50%; }
+}
+
+.stButton > button::before {
+    content: '';
+    position: absolute;
+    top: 0;
+    left: -100%;
+    width: 100%;
+    height: 100%;
+    background: linear-gradient(90deg, 
+        transparent, 
+        rgba(255, 255, 255, 0.3), 
+        transparent);
+    transition: left 0.5s;
+}
+
+.stButton > button:hover::before {
+    left: 100%;
+}
+
+.stButton > button:hover {
+    background: linear-gradient(135deg, 
+        #ef4444 0%, 
+        #dc2626 25%, 
+        #b91c1c 50%, 
+        #991b1b 75%, 
+        #ef4444 100%) !important;
+    transform: translateY(-3px) scale(1.02) !important;
+    box-shadow: 
+        0 15px 30px rgba(220, 38, 38, 0.4),
+        0 10px 10px rgba(0, 0, 0, 0.3),
+        inset 0 1px 0 rgba(255, 255, 255, 0.3) !important;
+}
+
+.stButton > button:active {
+    transform: translateY(-1px) scale(0.98) !important;
+    box-shadow: 
+        0 5px 10px rgba(220, 38, 38, 0.5),
+        0 3px 6px rgba(0, 0, 0, 0.3) !important;
+}
+
+/* Enhanced secondary button styling */
+.stButton > button[kind="secondary"] {
+    background: rgba(55, 65, 81, 0.8) !important;
+    border: 1px solid rgba(239, 68, 68, 0.4) !important;
+    box-shadow: 
+        0 6px 12px rgba(0, 0, 0, 0.2),
+        inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
+    backdrop-filter: blur(10px) !important;
+}
+
+.stButton > button[kind="secondary"]:hover {
+    background: rgba(75, 85, 99, 0.9) !important;
+    border-color: rgba(239, 68, 68, 0.6) !important;
+    transform: translateY(-2px) !important;
+    box-shadow: 
+        0 8px 16px rgba(0, 0, 0, 0.3),
+        0 0 0 2px rgba(239, 68, 68, 0.3) !important;
+}
+
+/* Enhanced metric containers */
+.metric-container {
+    background: linear-gradient(135deg, 
+        rgba(31, 41, 55, 0.9), 
+        rgba(55, 65, 81, 0.7)) !important;
+    border: 1px solid rgba(239, 68, 68, 0.3) !important;
+    border-radius: 1.25rem !important;
+    padding: 2rem !important;
+    text-align: center !important;
+    margin: 0.75rem 0 !important;
+    backdrop-filter: blur(15px) !important;
+    box-shadow: 
+        0 8px 20px rgba(0, 0, 0, 0.3),
+        inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
+    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
+    position: relative;
+    overflow: hidden;
+}
+
+.metric-container::before {
+    content: '';
+    position: absolute;
+    top: 0;
+    left: -100%;
+    width: 100%;
+    height: 100%;
+    background: linear-gradient(90deg, 
+        transparent, 
+        rgba(239, 68, 68, 0.1), 
+        transparent);
+    transition: left 0.8s;
+}
+
+.metric-container:hover::before {
+    left: 100%;
+}
+
+.metric-container:hover {
+    transform: translateY(-3px) !important;
+    border-color: rgba(239, 68, 68, 0.5) !important;
+    box-shadow: 
+        0 12px 25px rgba(0, 0, 0, 0.4),
+        inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
+}
+
+/* Enhanced alert styling */
+.stAlert > div {
+    border-radius: 1rem !important;
+    border: none !important;
+    backdrop-filter: blur(15px) !important;
+    font-weight: 500 !important;
+    box-shadow: 0 6px 12px rgba(0, 0, 0, 0.2) !important;
+}
+
+.stAlert[data-baseweb-kind="error"] > div {
+    background: linear-gradient(135deg, 
+        rgba(239, 68, 68, 0.2), 
+        rgba(220, 38, 38, 0.15)) !important;
+    border: 1px solid rgba(239, 68, 68, 0.4) !important;
+    color: #fca5a5 !important;
+}
+
+.stAlert[data-baseweb-kind="info"] > div {
+    background: linear-gradient(135deg, 
+        rgba(31, 41, 55, 0.7), 
+        rgba(55, 65, 81, 0.5)) !important;
+    border: 1px solid rgba(239, 68, 68, 0.3) !important;
+    color: #f3f4f6 !important;
+}
+
+/* Enhanced spinner */
+.stSpinner > div {
+    border-top-color: #ef4444 !important;
+    border-right-color: #ef4444 !important;
+    border-width: 3px !important;
+    width: 2.5rem !important;
+    height: 2.5rem !important;
+}
+
+/* Premium gradient text */
+.gradient-text {
+    color: #ef4444 !important;
+    font-weight: 800;
+    text-shadow: 0 0 20px rgba(239, 68, 68, 0.5),
+                 0 0 40px rgba(239, 68, 68, 0.3),
+                 0 2px 4px rgba(0, 0, 0, 0.5);
+    animation: glowText 2s ease-in-out infinite;
+}
+
+@keyframes glowText {
+    0%, 100% { 
+        text-shadow: 0 0 20px rgba(239, 68, 68, 0.5),
+                     0 0 40px rgba(239, 68, 68, 0.3),
+                     0 2px 4px rgba(0, 0, 0, 0.5);
+    }
+    50% { 
+        text-shadow: 0 0 30px rgba(239, 68, 68, 0.8),
+                     0 0 60px rgba(239, 68, 68, 0.5),
+                     0 2px 4px rgba(0, 0, 0, 0.5);
+    }
+}
+
+/* Remove link styling from headings */
+.gradient-text, .gradient-text a {
+    text-decoration: none !important;
+    pointer-events: none !important;
+    cursor: default !important;
+}
+
+h1, h2, h3 {
+    pointer-events: none !important;
+    cursor: default !important;
+}
+
+h1 a, h2 a, h3 a {
+    text-decoration: none !important;
+    pointer-events: none !important;
+    color: inherit !important;
+}
+
+/* Enhanced prediction card */
+.prediction-card {
+    background: linear-gradient(135deg, 
+        rgba(20, 20, 20, 0.9), 
+        rgba(31, 41, 55, 0.8)) !important;
+    border: 1px solid rgba(239, 68, 68, 0.3) !important;
+    border-radius: 1.5rem !important;
+    padding: 2.5rem !important;
+    backdrop-filter: blur(20px) !important;
+    box-shadow: 
+        0 20px 40px rgba(0, 0, 0, 0.4),
+        0 8px 16px rgba(239, 68, 68, 0.1),
+        inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
+    margin: 1.5rem 0 !important;
+    position: relative;
+    overflow: hidden;
+}
+
+.prediction-card::before {
+    content: '';
+    position: absolute;
+    top: -2px;
+    left: -2px;
+    right: -2px;
+    bottom: -2px;
+    background: linear-gradient(45deg, 
+        transparent 30%, 
+        rgba(239, 68, 68, 0.2) 50%, 
+        transparent 70%);
+    border-radius: 1.5rem;
+    z-index: -1;
+    animation: cardGlow 4s ease-in-out infinite alternate;
+}
+
+@keyframes cardGlow {
+    0% { opacity: 0.5; }
+    100% { opacity: 0.8; }
+}
+
+/* Premium team card styling */
+.team-card {
+    background: linear-gradient(135deg, 
+        rgba(55, 65, 81, 0.9), 
+        rgba(75, 85, 99, 0.7)) !important;
+    border-radius: 1.25rem !important;
+    padding: 1.5rem !important;
+    text-align: center !important;
+    border: 1px solid rgba(239, 68, 68, 0.3) !important;
+    backdrop-filter: blur(15px) !important;
+    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
+    position: relative;
+    overflow: hidden;
+    box-shadow: 
+        0 6px 12px rgba(0, 0, 0, 0.3),
+        inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
+}
+
+.team-card::before {
+    content: '';
+    position: absolute;
+    top: 0;
+    left: -100%;
+    width: 100%;
+    height: 100%;
+    background: linear-gradient(90deg, 
+        transparent, 
+        rgba(239, 68, 68, 0.15), 
+        transparent);
+    transition: left 0.6s;
+}
+
+.team-card:hover::before {
+    left: 100%;
+}
+
+.team-card:hover {
+    transform: translateY(-3px) scale(1.02) !important;
+    border-color: rgba(239, 68, 68, 0.5) !important;
+    box-shadow: 
+        0 10px 20px rgba(0, 0, 0, 0.4),
+        inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
+}
+
+.team-label {
+    color: #d1d5db !important;
+    font-size: 0.75rem !important;
+    text-transform: uppercase !important;
+    letter-spacing: 0.1em !important;
+    margin-bottom: 0.75rem !important;
+    font-weight: 600 !important;
+    text-shadow: 0 1px 2px rgba(0, 0, 0, 0.5);
+}
+
+.team-name {
+    color: white !important;
+    font-weight: 700 !important;
+    font-size: 1.1rem !important;
+    margin: 0 !important;
+    text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);
+}
+
+/* Enhanced vs styling */
+.vs-text {
+    color: #ef4444 !important;
+    font-weight: 900 !important;
+    font-size: 1.5rem !important;
+    display: flex !important;
+    align-items: center !important;
+    justify-content: center !important;
+    height: 100% !important;
+    text-shadow: 0 0 20px rgba(239, 68, 68, 0.5);
+    animation: pulse 2s ease-in-out infinite;
+}
+
+@keyframes pulse {
+    0%, 100% { transform: scale(1); opacity: 0.8; }
+    50% { transform: scale(1.1); opacity: 1; }
+}
+
+/* Enhanced winner display */
+.winner-display {
+    text-align: center !important;
+    margin: 2rem 0 !important;
+    padding: 2rem !important;
+    background: linear-gradient(135deg, 
+        rgba(239, 68, 68, 0.15), 
+        rgba(220, 38, 38, 0.1)) !important;
+    border: 2px solid rgba(239, 68, 68, 0.4) !important;
+    border-radius: 1.5rem !important;
+    backdrop-filter: blur(15px) !important;
+    box-shadow: 
+        0 10px 25px rgba(0, 0, 0, 0.3),
+        inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
+    position: relative;
+    overflow: hidden;
+}
+
+.winner-display::before {
+    content: '';
+    position: absolute;
+    top: 0;
+    left: -100%;
+    width: 100%;
+    height: 100%;
+    background: linear-gradient(90deg, 
+        transparent, 
+        rgba(239, 68, 68, 0.2), 
+        transparent);
+    animation: winnerGlow 3s ease-in-out infinite;
+}
+
+@keyframes winnerGlow {
+    0%, 100% { left: -100%; }
+    50% { left: 100%; }
+}
+
+.winner-label {
+    color: #d1d5db !important;
+    font-size: 1rem !important;
+    margin-bottom: 0.75rem !important;
+    font-weight: 600 !important;
+    text-transform: uppercase;
+    letter-spacing: 0.1em;
+    text-shadow: 0 1px 2px rgba(0, 0, 0, 0.5);
+}
+
+.winner-name {
+    color: white !important;
+    font-size: 2rem !important;
+    font-weight: 800 !important;
+    margin: 0 !important;
+    text-shadow: 0 2px 8px rgba(0, 0, 0, 0.5);
+    animation: winnerText 2s ease-in-out infinite alternate;
+}
+
+@keyframes winnerText {
+    0% { transform: scale(1); }
+    100% { transform: scale(1.05); }
+}
+
+/* Advanced animations and effects */
+@keyframes fadeIn {
+    from { 
+        opacity: 0; 
+        transform: translateY(30px) scale(0.95); 
+    }
+    to { 
+        opacity: 1; 
+        transform: translateY(0) scale(1); 
+    }
+}
+
+@keyframes slideInLeft {
+    from { 
+        opacity: 0; 
+        transform: translateX(-50px); 
+    }
+    to { 
+        opacity: 1; 
+        transform: translateX(0); 
+    }
+}
+
+@keyframes slideInRight {
+    from { 
+        opacity: 0; 
+        transform: translateX(50px); 
+    }
+    to { 
+        opacity: 1; 
+        transform: translateX(0); 
+    }
+}
+
+@keyframes bounceIn {
+    0% { 
+        opacity: 0; 
+        transform: scale(0.3) rotate(-10deg); 
+    }
+    50% { 
+        opacity: 1; 
+        transform: scale(1.05) rotate(2deg); 
+    }
+    70% { 
+        transform: scale(0.9) rotate(-1deg); 
+    }
+    100% { 
+        opacity: 1; 
+        transform: scale(1) rotate(0deg); 
+    }
+}
+
+.main .block-container > div {
+    animation: fadeIn 0.8s cubic-bezier(0.4, 0, 0.2, 1);
+}
+
+/* Column enhanced spacing and animations */
+.stColumn {
+    padding: 0 0.75rem !important;
+}
+
+.stColumn:nth-child(1) {
+    animation: slideInLeft 0.8s ease-out;
+}
+
+.stColumn:nth-child(3) {
+    animation: slideInRight 0.8s ease-out;
+}
+
+/* Floating particles effect */
+.stApp::before {
+    content: '';
+    position: fixed;
+    top: 0;
+    left: 0;
+    width: 100%;
+    height: 100%;
+    background-image: 
+        radial-gradient(circle at 25% 25%, rgba(239, 68, 68, 0.1) 0%, transparent 2%),
+        radial-gradient(circle at 75% 75%, rgba(185, 28, 28, 0.08) 0%, transparent 2%),
+        radial-gradient(circle at 60% 20%, rgba(220, 38, 38, 0.06) 0%, transparent 1.5%),
+        radial-gradient(circle at 40% 80%, rgba(239, 68, 68, 0.05) 0%, transparent 1.5%),
+        radial-gradient(circle at 90% 40%, rgba(185, 28, 28, 0.07) 0%, transparent 2%);
+    background-size: 400px 400px, 300px 300px, 200px 200px, 250px 250px, 350px 350px;
+    background-position: 0 0, 50px 50px, 100px 0, 0 100px, 150px 75px;
+    animation: floatingParticles 20s linear infinite;
+    pointer-events: none;
+    z-index: 0;
+}
+
+@keyframes floatingParticles {
+    0% { transform: translate(0, 0) rotate(0deg); }
+    33% { transform: translate(30px, -30px) rotate(120deg); }
+    66% { transform: translate(-20px, 20px) rotate(240deg); }
+    100% { transform: translate(0, 0) rotate(360deg); }
+}
+
+/* Ensure content stays above particles */
+.main {
+    position: relative;
+    z-index: 1;
+}
+
+/* Enhanced focus states */
+*:focus-visible {
+    outline: 2px solid rgba(239, 68, 68, 0.6) !important;
+    outline-offset: 2px !important;
+}
+
+/* Smooth transitions for all interactive elements */
+* {
+    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
+}
+"""
+
+_HEADER_HTML = """
+<div style='text-align: center; margin-bottom: 3rem; position: relative;'>
+    <div style='
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        margin-bottom: 1rem;
+        position: relative;
+    '>
+        <h1 class='gradient-text' style='
+            font-size: 2.8rem; 
+            margin: 0;
+            line-height: 1.2;
+            font-family: "Poppins", sans-serif;
+        '>NBA Game Predictor</h1>
+    </div>
+    <p style='
+        color: #d1d5db; 
+        font-size: 1.1rem; 
+        font-weight: 400; 
+        margin: 0;
+        opacity: 0.9;
+        text-shadow: 0 1px 2px rgba(0,0,0,0.3);
+    '>
+        Predict NBA game outcomes with AI-powered analytics
+    </p>
+    <div style='
+        position: absolute;
+        top: -20px;
+        left: 50%;
+        transform: translateX(-50%);
+        width: 100px;
+        height: 2px;
+        background: linear-gradient(90deg, transparent, #ef4444, transparent);
+        opacity: 0.6;
+    '></div>
+</div>
+"""
+
+_SECTION_HEADER_HTML = """
+<div style='text-align: center; margin-bottom: 2rem;'>
+    <h3 style='
+        color: #f3f4f6;
+        font-size: 1.4rem;
+        font-weight: 700;
+        margin-bottom: 0.5rem;
+        font-family: "Poppins", sans-serif;
+    '>{title}</h3>
+    <div style='
+        width: 60px;
+        height: 2px;
+        background: linear-gradient(90deg, transparent, #ef4444, transparent);
+        margin: 0 auto;
+        opacity: 0.7;
+    '></div>
+</div>
+"""
+
+_RESULTS_HEADER_HTML = """
+<div style='text-align: center; margin-bottom: 2.5rem;'>
+    <div style='
+        display: inline-flex;
+        align-items: center;
+        justify-content: center;
+        width: 5rem;
+        height: 5rem;
+        background: linear-gradient(135deg, #ef4444, #dc2626);
+        border-radius: 50%;
+        margin-bottom: 1.5rem;
+        box-shadow: 
+            0 10px 25px rgba(239, 68, 68, 0.4),
+            0 0 0 4px rgba(239, 68, 68, 0.2);
+        animation: bounceIn 0.8s ease-out;
+        position: relative;
+    '>
+        <span style='
+            color: white; 
+            font-size: 1.5rem; 
+            font-weight: bold;
+            filter: drop-shadow(0 2px 4px rgba(0,0,0,0.3));
+        '>✓</span>
+        <div style='
+            position: absolute;
+            top: -10px;
+            right: -10px;
+            width: 20px;
+            height: 20px;
+            background: linear-gradient(135deg, #10b981, #059669);
+            border-radius: 50%;
+            border: 3px solid white;
+            animation: pulse 2s ease-in-out infinite;
+        '></div>
+    </div>
+    <h2 class='gradient-text' style='
+        font-size: 2.2rem;
+        margin-bottom: 1rem;
+        line-height: 1.2;
+        font-family: "Poppins", sans-serif;
+    '>Prediction Results</h2>
+    <div style='
+        width: 80px;
+        height: 2px;
+        background: linear-gradient(90deg, transparent, #ef4444, transparent);
+        margin: 0 auto;
+        opacity: 0.7;
+    '></div>
+</div>
+"""
+
+_MATCHUP_HEADER_HTML = """
+<div style='text-align: center; margin-bottom: 1.5rem;'>
+    <h3 style='
+        color: #f3f4f6;
+        font-size: 1.3rem;
+        font-weight: 700;
+        margin-bottom: 1rem;
+        font-family: "Poppins", sans-serif;
+    '>Game Matchup</h3>
+</div>
+"""
+
+_VS_HTML = """
+<div class='vs-text' style='padding: 1rem;'>
+    VS
+</div>
+"""
+
+_ANALYTICS_HEADER_HTML = """
+<div style='text-align: center; margin: 2rem 0 1rem 0;'>
+    <h4 style='
+        color: #f3f4f6;
+        font-size: 1.2rem;
+        font-weight: 600;
+        margin-bottom: 1rem;
+        font-family: "Poppins", sans-serif;
+    '>{title}</h4>
+</div>
+"""
+
+
+_TEAM_CARD_HTML = """
+<div class='team-card'>
+    <p class='team-label'>{side}</p>
+    <p class='team-name'>{name}</p>
+</div>
+"""
+
+_WINNER_CARD_HTML = """
+<div class='winner-display'>
+    <p class='winner-label'>Predicted Winner</p>
+    <p class='winner-name'>{name}</p>
+</div>
+"""
+
+_FACTOR_CARD_HTML = """
+<div class='metric-container'>
+    <p style='color: #d1d5db; font-size: 0.9rem; margin-bottom: 0.75rem; font-weight: 600; text-transform: uppercase; letter-spacing: 0.05em;'>{side}</p>{rows}
+</div>
+"""
+
+_FACTOR_ROW_HTML = """
+<p style='color: white; font-size: 0.95rem; margin: 0.25rem 0; display: flex; justify-content: space-between;'>
+    <span>{name}</span>
+    <span style='color: {color}; font-weight: 700;'>{value}</span>
+</p>
+"""
+
+_METRIC_CARD_HTML = """
+<div class='metric-container'>
+    <p style='color: #d1d5db; font-size: 0.9rem; margin-bottom: 0.75rem; font-weight: 600; text-transform: uppercase; letter-spacing: 0.05em;'>{label}</p>
+    <p style='color: white; font-size: 1.8rem; font-weight: 800; margin: 0; text-shadow: 0 2px 4px rgba(0,0,0,0.3);'>{value}</p>
+</div>
+"""
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+_CSS_COLON = re.compile(r":\s+")
+_STYLE_ATTRIBUTE = re.compile(r"style='([^']*)'")
+_BETWEEN_TAGS = re.compile(r">\s+<")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def minify_css(css):
+    """Strip comments and every space the CSS grammar does not need"""
+    css = _WHITESPACE.sub(" ", _CSS_COMMENT.sub("", css))
+    css = _CSS_COLON.sub(":", _CSS_PUNCTUATION.sub(r"\1", css))
+    return css.replace(";}", "}").strip()
+
+
+def minify_html(markup):
+    """Collapse an indented HTML fragment onto one line, minifying inline styles"""
+    markup = _BETWEEN_TAGS.sub("><", _WHITESPACE.sub(" ", markup)).strip()
+    return _STYLE_ATTRIBUTE.sub(lambda m: f"style='{minify_css(m.group(1))}'", markup)
+
+
+STYLE_HTML = f"<style>@import url('{FONTS_URL}');{minify_css(_CSS)}</style>"
+HEADER_HTML = minify_html(_HEADER_HTML)
+FORM_HEADER_HTML = minify_html(_SECTION_HEADER_HTML.format(title="Game Details"))
+SLATE_HEADER_HTML = minify_html(_SECTION_HEADER_HTML.format(title="Full Slate"))
+RESULTS_HEADER_HTML = minify_html(_RESULTS_HEADER_HTML)
+MATCHUP_HEADER_HTML = minify_html(_MATCHUP_HEADER_HTML)
+ANALYTICS_HEADER_HTML = minify_html(_ANALYTICS_HEADER_HTML.format(title="Prediction Analytics"))
+FACTORS_HEADER_HTML = minify_html(_ANALYTICS_HEADER_HTML.format(title="Key Factors"))
+VS_HTML = minify_html(_VS_HTML)
+BREAK_HTML = "<br>"
+
+_TEAM_CARD = minify_html(_TEAM_CARD_HTML)
+_WINNER_CARD = minify_html(_WINNER_CARD_HTML)
+_METRIC_CARD = minify_html(_METRIC_CARD_HTML)
+_FACTOR_CARD = minify_html(_FACTOR_CARD_HTML)
+_FACTOR_ROW = minify_html(_FACTOR_ROW_HTML)
+
+
+def team_card(side, name):
+    return _TEAM_CARD.format(side=html.escape(side), name=html.escape(name))
+
+
+def winner_card(name):
+    return _WINNER_CARD.format(name=html.escape(name))
+
+
+def metric_card(label, value):
+    return _METRIC_CARD.format(label=html.escape(label), value=html.escape(str(value)))
+
+
+def factor_card(side, features, contributions):
+    """One side's largest feature contributions, green when they favour that side"""
+    rows = "".join(
+        _FACTOR_ROW.format(name=html.escape(name), value=f"{value:+.2f}", color="#10b981" if value >= 0 else "#ef4444")
+        for name, value in zip(features, contributions)
+    )
+    return _FACTOR_CARD.format(side=html.escape(side), rows=rows)
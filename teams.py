@@ -0,0 +1,167 @@
+"""
+NBA team reference data shared by the app and the data pipeline
+TEAMS, built once at import, maps codes, labels and integer ordinals (the
+position in NBA_TEAMS) both ways, and encodes whole arrays of codes at once.
+Historical franchise codes found in older game logs resolve to the current
+team through TEAM_ALIASES.
+"""
+
+from types import MappingProxyType
+
+import numpy as np
+
+CONFERENCES = ("East", "West")
+
+# NBA Teams data 
+NBA_TEAMS = [
+    {"value": "ATL", "label": "Atlanta Hawks", "city": "Atlanta", "conference": "East"},
+    {"value": "BOS", "label": "Boston Celtics", "city": "Boston", "conference": "East"},
+    {"value": "BRK", "label": "Brooklyn Nets", "city": "Brooklyn", "conference": "East"},
+    {"value": "CHA", "label": "Charlotte Hornets", "city": "Charlotte", "conference": "East"},
+    {"value": "CHI", "label": "Chicago Bulls", "city": "Chicago", "conference": "East"},
+    {"value": "CLE", "label": "Cleveland Cavaliers", "city": "Cleveland", "conference": "East"},
+    {"value": "DAL", "label": "Dallas Mavericks", "city": "Dallas", "conference": "West"},
+    {"value": "DEN", "label": "Denver Nuggets", "city": "Denver", "conference": "West"},
+    {"value": "DET", "label": "Detroit Pistons", "city": "Detroit", "conference": "East"},
+    {"value": "GSW", "label": "Golden State Warriors", "city": "Golden State", "conference": "West"},
+    {"value": "HOU", "label": "Houston Rockets", "city": "Houston", "conference": "West"},
+    {"value": "IND", "label": "Indiana Pacers", "city": "Indiana", "conference": "East"},
+    {"value": "LAC", "label": "LA Clippers", "city": "LA", "conference": "West"},
+    {"value": "LAL", "label": "Los Angeles Lakers", "city": "Los Angeles", "conference": "West"},
+    {"value": "MEM", "label": "Memphis Grizzlies", "city": "Memphis", "conference": "West"},
+    {"value": "MIA", "label": "Miami Heat", "city": "Miami", "conference": "East"},
+    {"value": "MIL", "label": "Milwaukee Bucks", "city": "Milwaukee", "conference": "East"},
+    {"value": "MIN", "label": "Minnesota Timberwolves", "city": "Minnesota", "conference": "West"},
+    {"value": "NOP", "label": "New Orleans Pelicans", "city": "New Orleans", "conference": "West"},
+    {"value": "NYK", "label": "New York Knicks", "city": "New York", "conference": "East"},
+    {"value": "OKC", "label": "Oklahoma City Thunder", "city": "Oklahoma City", "conference": "West"},
+    {"value": "ORL", "label": "Orlando Magic", "city": "Orlando", "conference": "East"},
+    {"value": "PHI", "label": "Philadelphia 76ers", "city": "Philadelphia", "conference": "East"},
+    {"value": "PHX", "label": "Phoenix Suns", "city": "Phoenix", "conference": "West"},
+    {"value": "POR", "label": "Portland Trail Blazers", "city": "Portland", "conference": "West"},
+    {"value": "SAC", "label": "Sacramento Kings", "city": "Sacramento", "conference": "West"},
+    {"value": "SAS", "label": "San Antonio Spurs", "city": "San Antonio", "conference": "West"},
+    {"value": "TOR", "label": "Toronto Raptors", "city": "Toronto", "conference": "East"},
+    {"value": "UTA", "label": "Utah Jazz", "city": "Utah", "conference": "West"},
+    {"value": "WAS", "label": "Washington Wizards", "city": "Washington", "conference": "East"}
+]
+
+# Codes used by older game logs and other data sources, by current franchise
+TEAM_ALIASES = MappingProxyType({
+    "BKN": "BRK", "NJN": "BRK", "NJ": "BRK",
+    "CHO": "CHA", "CHH": "CHA",
+    "GS": "GSW",
+    "NOH": "NOP", "NOK": "NOP", "NO": "NOP",
+    "NY": "NYK",
+    "PHO": "PHX",
+    "SA": "SAS",
+    "SEA": "OKC",
+    "UTAH": "UTA",
+    "VAN": "MEM",
+    "WSH": "WAS", "WSB": "WAS",
+})
+
+
+def _read_only(values):
+    array = np.array(values)
+    array.flags.writeable = False
+    return array
+
+
+class TeamRegistry:
+    """Immutable code, label and ordinal indexes over a list of teams"""
+
+    def __init__(self, teams, aliases=TEAM_ALIASES):
+        self.teams = tuple(MappingProxyType(dict(team)) for team in teams)
+        self.codes = tuple(team["value"] for team in self.teams)
+        self.labels = tuple(team.get("label", team["value"]) for team in self.teams)
+        self.code_array = _read_only(self.codes)
+        self.label_array = _read_only(self.labels)
+        self._ordinals = {code: t for t, code in enumerate(self.codes)}
+        if len(self._ordinals) != len(self.codes):
+            raise ValueError("Team codes must be unique")
+        for alias, code in aliases.items():
+            if code in self._ordinals and alias not in self._ordinals:
+                self._ordinals[alias] = self._ordinals[code]
+        self._by_label = {label: t for t, label in enumerate(self.labels)}
+        # Every known spelling, sorted for np.searchsorted in encode()
+        keys = sorted(self._ordinals)
+        self._sorted_keys = _read_only(keys)
+        self._sorted_ordinals = _read_only([self._ordinals[key] for key in keys])
+
+    @classmethod
+    def from_codes(cls, codes, aliases=TEAM_ALIASES):
+        """Registry over bare codes, e.g. the team list saved with a feature store"""
+        return cls([{"value": str(code)} for code in codes], aliases)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return self.find(code) is not None
+
+    def find(self, code):
+        """Ordinal of a code or alias (any case, surrounding spaces ignored), or None"""
+        t = self._ordinals.get(code)
+        if t is None and isinstance(code, str):
+            t = self._ordinals.get(code.strip().upper())
+        return t
+
+    def ordinal(self, code):
+        t = self.find(code)
+        if t is None:
+            raise KeyError(f"Unknown team: {code}")
+        return t
+
+    def canonical(self, code):
+        """Current code for a code or alias"""
+        return self.codes[self.ordinal(code)]
+
+    def by_code(self, code):
+        """Team dict for a code or alias, or None"""
+        t = self.find(code)
+        return None if t is None else self.teams[t]
+
+    def by_label(self, label):
+        """Team dict for a display label, or None"""
+        t = self._by_label.get(label)
+        return None if t is None else self.teams[t]
+
+    def encode(self, codes):
+        """Ordinals for an array of codes; exact codes never touch a Python dict"""
+        codes = np.asarray(codes, dtype=str)
+        position = np.minimum(np.searchsorted(self._sorted_keys, codes), len(self._sorted_keys) - 1)
+        ordinals = self._sorted_ordinals[position]
+        missed = self._sorted_keys[position] != codes
+        if np.any(missed):
+            # Lowercase or padded spellings: resolve each distinct one once
+            unique, inverse = np.unique(codes[missed], return_inverse=True)
+            ordinals = ordinals.copy()
+            ordinals[missed] = np.array([self.ordinal(code) for code in unique.tolist()])[inverse]
+        return ordinals
+
+    def decode(self, ordinals):
+        """Codes for an array of ordinals"""
+        return self.code_array[np.asarray(ordinals, dtype=np.int64)]
+
+    def canonical_codes(self, codes):
+        """Current codes for an array of raw codes; unknown ones come back stripped and uppercased"""
+        unique, inverse = np.unique(np.asarray(codes, dtype=str), return_inverse=True)
+        resolved = []
+        for code in unique.tolist():
+            t = self.find(code)
+            resolved.append(code.strip().upper() if t is None else self.codes[t])
+        return np.array(resolved, dtype=str)[inverse] if resolved else np.empty(0, dtype=str)
+
+
+TEAMS = TeamRegistry(NBA_TEAMS)
+
+
+def registry_for(codes):
+    """TEAMS for the standard team list, else a registry over the given codes"""
+    codes = tuple(codes)
+    return TEAMS if codes == TEAMS.codes else TeamRegistry.from_codes(codes)
+
+
+# Conference of each team as an index into CONFERENCES, by ordinal
+TEAM_CONFERENCES = _read_only([CONFERENCES.index(team["conference"]) for team in NBA_TEAMS])
@@ -0,0 +1,328 @@
+"""
+Offline training pipeline for the NBA Game Predictor
+Rebuilds features.pkl, feature_selector.pkl, scaler.pkl, model.pkl and the
+compiled model.npz from raw game logs (CSV, Parquet or a history_store.py
+directory, one row per team per game with the BOX_SCORE_FIELDS of
+feature_store.py).
+
+Every team's pre-game feature row is computed with vectorized pandas passes
+over all teams at once.  The rolling windows, which dominate the cost, run in
+a process pool with one task per season; each task also gets the last
+MAX_WINDOW games of every team before that season so windows that straddle
+the season boundary match TeamFeatureStore exactly.  Streaks, momentum and
+season-to-date stats depend on unbounded history and are single grouped scans
+over the whole table.
+
+Usage: python train.py games.csv [output_dir]
+    Artifacts go to artifacts/<version>/ (serve one with registry.py deploy)
+    unless output_dir is given (pass . to replace the artifacts next to app.py);
+    NBA_TRAIN_WORKERS sets the pool size; NBA_CALIBRATION picks platt (default)
+    or isotonic win probability calibration, fitted on the last season
+"""
+
+import json
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.feature_selection import SelectKBest, f_classif
+from sklearn.linear_model import RidgeClassifier
+from sklearn.preprocessing import MinMaxScaler
+
+from export_model import (
+    FEATURES_FILE,
+    MODEL_FILE,
+    SCALER_FILE,
+    SELECTOR_FILE,
+    artifact_digest,
+    compile_model,
+    verify_compiled,
+)
+from feature_store import (
+    BOX_SCORE_FIELDS,
+    FEATURE_NAMES,
+    FORM_WINDOWS,
+    GAMES_PER_SEASON,
+    MAX_WINDOW,
+    MOMENTUM_ALPHA,
+    ROLLING_STATS,
+    WIN_VALUES,
+    WINDOWS,
+    seasons_of_days,
+)
+from predictor import COMPILED_MODEL_FILE
+from backtest import evaluate
+from calibration import calibrated, fit, game_margins
+from registry import ARTIFACTS_DIR, TRAINING_INFO_FILE
+from ridge import RIDGE_STATS_FILE, RidgeStats
+from teams import TEAMS
+
+RIDGE_ALPHA = 1.0
+CALIBRATION_METHOD = "platt"
+RANDOM_STATE = 42
+
+# Optional game log columns kept for pairing the two sides of a game (backtest.py)
+MATCHUP_FIELDS = ("opponent", "home")
+
+ROLLING_COLUMNS = [f"{stat}_avg_{window}" for stat in ROLLING_STATS for window in WINDOWS] + [
+    f"recent_form_{window}" for window in FORM_WINDOWS
+]
+
+
+def read_game_logs(path):
+    """Read a CSV or Parquet game log, or a history_store.py directory"""
+    if os.path.isdir(path):
+        from history_store import GameHistory
+
+        return GameHistory.open(path).to_frame()
+    if path.lower().endswith((".parquet", ".pq")):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def prepare_game_logs(games):
+    """Validate and normalize game log columns, sorted by (team, date)"""
+    games = pd.DataFrame(games)
+    games.columns = [str(column).strip().lower() for column in games.columns]
+    missing = [field for field in BOX_SCORE_FIELDS if field not in games.columns]
+    if missing:
+        raise ValueError(f"Game logs are missing column(s): {', '.join(missing)}")
+
+    clean = pd.DataFrame({
+        "team": TEAMS.canonical_codes(games["team"]),
+        "date": pd.to_datetime(games["date"]).dt.normalize(),
+    })
+    won = games["won"]
+    if won.dtype == object:
+        won = won.astype(str).str.strip().str.lower().isin(WIN_VALUES)
+    clean["won"] = won.astype(bool).astype(np.float64)
+    for field in ("opp_pts", "opp_fg%") + ROLLING_STATS:
+        clean[field] = games[field].astype(np.float64)
+    if "opponent" in games.columns:
+        clean["opponent"] = TEAMS.canonical_codes(games["opponent"])
+    if "home" in games.columns:
+        # Not astype(bool) alone: a "0" read from a CSV string column is truthy
+        clean["home"] = pd.to_numeric(games["home"]).astype(bool)
+
+    derived = seasons_of_days(clean["date"].values.astype("datetime64[D]"))
+    if "season" in games.columns:
+        clean["season"] = games["season"].fillna(pd.Series(derived, index=games.index)).astype(np.int64)
+    else:
+        clean["season"] = derived
+
+    # A team plays at most once a day; like FeatureIndex.build, the later row wins
+    clean = clean.drop_duplicates(["team", "date"], keep="last")
+    return clean.sort_values(["team", "date"], kind="stable").reset_index(drop=True)
+
+
+def _rolling_features(games):
+    """Post-game rolling means for one season's rows (plus their context rows)"""
+    by_team = games.groupby("team", sort=False)
+    columns = {}
+    for window in WINDOWS:
+        means = by_team[list(ROLLING_STATS)].rolling(window, min_periods=1).mean()
+        means = means.reset_index(level=0, drop=True)
+        for stat in ROLLING_STATS:
+            columns[f"{stat}_avg_{window}"] = means[stat]
+    for window in FORM_WINDOWS:
+        form = by_team["won"].rolling(window, min_periods=1).mean()
+        columns[f"recent_form_{window}"] = form.reset_index(level=0, drop=True)
+    rolling = pd.DataFrame(columns)[ROLLING_COLUMNS]
+    return rolling.loc[games.index[~games["context"]]]
+
+
+def season_chunks(games):
+    """One frame per season: its rows plus each team's last MAX_WINDOW earlier games"""
+    position = games.groupby("team", sort=False).cumcount()
+    chunks = []
+    for season in np.unique(games["season"]):
+        in_season = games["season"] == season
+        first = position[in_season].groupby(games["team"][in_season]).min()
+        start = games["team"].map(first)
+        context = ~in_season & (position < start) & (position >= start - MAX_WINDOW)
+        chunk = games.loc[in_season | context, ["team", "won"] + list(ROLLING_STATS)]
+        chunks.append(chunk.assign(context=context[in_season | context]))
+    return chunks
+
+
+def _sequential_features(games):
+    """Post-game streak, momentum and season-to-date stats in grouped scans"""
+    team = games["team"]
+    won = games["won"]
+    new_team = team.ne(team.shift())
+
+    run = (new_team | won.ne(won.shift())).cumsum()
+    run_length = games.groupby(run).cumcount() + 1
+    streak = np.where(won > 0, run_length, -run_length)
+
+    momentum = won.groupby(team, sort=False).ewm(alpha=MOMENTUM_ALPHA, adjust=False).mean()
+    momentum = momentum.reset_index(level=0, drop=True)
+
+    by_season = games.groupby([team, games["season"]], sort=False)
+    season_games = by_season.cumcount() + 1
+    return pd.DataFrame({
+        "win_streak": np.maximum(streak, 0),
+        "loss_streak": np.maximum(-streak, 0),
+        "momentum_score": momentum,
+        "season_games": season_games,
+        "opp_pts_avg": by_season["opp_pts"].cumsum() / season_games,
+        "opp_fg_pct_avg": by_season["opp_fg%"].cumsum() / season_games,
+    }, index=games.index)
+
+
+def build_features(games, workers=None):
+    """Pre-game feature rows for every team-game that has an earlier game to learn from
+
+    games must come from prepare_game_logs.  Returns (features, labels, rows)
+    where features has FEATURE_NAMES columns and rows is the matching slice of
+    games.
+    """
+    chunks = season_chunks(games)
+    if workers == 1 or len(chunks) == 1:
+        rolling = [_rolling_features(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rolling = list(pool.map(_rolling_features, chunks))
+    post = pd.concat(rolling).sort_index().join(_sequential_features(games))
+
+    # A team's features for a game are its post-game values from its previous game
+    previous = games["team"].eq(games["team"].shift())
+    pre = post.shift(1)[previous].copy()
+    current = games[previous]
+    rest = (current["date"] - games["date"].shift(1)[previous]).dt.days
+
+    pre["rest_days"] = rest.astype(np.float64)
+    pre["back_to_back"] = (rest == 1).astype(np.float64)
+    same_season = current["season"].values == games["season"].shift(1)[previous].values
+    pre["season_progress"] = np.where(same_season, pre["season_games"] / GAMES_PER_SEASON, 0.0)
+    features = pre[FEATURE_NAMES].astype(np.float64)
+    return features, current["won"].astype(np.int64), current
+
+
+def fit_pipeline(features, labels, k=len(FEATURE_NAMES), alpha=RIDGE_ALPHA):
+    """Fit SelectKBest -> MinMaxScaler -> RidgeClassifier the way the shipped artifacts were"""
+    selector = SelectKBest(f_classif, k=k).fit(features, labels)
+    selected = selector.transform(features)
+    scaler = MinMaxScaler().fit(selected)
+    model = RidgeClassifier(alpha=alpha, random_state=RANDOM_STATE).fit(scaler.transform(selected), labels)
+    return {"features": list(features.columns), "selector": selector, "scaler": scaler, "model": model}
+
+
+def write_artifacts(artifacts, output_dir, info, features=None, labels=None, calibration=None):
+    """Pickle the pipeline, compile model.npz and record training metadata in output_dir
+
+    With the training rows, also saves their Ridge sufficient statistics so
+    ingest.py can keep updating the model exactly.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    for filename, key in ((FEATURES_FILE, "features"), (SELECTOR_FILE, "selector"),
+                          (SCALER_FILE, "scaler"), (MODEL_FILE, "model")):
+        with open(os.path.join(output_dir, filename), "wb") as f:
+            pickle.dump(artifacts[key], f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    compiled = compile_model(artifacts, artifact_digest(output_dir))
+    verify_compiled(compiled, artifacts)
+    if calibration is not None:
+        compiled = calibrated(compiled, calibration)
+    compiled.save(os.path.join(output_dir, COMPILED_MODEL_FILE))
+    if features is not None:
+        stats = RidgeStats(len(compiled.feature_names), artifacts["model"].alpha)
+        stats.update(features[compiled.feature_names].to_numpy() * compiled.scale + compiled.offset, labels)
+        stats.save(os.path.join(output_dir, RIDGE_STATS_FILE))
+    with open(os.path.join(output_dir, TRAINING_INFO_FILE), "w") as f:
+        json.dump(dict(info, version=compiled.version), f, indent=2)
+    return compiled.version
+
+
+def fit_calibration(features, labels, rows, method=CALIBRATION_METHOD):
+    """Calibrate on the last season with a pipeline fitted on the earlier ones
+
+    Returns (calibration, summary); the calibration is None, leaving the
+    default, when the logs hold one season or cannot be paired into games.
+    """
+    seasons = np.unique(rows["season"])
+    if seasons.shape[0] < 2 or any(field not in rows.columns for field in MATCHUP_FIELDS):
+        return None, {"method": "default"}
+    held_out = (rows["season"] == seasons[-1]).to_numpy()
+    model = compile_model(fit_pipeline(features[~held_out], labels[~held_out]), "held-out")
+    margins, outcomes = game_margins(model, features[held_out], labels[held_out], rows[held_out])
+    calibration = fit(margins, outcomes, method)
+    return calibration, {
+        "method": method,
+        "season": int(seasons[-1]),
+        "games": int(outcomes.shape[0]),
+        "fit": calibration.describe(),
+        "log_loss_uncalibrated": evaluate(model.probability(margins), outcomes)["log_loss"],
+        "log_loss": evaluate(calibration(margins), outcomes)["log_loss"],
+    }
+
+
+def train(games, output_dir=None, workers=None, calibration_method=CALIBRATION_METHOD):
+    """Build features, fit the pipeline and write versioned artifacts; returns (version, path)"""
+    started = time.perf_counter()
+    features, labels, rows = build_features(prepare_game_logs(games), workers)
+    feature_seconds = time.perf_counter() - started
+    artifacts = fit_pipeline(features, labels)
+    calibration, calibration_info = fit_calibration(features, labels, rows, calibration_method)
+
+    info = {
+        "trained_at": pd.Timestamp.now(tz="UTC").isoformat(timespec="seconds"),
+        "samples": int(labels.shape[0]),
+        "seasons": sorted(int(season) for season in np.unique(rows["season"])),
+        "first_date": rows["date"].min().date().isoformat(),
+        "last_date": rows["date"].max().date().isoformat(),
+        "train_accuracy": float(artifacts["model"].score(
+            artifacts["scaler"].transform(artifacts["selector"].transform(features)), labels)),
+        "feature_seconds": round(feature_seconds, 3),
+        "calibration": calibration_info,
+        "sklearn_version": sklearn.__version__,
+    }
+    if output_dir is not None:
+        return write_artifacts(artifacts, output_dir, info, features, labels, calibration), output_dir
+
+    # Write to a scratch directory first so artifacts/<version>/ only ever appears complete
+    os.makedirs(ARTIFACTS_DIR, exist_ok=True)
+    scratch = tempfile.mkdtemp(prefix=".training-", dir=ARTIFACTS_DIR)
+    try:
+        version = write_artifacts(artifacts, scratch, info, features, labels, calibration)
+        final = os.path.join(ARTIFACTS_DIR, version)
+        if os.path.exists(final):
+            shutil.rmtree(scratch)
+        else:
+            os.rename(scratch, final)
+    except BaseException:
+        shutil.rmtree(scratch, ignore_errors=True)
+        raise
+    return version, final
+
+
+def main(argv):
+    if len(argv) < 2:
+        print(__doc__[__doc__.index("Usage:"):].rstrip())
+        return 1
+    workers = int(os.environ["NBA_TRAIN_WORKERS"]) if os.environ.get("NBA_TRAIN_WORKERS") else None
+    games = read_game_logs(argv[1])
+    method = os.environ.get("NBA_CALIBRATION", CALIBRATION_METHOD)
+    version, path = train(games, argv[2] if len(argv) > 2 else None, workers, method)
+    with open(os.path.join(path, TRAINING_INFO_FILE)) as f:
+        info = json.load(f)
+    print(f"Trained model {version} on {info['samples']} team-games "
+          f"({info['first_date']} to {info['last_date']}), "
+          f"train accuracy {info['train_accuracy']:.3f}; wrote {path}")
+    calibration = info["calibration"]
+    if calibration["method"] != "default":
+        print(f"Calibrated on {calibration['games']} games of {calibration['season']} "
+              f"({calibration['fit']}): held-out log-loss {calibration['log_loss_uncalibrated']:.4f} "
+              f"-> {calibration['log_loss']:.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))